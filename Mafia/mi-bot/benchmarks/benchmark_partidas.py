@@ -0,0 +1,70 @@
+"""Benchmark del bucle de juego usando la simulación sin Discord.
+
+Uso:
+    python benchmarks/benchmark_partidas.py
+    python benchmarks/benchmark_partidas.py --partidas 10 100 10000 --jugadores 12
+
+Reporta partidas por segundo, latencia de resolución de cada fase y memoria
+por partida para cada cantidad de partidas simultáneas.
+"""
+import argparse
+import asyncio
+import pathlib
+import statistics
+import sys
+import tracemalloc
+
+# Agrega la carpeta del bot al PYTHONPATH
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.append(str(ROOT))
+
+from simulacion import simular
+
+
+def percentil(valores, p):
+    if not valores:
+        return 0.0
+    ordenados = sorted(valores)
+    return ordenados[min(len(ordenados) - 1, int(p / 100 * len(ordenados)))]
+
+
+def medir_memoria(cantidad, jugadores, semilla):
+    """Pico de memoria (bytes) por partida durante la simulación."""
+    tracemalloc.start()
+    try:
+        asyncio.run(simular(cantidad, jugadores, semilla=semilla))
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return pico / cantidad
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--partidas", type=int, nargs="+", default=[10, 100, 10000])
+    parser.add_argument("--jugadores", type=int, default=8)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--sin-memoria", action="store_true", help="no medir memoria (tracemalloc es lento)")
+    args = parser.parse_args()
+
+    print(f"{'partidas':>9} {'partidas/s':>11} {'fases':>8} "
+          f"{'noche p50/p95 ms':>17} {'día p50/p95 ms':>15} {'KiB/partida':>12}")
+
+    for cantidad in args.partidas:
+        resultado = asyncio.run(simular(cantidad, args.jugadores, semilla=args.semilla))
+        noche = resultado.latencias_fase["Noche"]
+        dia = resultado.latencias_fase["Día"]
+        memoria = "-" if args.sin_memoria else f"{medir_memoria(cantidad, args.jugadores, args.semilla) / 1024:.1f}"
+
+        print(f"{cantidad:>9} {resultado.partidas_por_segundo:>11.1f} {resultado.fases_jugadas:>8} "
+              f"{percentil(noche, 50) * 1000:>8.3f}/{percentil(noche, 95) * 1000:<8.3f} "
+              f"{percentil(dia, 50) * 1000:>7.3f}/{percentil(dia, 95) * 1000:<7.3f} {memoria:>12}")
+
+        if resultado.partidas_terminadas != cantidad:
+            print(f"  ⚠️ Solo terminaron {resultado.partidas_terminadas} de {cantidad} partidas")
+        print(f"  ganadores: {dict(resultado.ganadores)} | "
+              f"media fase: {statistics.fmean(noche + dia) * 1000 if noche + dia else 0:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
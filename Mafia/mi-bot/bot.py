@@ -1,10 +1,14 @@
 import discord
-from discord.ext import commands, tasks
-import json
+from discord.ext import commands
 import os
 import random
-import asyncio
 from dotenv import load_dotenv
+from planificador import PlanificadorFases
+from ranking import RankingJSON, RankingSQLite
+from indice_nombres import IndiceNombres
+from votos import RegistroVotos
+from notificaciones import enviar_dms
+from mensajeria import ColaSalida
 
 # --- CONFIGURACIÓN GLOBAL ---
 intents = discord.Intents.default()
@@ -16,96 +20,179 @@ bot = commands.Bot(command_prefix='!mafia ', intents=intents)
 # Archivo de Ranking
 RANKING_FILE = "ranking.json"
 
+# Backend del ranking: "json" (por defecto) o "sqlite"
+RANKING_BACKEND = "json"
+RANKING_DB = "ranking.db"
+
+# Puestos por página en !mafia ranking
+RANKING_POR_PAGINA = 10
+
 # Tiempos del Juego (en segundos)
 TIEMPOS_FASES = { # Nombre de variable mejorado
     "normal": {"noche": 60, "dia": 120},
     "rapido": {"noche": 30, "dia": 60}
 }
 
-# Estructura de la Partida
-partida_mafia = {
-    "activa": False,
-    "max_jugadores": 0,
-    "modo": "normal", # normal o rapido
-    "fase_actual": "Inscripción", # Nombre de variable mejorado
-    "jugadores_vivos": {}, # {player_id: discord.Member}
-    "jugadores_muertos": {}, # {player_id: discord.Member}
-    "roles_asignados": {}, # {player_id: "Rol"} - Nombre de variable mejorado
-    "votos_dia": {}, # {votante_id: votado_id}
-    "acciones_nocturnas": {}, # {player_id: (accion, objetivo_id)} - Nombre de variable mejorado
-    "canal_juego": None, # Canal donde se juega
-}
+# Registro de partidas activas, una por canal: {canal_id: partida}
+# (los IDs de canal de Discord son únicos entre servidores)
+partidas = {}
+
+# Índice inverso para los comandos por DM: {jugador_id: canal_id}
+partida_por_jugador = {}
+
+def crear_estado_partida(canal_juego=None, max_jugadores=0, modo="normal"):
+    """Devuelve el estado inicial de una partida."""
+    return {
+        "activa": False,
+        "max_jugadores": max_jugadores,
+        "modo": modo, # normal o rapido
+        "fase_actual": "Inscripción", # Nombre de variable mejorado
+        "jugadores_vivos": {}, # {player_id: discord.Member}
+        "jugadores_muertos": {}, # {player_id: discord.Member}
+        "roles_asignados": {}, # {player_id: "Rol"} - Nombre de variable mejorado
+        "votos_dia": RegistroVotos(), # {votante_id: votado_id}, con conteo por votado
+        "acciones_nocturnas": {}, # {player_id: (accion, objetivo_id)} - Nombre de variable mejorado
+        "canal_juego": canal_juego, # Canal donde se juega
+        "guild_id": None, # Servidor de la partida (para el ranking por servidor)
+        "indice_nombres": IndiceNombres(), # Búsqueda de jugadores vivos por nombre, apodo o mención
+        "indice_muertos": IndiceNombres(), # Ídem, de los jugadores eliminados
+    }
 
 # --- FUNCIONES DE PERSISTENCIA (Ranking) ---
 
+ranking_store = None
+
+# Texto ya armado del top de cada ranking: {guild_id: (version_top, texto)}
+texto_top_cache = {}
+
+def obtener_ranking():
+    """Devuelve el almacenamiento del ranking según RANKING_BACKEND."""
+    global ranking_store
+    ruta = RANKING_DB if RANKING_BACKEND == "sqlite" else RANKING_FILE
+    if ranking_store is None or ranking_store.ruta != ruta:
+        if ranking_store is not None:
+            ranking_store.cerrar()
+        texto_top_cache.clear()
+
+        if RANKING_BACKEND == "sqlite":
+            # La primera vez importa el ranking.json existente
+            ranking_store = RankingSQLite(ruta, migrar_desde=RANKING_FILE)
+        else:
+            ranking_store = RankingJSON(ruta)
+    return ranking_store
+
 def load_ranking():
     """Carga el ranking de puntuaciones."""
-    if os.path.exists(RANKING_FILE):
-        with open(RANKING_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+    return obtener_ranking().cargar()
 
 def save_ranking(ranking_data):
     """Guarda el ranking de puntuaciones."""
-    with open(RANKING_FILE, 'w') as f:
-        json.dump(ranking_data, f, indent=4)
+    obtener_ranking().reemplazar(ranking_data)
+
+def nombre_de_usuario(id_usuario):
+    """Devuelve el nombre de un usuario de Discord para el ranking."""
+    usuario = bot.get_user(id_usuario) # Nombre de variable mejorado
+    return str(usuario.name) if usuario else "Usuario Desconocido" # Nombre de variable mejorado
 
 def update_ranking(id_usuario, puntos_ganados): # Nombre de variable mejorado
     """Actualiza la puntuación de un usuario."""
-    ranking = load_ranking()
-    id_usuario_str = str(id_usuario)
-    
-    usuario = bot.get_user(id_usuario) # Nombre de variable mejorado
-    nombre_usuario = str(usuario.name) if usuario else "Usuario Desconocido" # Nombre de variable mejorado
-    
-    if id_usuario_str not in ranking:
-        ranking[id_usuario_str] = {"nombre": nombre_usuario, "puntos": 0}
-        
-    ranking[id_usuario_str]["puntos"] += puntos_ganados
-    ranking[id_usuario_str]["nombre"] = nombre_usuario 
-    save_ranking(ranking)
+    update_ranking_lote({id_usuario: puntos_ganados})
+
+def update_ranking_lote(puntos_por_usuario, guild_id=None):
+    """Suma los puntos de varios usuarios en una sola escritura: {id_usuario: puntos}."""
+    if not puntos_por_usuario:
+        return
+
+    cambios = {id_usuario: (nombre_de_usuario(id_usuario), puntos)
+               for id_usuario, puntos in puntos_por_usuario.items()}
+    obtener_ranking().aplicar_lote(cambios, guild_id)
+
+# --- MENSAJES DE LA PARTIDA ---
+
+# Los mensajes de la lógica del juego se encolan y se agrupan por canal
+cola_salida = ColaSalida()
+
+async def anunciar(canal, mensaje):
+    """Encola un mensaje para el canal de juego."""
+    await cola_salida.encolar(canal, mensaje)
 
 # --- FUNCIONES AUXILIARES DE JUEGO ---
 
-def reset_partida(ctx=None):
-    """Reinicia el estado global de la partida."""
-    global partida_mafia
-    
-    if partida_mafia["canal_juego"] and ctx:
+def registrar_partida(partida):
+    """Agrega una partida al registro, indexada por su canal."""
+    partidas[partida["canal_juego"].id] = partida
+
+def obtener_partida_de_jugador(id_jugador):
+    """Devuelve la partida en la que participa un jugador (para los DMs)."""
+    id_canal = partida_por_jugador.get(id_jugador)
+    if id_canal is None:
+        return None
+    return partidas.get(id_canal)
+
+def obtener_partida_ctx(ctx):
+    """Devuelve la partida del canal, o la del autor si el comando llega por DM."""
+    if ctx.guild:
+        return partidas.get(ctx.channel.id)
+    return obtener_partida_de_jugador(ctx.author.id)
+
+def reset_partida(partida, ctx=None):
+    """Reinicia el estado de una partida y la quita del registro."""
+    if partida["canal_juego"] and ctx:
         bot.loop.create_task(ctx.send("Reiniciando el estado de la partida..."))
 
-    partida_mafia = {
-        "activa": False,
-        "max_jugadores": 0,
-        "modo": "normal",
-        "fase_actual": "Inscripción",
-        "jugadores_vivos": {},
-        "jugadores_muertos": {},
-        "roles_asignados": {},
-        "votos_dia": {},
-        "acciones_nocturnas": {},
-        "canal_juego": None,
-    }
+    cancelar_temporizador(partida)
+
+    canal = partida["canal_juego"]
+    if canal is not None and partidas.get(canal.id) is partida:
+        del partidas[canal.id]
+
+    for id_jugador in list(partida["jugadores_vivos"]) + list(partida["jugadores_muertos"]):
+        if canal is not None and partida_por_jugador.get(id_jugador) == canal.id:
+            del partida_por_jugador[id_jugador]
+
+    partida.update(crear_estado_partida())
     
-def obtener_jugadores_vivos(): # Nombre de función mejorado
+def obtener_jugadores_vivos(partida): # Nombre de función mejorado
     """Devuelve la lista de objetos Member vivos."""
-    return list(partida_mafia["jugadores_vivos"].values())
+    return list(partida["jugadores_vivos"].values())
+
+def agregar_jugador(partida, jugador):
+    """Suma un jugador a la partida y lo indexa por nombre."""
+    partida["jugadores_vivos"][jugador.id] = jugador
+    partida["indice_nombres"].agregar(jugador)
+    partida_por_jugador[jugador.id] = partida["canal_juego"].id
 
-def buscar_jugador_por_nombre(nombre_jugador, solo_vivos=True): # Nombre de función y variables mejorado
-    """Busca un jugador vivo o muerto por su nombre."""
+def buscar_jugadores_por_nombre(partida, nombre_jugador, solo_vivos=True):
+    """Devuelve los jugadores que coinciden con un nombre, apodo, mención, ID o prefijo."""
     if solo_vivos:
-        jugadores = partida_mafia["jugadores_vivos"]
-    else:
-        jugadores = {**partida_mafia["jugadores_vivos"], **partida_mafia["jugadores_muertos"]}
-    
-    for jugador in jugadores.values(): # Nombre de variable mejorado
-        if jugador.name.lower() == nombre_jugador.lower():
-            return jugador
-    return None
+        return partida["indice_nombres"].buscar(nombre_jugador)
+    # Una coincidencia exacta gana sobre los prefijos, esté el jugador vivo o muerto
+    exactos, por_prefijo = partida["indice_nombres"].coincidencias(nombre_jugador)
+    exactos_muertos, por_prefijo_muertos = partida["indice_muertos"].coincidencias(nombre_jugador)
+    return (exactos + exactos_muertos) or (por_prefijo + por_prefijo_muertos)
+
+def buscar_jugador_por_nombre(partida, nombre_jugador, solo_vivos=True): # Nombre de función y variables mejorado
+    """Busca un jugador vivo o muerto por su nombre. Devuelve None si no hay uno solo."""
+    encontrados = buscar_jugadores_por_nombre(partida, nombre_jugador, solo_vivos)
+    return encontrados[0] if len(encontrados) == 1 else None
+
+async def resolver_objetivo(ctx, partida, nombre_objetivo):
+    """Busca un jugador vivo para un comando y avisa si no existe o si el nombre es ambiguo."""
+    encontrados = buscar_jugadores_por_nombre(partida, nombre_objetivo, solo_vivos=True)
+    if not encontrados:
+        await ctx.send(f"No se encontró un jugador vivo con el nombre '{nombre_objetivo}'.")
+        return None
+
+    if len(encontrados) > 1:
+        nombres = ", ".join(sorted(j.name for j in encontrados))
+        await ctx.send(f"'{nombre_objetivo}' coincide con varios jugadores: {nombres}. Escribe el nombre completo o menciónalo.")
+        return None
+
+    return encontrados[0]
 
-def asignar_roles():
+def asignar_roles(partida):
     """Asigna roles aleatorios a los jugadores vivos."""
-    jugadores = obtener_jugadores_vivos()
+    jugadores = obtener_jugadores_vivos(partida)
     num_jugadores = len(jugadores)
     
     # Lógica de asignación de roles (adaptada a 3 roles)
@@ -118,85 +205,101 @@ def asignar_roles():
     roles_disponibles.extend(["Ciudadano"] * num_ciudadanos)
     random.shuffle(roles_disponibles)
     
-    partida_mafia["roles_asignados"] = {}
+    partida["roles_asignados"] = {}
     for i, jugador in enumerate(jugadores): # Nombre de variable mejorado
-        partida_mafia["roles_asignados"][jugador.id] = roles_disponibles[i]
+        partida["roles_asignados"][jugador.id] = roles_disponibles[i]
+
+def construir_mensajes_roles(partida):
+    """Arma el DM de cada jugador vivo: [(jugador, mensaje)]."""
+    vivos = obtener_jugadores_vivos(partida)
+    roles = partida["roles_asignados"]
+
+    # Textos comunes de cada facción, armados una sola vez
+    mafiosos = [(p.id, p.name) for p in vivos if roles[p.id] == "Mafioso"]
+    instrucciones = {
+        "Mafioso": "Usa `!mafia matar <nombre>` en **este DM** durante la Noche.",
+        "Policía": (
+            "Tu objetivo es investigar sospechosos y linchar a la Mafia.\n"
+            "Usa `!mafia investigar <nombre>` en **este DM** durante la Noche."
+        ),
+        "Ciudadano": "Tu objetivo es linchar a todos los mafiosos en el Día.",
+    }
 
-async def notificar_roles():
-    """Envía un DM a cada jugador con su rol y las instrucciones."""
-    for jugador in obtener_jugadores_vivos(): # Nombre de variable mejorado
-        rol = partida_mafia["roles_asignados"][jugador.id]
+    envios = []
+    for jugador in vivos: # Nombre de variable mejorado
+        rol = roles[jugador.id]
         mensaje = f"Tu rol en la partida de Mafia es: **{rol}**.\n"
         
         if rol == "Mafioso":
-            mafiosos = [p.name for p in obtener_jugadores_vivos() 
-                        if partida_mafia["roles_asignados"][p.id] == "Mafioso" and p.id != jugador.id]
+            compañeros = [nombre for id_mafioso, nombre in mafiosos if id_mafioso != jugador.id]
             
             mensaje += "Tu objetivo es superar en número a la Ciudad. \n"
-            if mafiosos:
-                mensaje += f"Tus compañeros de Mafia son: {', '.join(mafiosos)}.\n"
-            mensaje += "Usa `!mafia matar <nombre>` en **este DM** durante la Noche."
-            
-        elif rol == "Policía":
-            mensaje += "Tu objetivo es investigar sospechosos y linchar a la Mafia.\n"
-            mensaje += "Usa `!mafia investigar <nombre>` en **este DM** durante la Noche."
-            
-        else: # Ciudadano
-            mensaje += "Tu objetivo es linchar a todos los mafiosos en el Día."
-            
-        try:
-            await jugador.send(mensaje)
-        except discord.Forbidden:
-            print(f"No se pudo enviar DM a {jugador.name}. DMs cerrados.")
-
-def resolver_linchamiento_dia(): # Nombre de función mejorado
+            if compañeros:
+                mensaje += f"Tus compañeros de Mafia son: {', '.join(compañeros)}.\n"
+
+        mensaje += instrucciones[rol]
+        envios.append((jugador, mensaje))
+    return envios
+
+async def notificar_roles(partida):
+    """Envía un DM a cada jugador con su rol y avisa en el canal a quién no se pudo contactar."""
+    sin_dm = await enviar_dms(construir_mensajes_roles(partida))
+
+    if sin_dm:
+        nombres = ", ".join(jugador.name for jugador in sin_dm)
+        await anunciar(
+            partida["canal_juego"],
+            f"⚠️ No se pudo enviar el rol por DM a: {nombres}. "
+            f"Habiliten los mensajes directos del servidor y usen `!mafia rol`."
+        )
+
+def hay_mayoria(partida, conteo_votos):
+    """Indica si una cantidad de votos es mayoría (más de la mitad de los vivos)."""
+    return conteo_votos > len(partida["jugadores_vivos"]) / 2
+
+def resolver_linchamiento_dia(partida): # Nombre de función mejorado
     """Procesa los votos del día y elimina al jugador más votado si hay mayoría."""
-    votos = {}
-    for id_votado in partida_mafia["votos_dia"].values(): # Nombre de variable mejorado
-        votos[id_votado] = votos.get(id_votado, 0) + 1
+    id_candidato, conteo_votos = partida["votos_dia"].lider() # Nombre de variable mejorado
         
-    if not votos:
+    if id_candidato is None:
         return None, 0
-
-    id_candidato = max(votos, key=votos.get) # Nombre de variable mejorado
-    conteo_votos = votos[id_candidato] # Nombre de variable mejorado
     
     # Comprobar si hay mayoría (más de la mitad de los votos de los vivos)
-    if conteo_votos > len(partida_mafia["jugadores_vivos"]) / 2:
+    if hay_mayoria(partida, conteo_votos):
         return id_candidato, conteo_votos
 
     return None, 0 
 
 # --- LÓGICA DE FASES ---
 
-async def procesar_noche():
+async def procesar_noche(partida):
     """Resuelve las acciones de la noche: Matar, Investigar."""
-    canal = partida_mafia["canal_juego"]
-    acciones = partida_mafia["acciones_nocturnas"]
+    canal = partida["canal_juego"]
+    acciones = partida["acciones_nocturnas"]
     
     # 1. Resolver el asesinato de la Mafia
-    votos_mafia = [id_objetivo for accion, id_objetivo in acciones.values() if accion == "matar"] # Nombre de variable mejorado
+    votos_mafia = RegistroVotos.desde((id_jugador, id_objetivo) for id_jugador, (accion, id_objetivo) in acciones.items() if accion == "matar") # Nombre de variable mejorado
     if votos_mafia: # Nombre de variable mejorado
         # Enfoque simple: la víctima es el más votado o el primero en ser votado
-        id_victima = max(set(votos_mafia), key=votos_mafia.count) # Nombre de variable mejorado
-        victima = partida_mafia["jugadores_vivos"].get(id_victima) # Nombre de variable mejorado
+        id_victima, _ = votos_mafia.lider() # Nombre de variable mejorado
+        victima = partida["jugadores_vivos"].get(id_victima) # Nombre de variable mejorado
 
         if victima:
-            rol_victima = partida_mafia["roles_asignados"][id_victima]
-            await eliminar_jugador(canal, victima, rol_victima, "asesinado por la Mafia") # Nombre de función mejorado
+            rol_victima = partida["roles_asignados"][id_victima]
+            await eliminar_jugador(partida, victima, rol_victima, "asesinado por la Mafia") # Nombre de función mejorado
         else:
-            await canal.send("La Mafia atacó a alguien que ya no estaba en juego.")
+            await anunciar(canal, "La Mafia atacó a alguien que ya no estaba en juego.")
     else:
-        await canal.send("La Mafia no se puso de acuerdo. Nadie ha muerto esta noche.")
+        await anunciar(canal, "La Mafia no se puso de acuerdo. Nadie ha muerto esta noche.")
 
     # 2. Resolver la investigación de la Policía
     acciones_policia = {id_jugador: id_objetivo for id_jugador, (accion, id_objetivo) in acciones.items() if accion == "investigar"} # Nombre de variable mejorado
     for id_policia, id_objetivo in acciones_policia.items(): # Nombre de variable mejorado
         policia = bot.get_user(id_policia) # Nombre de variable mejorado
-        objetivo = partida_mafia["jugadores_vivos"].get(id_objetivo) or partida_mafia["jugadores_muertos"].get(id_objetivo)
+        objetivo = partida["jugadores_vivos"].get(id_objetivo) or partida["jugadores_muertos"].get(id_objetivo)
         
         if policia and objetivo:
-            rol_objetivo = partida_mafia["roles_asignados"][id_objetivo]
+            rol_objetivo = partida["roles_asignados"][id_objetivo]
             
             es_mafioso = "Mafioso" in rol_objetivo
             resultado = "Mafioso" if es_mafioso else "Ciudadano"
@@ -207,29 +310,29 @@ async def procesar_noche():
                 pass 
     
     # Limpiar acciones y verificar victoria
-    partida_mafia["acciones_nocturnas"] = {}
-    await verificar_y_transicionar_fase() # Nombre de función mejorado
+    partida["acciones_nocturnas"] = {}
+    await verificar_y_transicionar_fase(partida) # Nombre de función mejorado
 
-async def procesar_dia():
+async def procesar_dia(partida):
     """Procesa los votos del día y resuelve el linchamiento."""
-    canal = partida_mafia["canal_juego"]
+    canal = partida["canal_juego"]
     
-    id_candidato, conteo_votos = resolver_linchamiento_dia()
+    id_candidato, conteo_votos = resolver_linchamiento_dia(partida)
     
     if id_candidato:
         # Ejecutar linchamiento
-        jugador = partida_mafia["jugadores_vivos"].get(id_candidato)
+        jugador = partida["jugadores_vivos"].get(id_candidato)
         if jugador:
-            rol_linchado = partida_mafia["roles_asignados"][id_candidato]
-            await eliminar_jugador(canal, jugador, rol_linchado, f"linchado por la Ciudad con {conteo_votos} votos")
+            rol_linchado = partida["roles_asignados"][id_candidato]
+            await eliminar_jugador(partida, jugador, rol_linchado, f"linchado por la Ciudad con {conteo_votos} votos")
     else:
-        await canal.send("La Ciudad no alcanzó la mayoría para linchar a nadie. ¡Se salvan todos! (Por ahora)")
+        await anunciar(canal, "La Ciudad no alcanzó la mayoría para linchar a nadie. ¡Se salvan todos! (Por ahora)")
         
     # Limpiar votos y verificar victoria
-    partida_mafia["votos_dia"] = {}
-    await verificar_y_transicionar_fase()
+    partida["votos_dia"].limpiar()
+    await verificar_y_transicionar_fase(partida)
 
-async def eliminar_jugador(canal, jugador, rol, causa): # Nombre de función mejorado
+async def eliminar_jugador(partida, jugador, rol, causa): # Nombre de función mejorado
     """Mueve a un jugador de vivos a muertos y notifica."""
     
     # 1. Notificación pública
@@ -237,46 +340,48 @@ async def eliminar_jugador(canal, jugador, rol, causa): # Nombre de función mej
         f"¡{jugador.name} ha sido {causa}! \n"
         f"El rol de {jugador.name} era **{rol}**."
     )
-    await canal.send(mensaje)
+    await anunciar(partida["canal_juego"], mensaje)
     
     # 2. Mover a muertos
     # **La clave de este diccionario es la ID del jugador (int)**
-    partida_mafia["jugadores_muertos"][jugador.id] = jugador 
+    partida["jugadores_muertos"][jugador.id] = jugador 
     # **La eliminación de vivos también usa la ID del jugador como clave**
-    del partida_mafia["jugadores_vivos"][jugador.id]
+    del partida["jugadores_vivos"][jugador.id]
+    partida["indice_nombres"].quitar(jugador)
+    partida["indice_muertos"].agregar(jugador)
 
-async def verificar_y_transicionar_fase(): # Nombre de función mejorado
+async def verificar_y_transicionar_fase(partida): # Nombre de función mejorado
     """Verifica la condición de victoria y cambia de fase."""
-    ganador = verificar_condicion_victoria() # Nombre de función mejorado
-    canal = partida_mafia["canal_juego"]
+    ganador = verificar_condicion_victoria(partida) # Nombre de función mejorado
+    canal = partida["canal_juego"]
     
     if ganador:
-        await terminar_juego(canal, ganador)
+        await terminar_juego(partida, ganador)
         return
 
     # Si no hay ganador, cambia la fase
-    if partida_mafia["fase_actual"] == "Noche":
-        partida_mafia["fase_actual"] = "Día"
-        tiempo_dia = TIEMPOS_FASES[partida_mafia["modo"]]["dia"]
+    if partida["fase_actual"] == "Noche":
+        partida["fase_actual"] = "Día"
+        tiempo_dia = TIEMPOS_FASES[partida["modo"]]["dia"]
         
-        await canal.send(f"\n🌞 **¡Día ha comenzado!** 🌞\nDiscutan y voten con `!mafia votar <nombre>`. Tienen **{tiempo_dia} segundos**.")
-        partida_loop.start(tiempo_dia)
+        await anunciar(canal, f"\n🌞 **¡Día ha comenzado!** 🌞\nDiscutan y voten con `!mafia votar <nombre>`. Tienen **{tiempo_dia} segundos**.")
+        iniciar_temporizador(partida, tiempo_dia)
         
-    elif partida_mafia["fase_actual"] == "Día":
-        partida_mafia["fase_actual"] = "Noche"
-        tiempo_noche = TIEMPOS_FASES[partida_mafia["modo"]]["noche"]
+    elif partida["fase_actual"] == "Día":
+        partida["fase_actual"] = "Noche"
+        tiempo_noche = TIEMPOS_FASES[partida["modo"]]["noche"]
         
-        await canal.send(f"\n🌑 **¡Noche ha llegado!** 🌑\nTodos duermen. La Mafia y Policía deben enviar sus comandos por DM al bot. Tienen **{tiempo_noche} segundos**.")
-        partida_loop.start(tiempo_noche)
+        await anunciar(canal, f"\n🌑 **¡Noche ha llegado!** 🌑\nTodos duermen. La Mafia y Policía deben enviar sus comandos por DM al bot. Tienen **{tiempo_noche} segundos**.")
+        iniciar_temporizador(partida, tiempo_noche)
 
 
-def verificar_condicion_victoria(): # Nombre de función mejorado
+def verificar_condicion_victoria(partida): # Nombre de función mejorado
     """Verifica si alguna facción ha ganado."""
-    vivos = obtener_jugadores_vivos()
+    vivos = obtener_jugadores_vivos(partida)
     if not vivos:
         return "Nadie"
         
-    num_mafiosos = sum(1 for p in vivos if partida_mafia["roles_asignados"][p.id] == "Mafioso")
+    num_mafiosos = sum(1 for p in vivos if partida["roles_asignados"][p.id] == "Mafioso")
     num_ciudadanos_y_policias = len(vivos) - num_mafiosos
     
     if num_mafiosos == 0:
@@ -287,7 +392,7 @@ def verificar_condicion_victoria(): # Nombre de función mejorado
         
     return None
 
-async def terminar_juego(canal_juego, ganador):
+async def terminar_juego(partida, ganador):
     """Limpia el estado del juego y anuncia al ganador."""
     
     puntos_ganados = 0
@@ -296,149 +401,198 @@ async def terminar_juego(canal_juego, ganador):
     # CORRECCIÓN DE BUG: Se usa 'p' (el ID entero) en lugar de p.id para evitar el AttributeError.
     if ganador == "Ciudad":
         puntos_ganados = 10
-        facción_ganadora = [p for p, rol in partida_mafia["roles_asignados"].items() if rol != "Mafioso"]
+        facción_ganadora = [p for p, rol in partida["roles_asignados"].items() if rol != "Mafioso"]
         
     elif ganador == "Mafia":
         puntos_ganados = 15
-        facción_ganadora = [p for p, rol in partida_mafia["roles_asignados"].items() if rol == "Mafioso"]
+        facción_ganadora = [p for p, rol in partida["roles_asignados"].items() if rol == "Mafioso"]
     
     # ----------------------------------------------------
         
     mensaje_final = f"El juego ha terminado! Los **{ganador}** ganan.\n"
     
-    # Asignar puntos a los ganadores
-    for id_jugador in facción_ganadora: # Nombre de variable mejorado
-        if id_jugador in partida_mafia["roles_asignados"]:
-            update_ranking(id_jugador, puntos_ganados)
+    # Asignar puntos a los ganadores (una sola actualización para toda la facción)
+    update_ranking_lote({id_jugador: puntos_ganados for id_jugador in facción_ganadora}, partida["guild_id"])
+
+    # Guardar el resultado en el historial de partidas
+    ganadores = set(facción_ganadora)
+    resultados = {}
+    for id_jugador, rol in partida["roles_asignados"].items():
+        gano = id_jugador in ganadores
+        resultados[id_jugador] = (rol, gano, puntos_ganados if gano else 0)
+    obtener_ranking().registrar_partida(partida["guild_id"], partida["canal_juego"].id, partida["modo"], ganador, resultados)
 
-    await canal_juego.send(f"{mensaje_final}\n--- El estado de la partida ha sido reiniciado. ---")
+    await anunciar(partida["canal_juego"], f"{mensaje_final}\n--- El estado de la partida ha sido reiniciado. ---")
     
-    # Detener el loop y limpiar el estado
-    partida_loop.stop()
-    reset_partida() # Esta llamada resetea el estado del juego, causando los fallos en los tests de eliminación.
+    # Detener el temporizador y limpiar el estado
+    reset_partida(partida)
 
-# --- CICLO ASÍNCRONO (Timer) ---
+# --- TEMPORIZADOR DE FASES (planificador compartido por todas las partidas) ---
 
-@tasks.loop(seconds=1, count=1)
-async def partida_loop(tiempo_total=0):
-    """Loop que gestiona el tiempo de las fases."""
-    
-    await asyncio.sleep(tiempo_total) 
-    
-    if not partida_mafia["activa"]:
+async def fin_de_fase(id_canal):
+    """Se ejecuta cuando vence el tiempo de la fase de una partida."""
+    partida = partidas.get(id_canal)
+    if not partida or not partida["activa"]:
         return
 
-    canal = partida_mafia["canal_juego"]
-    await canal.send(f"⚠️ **¡El tiempo de la fase {partida_mafia['fase_actual']} ha terminado!** ⚠️")
+    canal = partida["canal_juego"]
+    await anunciar(canal, f"⚠️ **¡El tiempo de la fase {partida['fase_actual']} ha terminado!** ⚠️")
+
+    await resolver_fase(partida)
+
+planificador = PlanificadorFases(fin_de_fase)
+
+def iniciar_temporizador(partida, tiempo_total):
+    """Programa el fin de la fase actual de una partida."""
+    planificador.programar(partida["canal_juego"].id, tiempo_total)
+
+def cancelar_temporizador(partida):
+    """Cancela el vencimiento pendiente de una partida. Devuelve True si lo había."""
+    if partida["canal_juego"] is None:
+        return False
+    return planificador.cancelar(partida["canal_juego"].id)
+
+async def resolver_fase(partida):
+    """Resuelve la fase en curso de una partida."""
+    if partida["fase_actual"] == "Noche":
+        await procesar_noche(partida)
+    elif partida["fase_actual"] == "Día":
+        await procesar_dia(partida)
+
+def motivo_fin_anticipado(partida):
+    """Devuelve por qué la fase puede terminar antes de tiempo, o None si debe seguir."""
+    if partida["fase_actual"] == "Noche":
+        pendientes = [id_jugador for id_jugador in partida["jugadores_vivos"]
+                      if partida["roles_asignados"].get(id_jugador) in ("Mafioso", "Policía")
+                      and id_jugador not in partida["acciones_nocturnas"]]
+        if not pendientes:
+            return "Todos los jugadores actuaron"
+
+    elif partida["fase_actual"] == "Día":
+        _, conteo_votos = partida["votos_dia"].lider()
+        if hay_mayoria(partida, conteo_votos):
+            return "La Ciudad alcanzó la mayoría"
+        if len(partida["votos_dia"]) >= len(partida["jugadores_vivos"]):
+            return "Todos los jugadores votaron"
 
-    if partida_mafia["fase_actual"] == "Noche":
-        await procesar_noche()
-    elif partida_mafia["fase_actual"] == "Día":
-        await procesar_dia()
-
-# --- COMANDOS DEL BOT ---
+    return None
 
-@bot.command(name='crear')
-async def crear_partida(ctx, max_jugadores: int): # Se elimina 'modo' para hacerlo por defecto
-    """Crea una nueva partida de Mafia en modo NORMAL. !mafia crear <num>"""
-    if partida_mafia["activa"]:
-        await ctx.send("Ya hay una partida activa. Usa `!mafia terminar` para forzar su fin.")
+async def resolver_fase_si_completa(partida):
+    """Adelanta el fin de la fase si ya actuaron todos o si el Día ya tiene mayoría."""
+    motivo = motivo_fin_anticipado(partida)
+    if not motivo:
         return
 
-    if max_jugadores < 4:
-        await ctx.send("Se necesita un mínimo de 4 jugadores.")
+    # Si el vencimiento ya no estaba pendiente, la fase se está resolviendo en otro lado
+    if not cancelar_temporizador(partida):
         return
-        
-    # El modo por defecto es "normal"
-    modo_juego = "normal"
 
-    reset_partida()
-    partida_mafia["activa"] = True
-    partida_mafia["max_jugadores"] = max_jugadores
-    partida_mafia["modo"] = modo_juego
-    partida_mafia["fase_actual"] = "Inscripción"
-    partida_mafia["canal_juego"] = ctx.channel
+    await anunciar(partida["canal_juego"], f"✅ {motivo}. La fase {partida['fase_actual']} termina antes de tiempo.")
+    await resolver_fase(partida)
 
-    await ctx.send(f"Partida de Mafia **{modo_juego.upper()}** creada para **{max_jugadores}** jugadores. Usa `!mafia unirme` para participar.")
+# --- COMANDOS DEL BOT ---
+
+@bot.command(name='crear')
+async def crear_partida(ctx, max_jugadores: int): # Se elimina 'modo' para hacerlo por defecto
+    """Crea una nueva partida de Mafia en modo NORMAL. !mafia crear <num>"""
+    await nueva_partida(ctx, max_jugadores, "normal")
 
 @bot.command(name='rapido') # Nuevo comando para crear partida rápida
 async def crear_partida_rapida(ctx, max_jugadores: int):
     """Crea una nueva partida de Mafia en modo RÁPIDO. !mafia rapido <num>"""
-    if partida_mafia["activa"]:
-        await ctx.send("Ya hay una partida activa. Usa `!mafia terminar` para forzar su fin.")
+    await nueva_partida(ctx, max_jugadores, "rapido")
+
+async def nueva_partida(ctx, max_jugadores, modo_juego):
+    """Crea y registra una partida en el canal del comando."""
+    if not ctx.guild:
+        await ctx.send("Las partidas se crean en un canal del servidor, no por DM.")
+        return
+
+    if ctx.channel.id in partidas:
+        await ctx.send("Ya hay una partida activa en este canal. Usa `!mafia terminar` para forzar su fin.")
         return
 
     if max_jugadores < 4:
         await ctx.send("Se necesita un mínimo de 4 jugadores.")
         return
-        
-    modo_juego = "rapido"
 
-    reset_partida()
-    partida_mafia["activa"] = True
-    partida_mafia["max_jugadores"] = max_jugadores
-    partida_mafia["modo"] = modo_juego
-    partida_mafia["fase_actual"] = "Inscripción"
-    partida_mafia["canal_juego"] = ctx.channel
+    partida = crear_estado_partida(ctx.channel, max_jugadores, modo_juego)
+    partida["activa"] = True
+    partida["guild_id"] = ctx.guild.id
+    registrar_partida(partida)
 
-    await ctx.send(f"Partida de Mafia **{modo_juego.upper()}** creada para **{max_jugadores}** jugadores. ¡Tiempos reducidos! Usa `!mafia unirme` para participar.")
+    if modo_juego == "rapido":
+        await ctx.send(f"Partida de Mafia **{modo_juego.upper()}** creada para **{max_jugadores}** jugadores. ¡Tiempos reducidos! Usa `!mafia unirme` para participar.")
+    else:
+        await ctx.send(f"Partida de Mafia **{modo_juego.upper()}** creada para **{max_jugadores}** jugadores. Usa `!mafia unirme` para participar.")
 
 
 @bot.command(name='unirme')
 async def unirse_partida(ctx):
-    """Permite al usuario unirse a la partida actual."""
-    if not partida_mafia["activa"] or partida_mafia["fase_actual"] != "Inscripción":
+    """Permite al usuario unirse a la partida del canal."""
+    partida = partidas.get(ctx.channel.id)
+    if not partida or not partida["activa"] or partida["fase_actual"] != "Inscripción":
         await ctx.send("No hay una partida en fase de inscripción.")
         return
 
     jugador = ctx.author # Nombre de variable mejorado
-    if jugador.id in partida_mafia["jugadores_vivos"]:
+    if jugador.id in partida["jugadores_vivos"]:
         await ctx.send("Ya estás en esta partida!")
         return
+
+    if jugador.id in partida_por_jugador:
+        await ctx.send("Ya estás participando en una partida en otro canal.")
+        return
         
-    if len(partida_mafia["jugadores_vivos"]) >= partida_mafia["max_jugadores"]:
+    if len(partida["jugadores_vivos"]) >= partida["max_jugadores"]:
         await ctx.send("La partida está llena.")
         return
 
-    partida_mafia["jugadores_vivos"][jugador.id] = jugador
+    agregar_jugador(partida, jugador)
     
-    num_unidos = len(partida_mafia["jugadores_vivos"])
-    max_jugadores = partida_mafia["max_jugadores"]
+    num_unidos = len(partida["jugadores_vivos"])
+    max_jugadores = partida["max_jugadores"]
     
     await ctx.send(f"**{jugador.name}** se ha unido! Jugadores actuales: **{num_unidos}/{max_jugadores}**.")
 
 @bot.command(name='iniciar')
 async def iniciar_comando(ctx):
     """Inicia la partida forzadamente si hay suficientes jugadores."""
-    if partida_mafia["fase_actual"] != "Inscripción":
+    partida = partidas.get(ctx.channel.id)
+    if not partida:
+        await ctx.send("No hay una partida en fase de inscripción.")
+        return
+
+    if partida["fase_actual"] != "Inscripción":
         await ctx.send("El juego ya está en curso.")
         return
         
-    num_jugadores = len(partida_mafia["jugadores_vivos"])
+    num_jugadores = len(partida["jugadores_vivos"])
     if num_jugadores < 4:
         await ctx.send(f"Se necesitan al menos 4 jugadores (actual: {num_jugadores}) para iniciar.")
         return
 
-    await iniciar_partida(ctx)
+    await iniciar_partida(partida)
 
-async def iniciar_partida(ctx):
+async def iniciar_partida(partida):
     """Inicia la partida, asigna roles y comienza la Noche 1."""
     
-    asignar_roles()
-    await notificar_roles()
+    asignar_roles(partida)
+    await notificar_roles(partida)
     
     # Inicia la Noche 1
-    partida_mafia["fase_actual"] = "Noche"
-    tiempo_noche = TIEMPOS_FASES[partida_mafia["modo"]]["noche"]
+    partida["fase_actual"] = "Noche"
+    tiempo_noche = TIEMPOS_FASES[partida["modo"]]["noche"]
     
-    await partida_mafia["canal_juego"].send(
+    await anunciar(
+        partida["canal_juego"],
         f"🃏 **¡La partida ha comenzado!** 🃏\n"
         f"Es **Noche 1**.\n"
         f"La Mafia y el Policía deben actuar por DM al bot.\n"
         f"Tienen **{tiempo_noche} segundos** para realizar sus acciones."
     )
     
-    partida_loop.start(tiempo_noche)
+    iniciar_temporizador(partida, tiempo_noche)
 
 # --- ACCIONES DE NOCHE ---
 
@@ -450,21 +604,22 @@ async def votar_matar(ctx, nombre_objetivo: str): # Nombre de variable mejorado
         return
 
     id_jugador = ctx.author.id # Nombre de variable mejorado
-    if partida_mafia["fase_actual"] != "Noche" or partida_mafia["roles_asignados"].get(id_jugador) != "Mafioso":
+    partida = obtener_partida_de_jugador(id_jugador)
+    if not partida or partida["fase_actual"] != "Noche" or partida["roles_asignados"].get(id_jugador) != "Mafioso":
         await ctx.send("Solo los Mafiosos pueden matar, y solo durante la Noche.")
         return
         
-    objetivo = buscar_jugador_por_nombre(nombre_objetivo, solo_vivos=True)
+    objetivo = await resolver_objetivo(ctx, partida, nombre_objetivo)
     if not objetivo:
-        await ctx.send(f"No se encontró un jugador vivo con el nombre '{nombre_objetivo}'.")
         return
         
     if objetivo.id == id_jugador:
         await ctx.send("No puedes matarte a ti mismo.")
         return
 
-    partida_mafia["acciones_nocturnas"][id_jugador] = ("matar", objetivo.id)
+    partida["acciones_nocturnas"][id_jugador] = ("matar", objetivo.id)
     await ctx.send(f"Voto de asesinato registrado: **{objetivo.name}**.")
+    await resolver_fase_si_completa(partida)
     
 @bot.command(name='investigar')
 async def investigar(ctx, nombre_objetivo: str): # Nombre de variable mejorado
@@ -474,105 +629,181 @@ async def investigar(ctx, nombre_objetivo: str): # Nombre de variable mejorado
         return
 
     id_jugador = ctx.author.id # Nombre de variable mejorado
-    if partida_mafia["fase_actual"] != "Noche" or partida_mafia["roles_asignados"].get(id_jugador) != "Policía":
+    partida = obtener_partida_de_jugador(id_jugador)
+    if not partida or partida["fase_actual"] != "Noche" or partida["roles_asignados"].get(id_jugador) != "Policía":
         await ctx.send("Solo el Policía puede investigar, y solo durante la Noche.")
         return
         
-    objetivo = buscar_jugador_por_nombre(nombre_objetivo, solo_vivos=True)
+    objetivo = await resolver_objetivo(ctx, partida, nombre_objetivo)
     if not objetivo:
-        await ctx.send(f"No se encontró un jugador vivo con el nombre '{nombre_objetivo}'.")
         return
         
     if objetivo.id == id_jugador:
         await ctx.send("No puedes investigarte a ti mismo.")
         return
 
-    partida_mafia["acciones_nocturnas"][id_jugador] = ("investigar", objetivo.id)
+    partida["acciones_nocturnas"][id_jugador] = ("investigar", objetivo.id)
     await ctx.send(f"Investigación registrada sobre **{objetivo.name}**.")
+    await resolver_fase_si_completa(partida)
 
 # --- ACCIÓN DE DÍA ---
 
 @bot.command(name='votar')
 async def votar_dia(ctx, nombre_objetivo: str): # Nombre de variable mejorado
     """Permite a los jugadores votar por linchar a alguien (solo en canal de juego)."""
-    if partida_mafia["canal_juego"] != ctx.channel:
+    partida = partidas.get(ctx.channel.id)
+    if not partida:
         await ctx.send("Este comando solo se usa en el canal de juego designado.")
         return
         
     votante = ctx.author
-    if partida_mafia["fase_actual"] != "Día" or votante.id not in partida_mafia["jugadores_vivos"]:
+    if partida["fase_actual"] != "Día" or votante.id not in partida["jugadores_vivos"]:
         await ctx.send("Solo puedes votar por linchar durante el Día, y solo si estás vivo.")
         return
         
-    objetivo = buscar_jugador_por_nombre(nombre_objetivo, solo_vivos=True)
+    objetivo = await resolver_objetivo(ctx, partida, nombre_objetivo)
     if not objetivo:
-        await ctx.send(f"No se encontró un jugador vivo con el nombre '{nombre_objetivo}'.")
         return
 
     if objetivo.id == votante.id:
         await ctx.send("No puedes votarte a ti mismo.")
         return
 
-    partida_mafia["votos_dia"][votante.id] = objetivo.id
-    
     # Conteo de votos en tiempo real
-    votos_a_objetivo = sum(1 for v in partida_mafia["votos_dia"].values() if v == objetivo.id)
+    votos_a_objetivo = partida["votos_dia"].votar(votante.id, objetivo.id)
     
-    await ctx.send(f"Voto de **{votante.name}** registrado. **{objetivo.name}** tiene ahora **{votos_a_objetivo}** votos.")
+    await anunciar(ctx.channel, f"Voto de **{votante.name}** registrado. **{objetivo.name}** tiene ahora **{votos_a_objetivo}** votos.")
+    await resolver_fase_si_completa(partida)
     
 
+@bot.command(name='retirar')
+async def retirar_voto(ctx):
+    """Retira tu voto de linchamiento del Día."""
+    partida = partidas.get(ctx.channel.id)
+    if not partida or partida["fase_actual"] != "Día":
+        await ctx.send("Solo puedes retirar tu voto durante el Día, en el canal de juego.")
+        return
+
+    id_anterior = partida["votos_dia"].retirar(ctx.author.id)
+    if id_anterior is None:
+        await ctx.send("No habías votado a nadie.")
+        return
+
+    anterior = partida["jugadores_vivos"].get(id_anterior)
+    nombre_anterior = anterior.name if anterior else "un jugador"
+    await anunciar(ctx.channel, f"**{ctx.author.name}** retiró su voto. **{nombre_anterior}** tiene ahora **{partida['votos_dia'].votos_de(id_anterior)}** votos.")
+
+@bot.command(name='votos')
+async def mostrar_votos(ctx):
+    """Muestra el conteo de votos del Día."""
+    partida = obtener_partida_ctx(ctx)
+    if not partida or partida["fase_actual"] != "Día":
+        await ctx.send("No hay una votación en curso.")
+        return
+
+    votos = partida["votos_dia"]
+    if not votos:
+        await ctx.send("Todavía nadie votó.")
+        return
+
+    necesarios = len(partida["jugadores_vivos"]) // 2 + 1
+    lineas = []
+    for id_objetivo, cantidad in votos.tabla():
+        objetivo = partida["jugadores_vivos"].get(id_objetivo)
+        lineas.append(f"- {objetivo.name if objetivo else id_objetivo}: {cantidad}")
+
+    await ctx.send(
+        f"**🗳️ Votos del Día** (mayoría: {necesarios})\n"
+        + "\n".join(lineas)
+    )
+
+
 # --- COMANDOS DE MANTENIMIENTO E INFO ---
 
 @bot.command(name='terminar')
 async def terminar_comando(ctx):
-    """Permite terminar la partida actual y forzar el reinicio."""
-    if partida_mafia["activa"]:
+    """Permite terminar la partida del canal y forzar el reinicio."""
+    partida = partidas.get(ctx.channel.id)
+    if partida and partida["activa"]:
         await ctx.send("Partida de Mafia terminada por comando. El juego se reiniciará.")
         
-        partida_loop.stop()
-        reset_partida(ctx)
+        reset_partida(partida, ctx)
     else:
-        await ctx.send("No hay ninguna partida activa.")
+        await ctx.send("No hay ninguna partida activa en este canal.")
 
 @bot.command(name='ranking')
-async def mostrar_ranking(ctx):
-    """Muestra la tabla de clasificación de puntos (Top 10)."""
-    ranking = load_ranking()
-    if not ranking:
-        await ctx.send("El ranking está vacío.")
+async def mostrar_ranking(ctx, alcance: str = "global", pagina: int = 1):
+    """Muestra la tabla de clasificación de puntos. !mafia ranking [global|servidor] [página]"""
+    if alcance.isdigit():
+        alcance, pagina = "global", int(alcance)
+
+    guild_id = ctx.guild.id if alcance == "servidor" and ctx.guild else None
+    ranking = obtener_ranking()
+
+    # El top solo se vuelve a armar cuando cambió
+    version = ranking.version_top(guild_id)
+    if pagina == 1:
+        en_cache = texto_top_cache.get(guild_id)
+        if en_cache and en_cache[0] == version:
+            await ctx.send(en_cache[1])
+            return
+
+    desde = (max(pagina, 1) - 1) * RANKING_POR_PAGINA
+    filas = await ranking.top(RANKING_POR_PAGINA, guild_id, desde)
+    if not filas:
+        total = await ranking.cantidad(guild_id)
+        if total == 0:
+            await ctx.send("El ranking está vacío.")
+        else:
+            paginas = (total + RANKING_POR_PAGINA - 1) // RANKING_POR_PAGINA
+            await ctx.send(f"La página debe estar entre 1 y {paginas}.")
         return
 
-    sorted_ranking = sorted(ranking.items(), key=lambda item: item[1]['puntos'], reverse=True)
-    
     mensaje = "**🏆 Clasificación de Puntos de Mafia 🏆**\n"
-    for i, (id_usuario, data) in enumerate(sorted_ranking): # Nombre de variable mejorado
-        mensaje += f"{i+1}. **{data['nombre']}**: {data['puntos']} puntos\n"
-        if i >= 9:
-            break
+    if pagina > 1:
+        mensaje += f"Página {pagina}\n"
+    for i, (id_usuario, nombre, puntos) in enumerate(filas, start=desde + 1): # Nombre de variable mejorado
+        mensaje += f"{i}. **{nombre}**: {puntos} puntos\n"
+
+    if pagina == 1:
+        texto_top_cache[guild_id] = (version, mensaje)
             
     await ctx.send(mensaje)
 
+@bot.command(name='posicion')
+async def mostrar_posicion(ctx, alcance: str = "global"):
+    """Muestra tu puesto en el ranking. !mafia posicion [global|servidor]"""
+    guild_id = ctx.guild.id if alcance == "servidor" and ctx.guild else None
+    resultado = await obtener_ranking().posicion(ctx.author.id, guild_id)
+    if resultado is None:
+        await ctx.send(f"**{ctx.author.name}** todavía no tiene puntos en el ranking.")
+        return
+
+    puesto, puntos = resultado
+    await ctx.send(f"**{ctx.author.name}** está en el puesto **{puesto}** con **{puntos}** puntos.")
+
 @bot.command(name='estado')
 async def estado_partida(ctx):
     """Muestra el estado actual de la partida, jugadores y fase."""
-    if not partida_mafia["activa"]:
+    partida = obtener_partida_ctx(ctx)
+    if not partida or not partida["activa"]:
         await ctx.send("Actualmente no hay ninguna partida de Mafia activa.")
         return
 
-    vivos = "\n".join([f"- {p.name}" for p in obtener_jugadores_vivos()]) or "Nadie"
-    muertos = "\n".join([f"- {p.name} (Rol: {partida_mafia['roles_asignados'][p.id]})" for p in partida_mafia["jugadores_muertos"].values()]) or "Nadie"
+    vivos = "\n".join([f"- {p.name}" for p in obtener_jugadores_vivos(partida)]) or "Nadie"
+    muertos = "\n".join([f"- {p.name} (Rol: {partida['roles_asignados'][p.id]})" for p in partida["jugadores_muertos"].values()]) or "Nadie"
     
-    tiempo_modo = f"Modo: **{partida_mafia['modo'].upper()}** (Noche: {TIEMPOS_FASES[partida_mafia['modo']]['noche']}s, Día: {TIEMPOS_FASES[partida_mafia['modo']]['dia']}s)"
+    tiempo_modo = f"Modo: **{partida['modo'].upper()}** (Noche: {TIEMPOS_FASES[partida['modo']]['noche']}s, Día: {TIEMPOS_FASES[partida['modo']]['dia']}s)"
 
     mensaje = (
         f"**Estado Actual de la Partida**\n"
         f"----------------------------------------\n"
-        f"Fase: **{partida_mafia['fase_actual'].upper()}**\n"
+        f"Fase: **{partida['fase_actual'].upper()}**\n"
         f"{tiempo_modo}\n"
-        f"Jugadores: **{len(partida_mafia['jugadores_vivos'])}/{partida_mafia['max_jugadores']}** vivos\n"
-        f"\n**Jugadores Vivos ({len(partida_mafia['jugadores_vivos'])})**:\n"
+        f"Jugadores: **{len(partida['jugadores_vivos'])}/{partida['max_jugadores']}** vivos\n"
+        f"\n**Jugadores Vivos ({len(partida['jugadores_vivos'])})**:\n"
         f"```\n{vivos}```\n"
-        f"**Jugadores Muertos ({len(partida_mafia['jugadores_muertos'])})**:\n"
+        f"**Jugadores Muertos ({len(partida['jugadores_muertos'])})**:\n"
         f"```\n{muertos}```"
     )
     await ctx.send(mensaje)
@@ -581,12 +812,13 @@ async def estado_partida(ctx):
 async def ver_rol(ctx):
     """Envía el rol actual del jugador por DM."""
     id_jugador = ctx.author.id # Nombre de variable mejorado
+    partida = obtener_partida_de_jugador(id_jugador)
     
-    if id_jugador not in partida_mafia["roles_asignados"]:
+    if not partida or id_jugador not in partida["roles_asignados"]:
         await ctx.author.send("No estás en la partida actual o esta ya terminó.")
         return
         
-    rol = partida_mafia["roles_asignados"][id_jugador]
+    rol = partida["roles_asignados"][id_jugador]
     await ctx.author.send(f"Tu rol actual en la partida de Mafia es: **{rol}**.")
     
 
@@ -603,13 +835,19 @@ async def on_ready():
 if __name__ == "__main__":
     load_dotenv()
     TOKEN = os.getenv("DISCORD_TOKEN")
+    RANKING_BACKEND = os.getenv("RANKING_BACKEND", RANKING_BACKEND)
+    RANKING_DB = os.getenv("RANKING_DB", RANKING_DB)
 
     if TOKEN is None:
         print("ERROR: No se encontró DISCORD_TOKEN en .env")
     else:
         try:
-            bot.run(TOKEN)
+            # root_logger: los avisos de los módulos del bot (mensajeria, ...) salen con el mismo formato
+            bot.run(TOKEN, root_logger=True)
         except discord.LoginFailure:
             print("ERROR: El Token de Discord es inválido.")
         except Exception as e:
-            print(f"Error al iniciar el bot: {e}")
\ No newline at end of file
+            print(f"Error al iniciar el bot: {e}")
+        finally:
+            # Escribir los cambios del ranking que hayan quedado pendientes
+            obtener_ranking().cerrar()
\ No newline at end of file
@@ -0,0 +1,169 @@
+import random
+
+# Niveles de la lista con saltos: alcanza para millones de usuarios
+MAX_NIVELES = 32
+
+
+class _Infinito:
+    """Clave del nodo final: mayor que cualquier otra."""
+
+    def __lt__(self, otro):
+        return False
+
+    def __le__(self, otro):
+        return False
+
+
+class _Nodo:
+    __slots__ = ("clave", "siguientes", "anchos")
+
+    def __init__(self, clave, niveles):
+        self.clave = clave
+        self.siguientes = [None] * niveles
+        self.anchos = [1] * niveles # Posiciones que avanza cada enlace
+
+
+class _ListaConSaltos:
+    """Lista ordenada con saltos e índices: insertar, borrar, buscar la posición
+    de una clave y leer la posición i cuestan O(log n) esperado."""
+
+    def __init__(self):
+        self._fin = _Nodo(_Infinito(), 0)
+        self._inicio = _Nodo(None, MAX_NIVELES)
+        self._inicio.siguientes = [self._fin] * MAX_NIVELES
+        self._azar = random.Random()
+        self._largo = 0
+
+    def __len__(self):
+        return self._largo
+
+    def _nivel_al_azar(self):
+        niveles = 1
+        while niveles < MAX_NIVELES and self._azar.random() < 0.5:
+            niveles += 1
+        return niveles
+
+    def insertar(self, clave):
+        anteriores = [None] * MAX_NIVELES
+        pasos = [0] * MAX_NIVELES
+        nodo = self._inicio
+        for nivel in reversed(range(MAX_NIVELES)):
+            while nodo.siguientes[nivel].clave <= clave:
+                pasos[nivel] += nodo.anchos[nivel]
+                nodo = nodo.siguientes[nivel]
+            anteriores[nivel] = nodo
+
+        nuevo = _Nodo(clave, self._nivel_al_azar())
+        avance = 0 # Posiciones entre anteriores[nivel] y el nodo nuevo
+        for nivel in range(len(nuevo.siguientes)):
+            anterior = anteriores[nivel]
+            nuevo.siguientes[nivel] = anterior.siguientes[nivel]
+            anterior.siguientes[nivel] = nuevo
+            nuevo.anchos[nivel] = anterior.anchos[nivel] - avance
+            anterior.anchos[nivel] = avance + 1
+            avance += pasos[nivel]
+        for nivel in range(len(nuevo.siguientes), MAX_NIVELES):
+            anteriores[nivel].anchos[nivel] += 1
+        self._largo += 1
+
+    def eliminar(self, clave):
+        anteriores = [None] * MAX_NIVELES
+        nodo = self._inicio
+        for nivel in reversed(range(MAX_NIVELES)):
+            while nodo.siguientes[nivel].clave < clave:
+                nodo = nodo.siguientes[nivel]
+            anteriores[nivel] = nodo
+
+        borrado = anteriores[0].siguientes[0]
+        if borrado is self._fin or borrado.clave != clave:
+            raise KeyError(clave)
+        for nivel in range(len(borrado.siguientes)):
+            anterior = anteriores[nivel]
+            anterior.anchos[nivel] += borrado.anchos[nivel] - 1
+            anterior.siguientes[nivel] = borrado.siguientes[nivel]
+        for nivel in range(len(borrado.siguientes), MAX_NIVELES):
+            anteriores[nivel].anchos[nivel] -= 1
+        self._largo -= 1
+
+    def posicion(self, clave):
+        """Cantidad de claves menores que `clave` (como bisect_left)."""
+        posicion = 0
+        nodo = self._inicio
+        for nivel in reversed(range(MAX_NIVELES)):
+            while nodo.siguientes[nivel].clave < clave:
+                posicion += nodo.anchos[nivel]
+                nodo = nodo.siguientes[nivel]
+        return posicion
+
+    def desde(self, indice, cantidad):
+        """Las `cantidad` claves a partir de la posición `indice`."""
+        if indice >= self._largo or cantidad <= 0:
+            return []
+        nodo = self._inicio
+        restantes = indice + 1
+        for nivel in reversed(range(MAX_NIVELES)):
+            while nodo.anchos[nivel] <= restantes:
+                restantes -= nodo.anchos[nivel]
+                nodo = nodo.siguientes[nivel]
+        claves = []
+        while nodo is not self._fin and len(claves) < cantidad:
+            claves.append(nodo.clave)
+            nodo = nodo.siguientes[0]
+        return claves
+
+
+class Clasificacion:
+    """Tabla de posiciones mantenida ordenada a medida que cambian los puntos.
+
+    Guarda las claves (-puntos, id_usuario) en una lista con saltos y un
+    índice {id_usuario: clave}. Actualizar un usuario, buscar su puesto y
+    leer una página del top cuestan O(log n) (más el largo de la página), sin
+    reordenar ni mover toda la tabla.
+    """
+
+    def __init__(self, tamano_top=10):
+        self.tamano_top = tamano_top
+        self.version_top = 0 # Aumenta cada vez que cambia el top
+        self._orden = _ListaConSaltos() # (-puntos, id_usuario), ordenadas
+        self._claves = {} # {id_usuario: (-puntos, id_usuario)}
+        self._nombres = {} # {id_usuario: nombre}
+
+    def __len__(self):
+        return len(self._orden)
+
+    def actualizar(self, id_usuario, nombre, puntos):
+        """Registra los puntos totales (y el nombre) de un usuario."""
+        clave_nueva = (-puntos, id_usuario)
+        clave_vieja = self._claves.get(id_usuario)
+        afecta_top = False
+
+        if clave_vieja is not None:
+            posicion_vieja = self._orden.posicion(clave_vieja)
+            afecta_top = posicion_vieja < self.tamano_top and (
+                clave_vieja != clave_nueva or self._nombres[id_usuario] != nombre)
+            if clave_vieja != clave_nueva:
+                self._orden.eliminar(clave_vieja)
+
+        if clave_vieja != clave_nueva:
+            self._orden.insertar(clave_nueva)
+            afecta_top = afecta_top or self._orden.posicion(clave_nueva) < self.tamano_top
+
+        self._claves[id_usuario] = clave_nueva
+        self._nombres[id_usuario] = nombre
+        if afecta_top:
+            self.version_top += 1
+
+    def top(self, cantidad, desde=0):
+        """Devuelve [(id_usuario, nombre, puntos)] desde la posición indicada."""
+        return [(id_usuario, self._nombres[id_usuario], -puntos_negativos)
+                for puntos_negativos, id_usuario in self._orden.desde(desde, cantidad)]
+
+    def posicion(self, id_usuario):
+        """Devuelve (puesto, puntos) de un usuario, o None si no está en la tabla.
+
+        Los empates comparten puesto: el puesto es 1 + cantidad de usuarios con más puntos.
+        """
+        clave = self._claves.get(id_usuario)
+        if clave is None:
+            return None
+        return self._orden.posicion((clave[0],)) + 1, -clave[0]
@@ -0,0 +1,92 @@
+import re
+from bisect import bisect_left, insort
+
+# Menciones de Discord: <@123> o <@!123>
+PATRON_MENCION = re.compile(r"^<@!?(\d+)>$")
+
+
+def normalizar(nombre):
+    """Clave de búsqueda: sin espacios a los costados y sin distinguir mayúsculas."""
+    return nombre.strip().casefold()
+
+
+class IndiceNombres:
+    """Índice de los jugadores de una partida por nombre, apodo e ID.
+
+    Los nombres se guardan normalizados en un diccionario (búsqueda exacta en
+    O(1)) y en una lista ordenada para resolver prefijos con bisect.
+    """
+
+    def __init__(self):
+        self._jugadores = {} # {id_jugador: Member}
+        self._nombres = {} # {id_jugador: nombres con los que se indexó}
+        self._por_nombre = {} # {nombre normalizado: {id_jugador}}
+        self._nombres_ordenados = [] # Nombres normalizados, ordenados
+
+    def __len__(self):
+        return len(self._jugadores)
+
+    def _nombres_de(self, jugador):
+        nombres = {normalizar(jugador.name)}
+        apodo = getattr(jugador, "display_name", None)
+        if isinstance(apodo, str) and apodo.strip():
+            nombres.add(normalizar(apodo))
+        return nombres
+
+    def agregar(self, jugador):
+        """Indexa a un jugador por su nombre de usuario y su apodo."""
+        self.quitar(jugador)
+        self._jugadores[jugador.id] = jugador
+        # Se recuerdan los nombres indexados: el Member de Discord cambia si el jugador cambia de apodo
+        self._nombres[jugador.id] = self._nombres_de(jugador)
+        for nombre in self._nombres[jugador.id]:
+            if nombre not in self._por_nombre:
+                self._por_nombre[nombre] = set()
+                insort(self._nombres_ordenados, nombre)
+            self._por_nombre[nombre].add(jugador.id)
+
+    def quitar(self, jugador):
+        """Quita a un jugador del índice."""
+        self._jugadores.pop(jugador.id, None)
+        for nombre in self._nombres.pop(jugador.id, ()):
+            ids = self._por_nombre[nombre]
+            ids.discard(jugador.id)
+            if not ids:
+                del self._por_nombre[nombre]
+                del self._nombres_ordenados[bisect_left(self._nombres_ordenados, nombre)]
+
+    def coincidencias(self, texto):
+        """(exactos, por_prefijo): jugadores que coinciden con una mención, un ID o un nombre, y por prefijo.
+
+        Si hay coincidencias exactas, los prefijos no se buscan.
+        """
+        texto = texto.strip()
+        mencion = PATRON_MENCION.match(texto)
+        if mencion or texto.isdigit():
+            id_jugador = int(mencion.group(1) if mencion else texto)
+            if id_jugador in self._jugadores:
+                return [self._jugadores[id_jugador]], []
+
+        clave = normalizar(texto)
+        if not clave:
+            return [], []
+
+        exactos = [self._jugadores[id_jugador] for id_jugador in self._por_nombre.get(clave, ())]
+        if exactos:
+            return exactos, []
+
+        encontrados = {}
+        i = bisect_left(self._nombres_ordenados, clave)
+        while i < len(self._nombres_ordenados) and self._nombres_ordenados[i].startswith(clave):
+            for id_jugador in self._por_nombre[self._nombres_ordenados[i]]:
+                encontrados[id_jugador] = self._jugadores[id_jugador]
+            i += 1
+        return [], list(encontrados.values())
+
+    def buscar(self, texto):
+        """Devuelve los jugadores que coinciden con una mención, un ID, un nombre o un prefijo.
+
+        Si hay coincidencias exactas no se consideran los prefijos.
+        """
+        exactos, por_prefijo = self.coincidencias(texto)
+        return exactos or por_prefijo
@@ -0,0 +1,106 @@
+import asyncio
+import logging
+
+import discord
+
+logger = logging.getLogger(__name__)
+
+# Límite de caracteres de un mensaje de Discord
+LIMITE_CARACTERES = 2000
+
+# Mensajes pendientes por canal antes de frenar a quien encola
+MAX_PENDIENTES = 50
+
+
+def agrupar_mensajes(textos, limite=LIMITE_CARACTERES):
+    """Une textos con saltos de línea en la menor cantidad de mensajes de hasta `limite` caracteres.
+
+    Un texto que por sí solo supera el límite se corta por líneas (o a la fuerza
+    si una sola línea es más larga que el límite).
+    """
+    lineas = []
+    for texto in textos:
+        for linea in texto.split("\n"):
+            while len(linea) > limite:
+                lineas.append(linea[:limite])
+                linea = linea[limite:]
+            lineas.append(linea)
+
+    mensajes = []
+    actual = None
+    for linea in lineas:
+        if actual is None:
+            actual = linea
+        elif len(actual) + 1 + len(linea) <= limite:
+            actual += "\n" + linea
+        else:
+            mensajes.append(actual)
+            actual = linea
+    if actual is not None and actual.strip():
+        mensajes.append(actual)
+    return mensajes
+
+
+class ColaSalida:
+    """Cola de mensajes salientes por canal.
+
+    Los mensajes encolados en el mismo ciclo del event loop se envían juntos
+    en un solo mensaje (partido en trozos de 2000 caracteres si hace falta),
+    en el orden en que se encolaron. Si un canal acumula MAX_PENDIENTES
+    mensajes sin enviar, `encolar` espera a que se vacíe.
+    """
+
+    def __init__(self, limite=LIMITE_CARACTERES, max_pendientes=MAX_PENDIENTES):
+        self.limite = limite
+        self.max_pendientes = max_pendientes
+        self._canales = {} # {canal_id: {"pendientes": [...], "tarea": Task, "hay_lugar": Event}}
+
+    def _estado(self, canal):
+        estado = self._canales.get(canal.id)
+        if estado is None or estado["tarea"].get_loop() is not asyncio.get_running_loop():
+            estado = {"pendientes": [], "tarea": None, "hay_lugar": asyncio.Event()}
+            self._canales[canal.id] = estado
+        return estado
+
+    async def encolar(self, canal, texto):
+        """Agrega un mensaje a la cola del canal."""
+        estado = self._estado(canal)
+        while len(estado["pendientes"]) >= self.max_pendientes:
+            estado["hay_lugar"].clear()
+            await estado["hay_lugar"].wait()
+            # Mientras se esperaba, la cola pudo vaciarse y cerrarse
+            estado = self._estado(canal)
+
+        estado["pendientes"].append(texto)
+        if estado["tarea"] is None or estado["tarea"].done():
+            estado["tarea"] = asyncio.create_task(self._enviar_pendientes(canal, estado))
+
+    async def _enviar_pendientes(self, canal, estado):
+        # Ceder un ciclo para que se sumen los mensajes del mismo tick
+        await asyncio.sleep(0)
+
+        while estado["pendientes"]:
+            lote = estado["pendientes"]
+            estado["pendientes"] = []
+            estado["hay_lugar"].set()
+
+            for mensaje in agrupar_mensajes(lote, self.limite):
+                try:
+                    await canal.send(mensaje)
+                except discord.HTTPException as e:
+                    logger.warning("No se pudo enviar un mensaje al canal %s: %s", canal.id, e)
+
+        if self._canales.get(canal.id) is estado:
+            del self._canales[canal.id]
+
+    async def vaciar(self):
+        """Espera a que se envíen todos los mensajes pendientes."""
+        while self._canales:
+            await asyncio.gather(*(estado["tarea"] for estado in list(self._canales.values())))
+
+    def descartar(self):
+        """Cancela los envíos pendientes y vacía todas las colas."""
+        for estado in self._canales.values():
+            if estado["tarea"] is not None and not estado["tarea"].done():
+                estado["tarea"].cancel()
+        self._canales.clear()
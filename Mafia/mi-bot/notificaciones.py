@@ -0,0 +1,27 @@
+import asyncio
+import discord
+
+# DMs en vuelo al mismo tiempo. discord.py ya respeta los buckets de cada
+# ruta (y reintenta ante un 429); este límite evita ráfagas que agoten el
+# límite global y la ruta compartida que abre los canales de DM.
+MAX_DMS_CONCURRENTES = 8
+
+
+async def enviar_dms(envios, max_concurrentes=MAX_DMS_CONCURRENTES):
+    """Envía DMs en paralelo con concurrencia acotada.
+
+    `envios` es una lista de (destinatario, mensaje). Devuelve los
+    destinatarios a los que no se pudo enviar el mensaje.
+    """
+    semaforo = asyncio.Semaphore(max_concurrentes)
+
+    async def enviar(destinatario, mensaje):
+        async with semaforo:
+            try:
+                await destinatario.send(mensaje)
+            except discord.HTTPException: # Incluye Forbidden (DMs cerrados)
+                return destinatario
+            return None
+
+    resultados = await asyncio.gather(*(enviar(destinatario, mensaje) for destinatario, mensaje in envios))
+    return [destinatario for destinatario in resultados if destinatario is not None]
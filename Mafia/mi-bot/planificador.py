@@ -0,0 +1,129 @@
+import asyncio
+import heapq
+import itertools
+import time
+
+
+class PlanificadorFases:
+    """Heap de vencimientos de fase atendido por una única tarea asyncio.
+
+    Cada partida tiene como máximo un vencimiento pendiente, identificado por
+    una clave (el ID del canal). Programar cuesta O(log n); cancelar es O(1)
+    porque la entrada vieja queda en el heap y se descarta al salir.
+
+    Con automatico=False no se lanza la tarea: quien lo usa avanza el reloj
+    y llama a `disparar_vencidos` (así funciona la simulación con reloj virtual).
+    """
+
+    def __init__(self, al_vencer, reloj=time.monotonic, automatico=True):
+        self.al_vencer = al_vencer # Corrutina que recibe la clave vencida
+        self.reloj = reloj
+        self.automatico = automatico
+        self._heap = [] # [(vencimiento, secuencia, clave)]
+        self._pendientes = {} # {clave: secuencia vigente}
+        self._secuencia = itertools.count()
+        self._tarea = None
+        self._despertar = None
+        self._en_curso = set() # Referencias a las resoluciones en ejecución
+
+    def __contains__(self, clave):
+        return clave in self._pendientes
+
+    def __len__(self):
+        return len(self._pendientes)
+
+    def programar(self, clave, segundos):
+        """Programa (o reprograma) el vencimiento de una clave."""
+        secuencia = next(self._secuencia)
+        vencimiento = self.reloj() + segundos
+        self._pendientes[clave] = secuencia
+        heapq.heappush(self._heap, (vencimiento, secuencia, clave))
+
+        # Si el heap acumula demasiadas entradas canceladas, se reconstruye
+        if len(self._heap) > 64 and len(self._heap) > 2 * len(self._pendientes):
+            self._compactar()
+
+        if not self.automatico:
+            return
+
+        self._asegurar_tarea()
+        if self._heap[0][1] == secuencia:
+            self._despertar.set()
+
+    def cancelar(self, clave):
+        """Cancela el vencimiento de una clave. Devuelve True si estaba pendiente."""
+        return self._pendientes.pop(clave, None) is not None
+
+    def proximo_vencimiento(self):
+        """Devuelve el próximo vencimiento vigente, o None si no hay ninguno."""
+        while self._heap:
+            vencimiento, secuencia, clave = self._heap[0]
+            if self._pendientes.get(clave) == secuencia:
+                return vencimiento
+            heapq.heappop(self._heap)
+        return None
+
+    def extraer_vencidos(self, ahora=None):
+        """Quita del heap y devuelve las claves cuyo vencimiento ya pasó."""
+        if ahora is None:
+            ahora = self.reloj()
+
+        vencidas = []
+        while self._heap and self._heap[0][0] <= ahora:
+            _, secuencia, clave = heapq.heappop(self._heap)
+            if self._pendientes.get(clave) == secuencia:
+                del self._pendientes[clave]
+                vencidas.append(clave)
+        return vencidas
+
+    async def disparar_vencidos(self, ahora=None):
+        """Resuelve en orden, y esperando a cada una, las claves ya vencidas."""
+        vencidas = self.extraer_vencidos(ahora)
+        for clave in vencidas:
+            await self.al_vencer(clave)
+        return vencidas
+
+    def detener(self):
+        """Cancela la tarea del planificador y descarta todos los vencimientos."""
+        if self._tarea is not None and not self._tarea.done():
+            self._tarea.cancel()
+        self._tarea = None
+        self._despertar = None
+        self._heap.clear()
+        self._pendientes.clear()
+
+    def _compactar(self):
+        self._heap = [
+            entrada for entrada in self._heap
+            if self._pendientes.get(entrada[2]) == entrada[1]
+        ]
+        heapq.heapify(self._heap)
+
+    def _asegurar_tarea(self):
+        loop = asyncio.get_running_loop()
+        if self._tarea is None or self._tarea.done() or self._tarea.get_loop() is not loop:
+            self._despertar = asyncio.Event()
+            self._tarea = loop.create_task(self._ejecutar())
+
+    async def _ejecutar(self):
+        while True:
+            self._despertar.clear()
+            proximo = self.proximo_vencimiento()
+
+            if proximo is None:
+                await self._despertar.wait()
+                continue
+
+            espera = proximo - self.reloj()
+            if espera > 0:
+                try:
+                    await asyncio.wait_for(self._despertar.wait(), espera)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            # Cada partida se resuelve en su propia tarea para no frenar al resto
+            for clave in self.extraer_vencidos():
+                tarea = asyncio.create_task(self.al_vencer(clave))
+                self._en_curso.add(tarea)
+                tarea.add_done_callback(self._en_curso.discard)
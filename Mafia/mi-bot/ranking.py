@@ -0,0 +1,379 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+from clasificacion import Clasificacion
+
+
+def escribir_atomico(ruta, texto):
+    """Escribe un archivo completo de forma atómica (temporal + rename)."""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix=".ranking-", suffix=".tmp")
+    try:
+        with os.fdopen(descriptor, 'w') as f:
+            f.write(texto)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(ruta_temporal, ruta)
+    except BaseException:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+
+class RankingJSON:
+    """Ranking en memoria con escritura diferida a archivos JSON.
+
+    El ranking global se guarda en `ruta` y el de cada servidor en
+    `<ruta>_servidores.json` ({guild_id: tabla}). Las tablas se leen del disco
+    una sola vez. Los cambios se aplican en memoria y se programa un guardado
+    en segundo plano; los cambios que llegan mientras hay un guardado
+    pendiente se agrupan en la misma escritura. Las consultas de posiciones
+    usan una Clasificacion por tabla que se actualiza junto con ella.
+    """
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.ruta_servidores = os.path.splitext(ruta)[0] + "_servidores.json"
+        self._datos = None
+        self._clasificacion = None
+        self._servidores = None # {guild_id (str): {id_usuario: {"nombre", "puntos"}}}
+        self._clasificaciones_servidor = {} # {guild_id (str): Clasificacion}
+        self._sucio = False
+        self._tarea_guardado = None
+
+    def cargar(self):
+        """Devuelve la tabla global {id_usuario: {"nombre", "puntos"}} (leída una sola vez)."""
+        if self._datos is None:
+            self._datos = self._leer(self.ruta)
+            self._reconstruir_clasificacion()
+        return self._datos
+
+    def _cargar_servidores(self):
+        if self._servidores is None:
+            self._servidores = self._leer(self.ruta_servidores)
+            self._clasificaciones_servidor = {
+                guild_id: self._armar_clasificacion(tabla) for guild_id, tabla in self._servidores.items()}
+        return self._servidores
+
+    @staticmethod
+    def _leer(ruta):
+        if not os.path.exists(ruta):
+            return {}
+        with open(ruta, 'r') as f:
+            return json.load(f)
+
+    def reemplazar(self, datos):
+        """Reemplaza la tabla global completa."""
+        self._datos = datos
+        self._reconstruir_clasificacion()
+        self.programar_guardado()
+
+    @staticmethod
+    def _armar_clasificacion(tabla):
+        clasificacion = Clasificacion()
+        for id_usuario, data in tabla.items():
+            clasificacion.actualizar(id_usuario, data['nombre'], data['puntos'])
+        return clasificacion
+
+    def _reconstruir_clasificacion(self):
+        version_anterior = self._clasificacion.version_top if self._clasificacion else 0
+        self._clasificacion = self._armar_clasificacion(self._datos)
+        self._clasificacion.version_top = version_anterior + 1
+
+    def _tabla(self, guild_id):
+        """(tabla, clasificación) global o de un servidor (vacías si todavía no tiene puntos)."""
+        if guild_id is None:
+            return self.cargar(), self._clasificacion
+        servidores = self._cargar_servidores()
+        clave = str(guild_id)
+        if clave not in servidores:
+            servidores[clave] = {}
+            self._clasificaciones_servidor[clave] = Clasificacion()
+        return servidores[clave], self._clasificaciones_servidor[clave]
+
+    def aplicar_lote(self, cambios, guild_id=None):
+        """Suma puntos a varios usuarios de una vez: {id_usuario: (nombre, puntos)}.
+
+        Los puntos van al ranking global y, si se indica guild_id, también al del servidor.
+        """
+        ambitos = [None] if guild_id is None else [None, guild_id]
+        for ambito in ambitos:
+            ranking, clasificacion = self._tabla(ambito)
+            for id_usuario, (nombre, puntos) in cambios.items():
+                id_usuario_str = str(id_usuario)
+                if id_usuario_str not in ranking:
+                    ranking[id_usuario_str] = {"nombre": nombre, "puntos": 0}
+                ranking[id_usuario_str]["puntos"] += puntos
+                ranking[id_usuario_str]["nombre"] = nombre
+                clasificacion.actualizar(id_usuario_str, nombre, ranking[id_usuario_str]["puntos"])
+        self.programar_guardado()
+
+    def programar_guardado(self):
+        """Marca las tablas como modificadas y programa su escritura."""
+        self._sucio = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Sin event loop (scripts, consola): se guarda en el momento
+            self.guardar()
+            return
+
+        if self._tarea_guardado is None or self._tarea_guardado.done():
+            self._tarea_guardado = loop.create_task(self._guardar_en_segundo_plano())
+
+    def _textos(self):
+        """[(ruta, texto)] de las tablas cargadas, serializadas en el momento."""
+        textos = [(self.ruta, json.dumps(self.cargar()))]
+        if self._servidores is not None:
+            textos.append((self.ruta_servidores, json.dumps(self._servidores)))
+        return textos
+
+    def guardar(self):
+        """Escribe las tablas en el disco de forma sincrónica."""
+        self._sucio = False
+        for ruta, texto in self._textos():
+            escribir_atomico(ruta, texto)
+
+    def cerrar(self):
+        """Escribe los cambios pendientes antes de terminar el proceso."""
+        if self._sucio:
+            self.guardar()
+
+    async def vaciar(self):
+        """Espera a que termine el guardado pendiente, si lo hay."""
+        if self._tarea_guardado is not None:
+            await self._tarea_guardado
+
+    async def _guardar_en_segundo_plano(self):
+        while self._sucio:
+            self._sucio = False
+            # Se serializa en el loop para tener una foto consistente de las tablas
+            for ruta, texto in self._textos():
+                await asyncio.to_thread(escribir_atomico, ruta, texto)
+
+    async def top(self, cantidad, guild_id=None, desde=0):
+        """Devuelve [(id_usuario, nombre, puntos)] ordenado por puntos."""
+        return self._tabla(guild_id)[1].top(cantidad, desde)
+
+    async def posicion(self, id_usuario, guild_id=None):
+        """Devuelve (puesto, puntos) de un usuario, o None si no tiene puntos."""
+        return self._tabla(guild_id)[1].posicion(str(id_usuario))
+
+    async def cantidad(self, guild_id=None):
+        """Devuelve cuántos usuarios tienen puntos."""
+        return len(self._tabla(guild_id)[1])
+
+    def version_top(self, guild_id=None):
+        """Número que cambia cada vez que cambia el top del ranking."""
+        return self._tabla(guild_id)[1].version_top
+
+    def registrar_partida(self, guild_id, canal_id, modo, ganador, resultados):
+        """El backend JSON no guarda historial de partidas."""
+        return None
+
+
+ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS puntos (
+    guild_id   INTEGER NOT NULL, -- 0 = ranking global
+    usuario_id TEXT    NOT NULL,
+    nombre     TEXT    NOT NULL,
+    puntos     INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (guild_id, usuario_id)
+);
+CREATE INDEX IF NOT EXISTS idx_puntos_guild_puntos ON puntos (guild_id, puntos DESC);
+
+CREATE TABLE IF NOT EXISTS partidas (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    guild_id     INTEGER,
+    canal_id     INTEGER,
+    modo         TEXT,
+    ganador      TEXT,
+    terminada_en TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS resultados (
+    partida_id INTEGER NOT NULL REFERENCES partidas (id),
+    usuario_id TEXT    NOT NULL,
+    rol        TEXT    NOT NULL,
+    gano       INTEGER NOT NULL,
+    puntos     INTEGER NOT NULL,
+    PRIMARY KEY (partida_id, usuario_id)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    clave TEXT PRIMARY KEY,
+    valor TEXT
+);
+"""
+
+RANKING_GLOBAL = 0
+
+
+class RankingSQLite:
+    """Ranking e historial de partidas en SQLite (modo WAL).
+
+    Todas las consultas corren en un único hilo dedicado, así el event loop
+    nunca espera al disco y la conexión no se comparte entre hilos. Las
+    escrituras se encolan en ese hilo sin esperar su resultado.
+    """
+
+    def __init__(self, ruta, migrar_desde=None):
+        self.ruta = ruta
+        self._conexion = None
+        self._hilo = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ranking-sqlite")
+        self._ultima_escritura = None
+        self._versiones = {} # {guild_id: versión del top}
+        self._hilo.submit(self._abrir, migrar_desde).result()
+
+    # --- Operaciones que corren en el hilo de la base ---
+
+    def _abrir(self, migrar_desde):
+        self._conexion = sqlite3.connect(self.ruta)
+        self._conexion.execute("PRAGMA journal_mode=WAL")
+        self._conexion.execute("PRAGMA synchronous=NORMAL")
+        self._conexion.executescript(ESQUEMA_SQLITE)
+        if migrar_desde:
+            self._migrar_desde_json(migrar_desde)
+
+    def _migrar_desde_json(self, ruta_json):
+        """Importa un ranking.json existente una sola vez."""
+        ya_migrado = self._conexion.execute(
+            "SELECT 1 FROM meta WHERE clave = 'migrado_json'").fetchone()
+        if ya_migrado or not os.path.exists(ruta_json):
+            return
+
+        with open(ruta_json, 'r') as f:
+            ranking = json.load(f)
+
+        with self._conexion:
+            self._conexion.executemany(
+                "INSERT INTO puntos (guild_id, usuario_id, nombre, puntos) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, usuario_id) DO UPDATE SET puntos = puntos + excluded.puntos",
+                [(RANKING_GLOBAL, id_usuario, data['nombre'], data['puntos'])
+                 for id_usuario, data in ranking.items()])
+            self._conexion.execute(
+                "INSERT INTO meta (clave, valor) VALUES ('migrado_json', ?)",
+                (os.path.abspath(ruta_json),))
+
+    def _cargar(self):
+        filas = self._conexion.execute(
+            "SELECT usuario_id, nombre, puntos FROM puntos WHERE guild_id = ?",
+            (RANKING_GLOBAL,))
+        return {usuario_id: {"nombre": nombre, "puntos": puntos}
+                for usuario_id, nombre, puntos in filas}
+
+    def _reemplazar(self, datos):
+        with self._conexion:
+            self._conexion.execute("DELETE FROM puntos WHERE guild_id = ?", (RANKING_GLOBAL,))
+            self._conexion.executemany(
+                "INSERT INTO puntos (guild_id, usuario_id, nombre, puntos) VALUES (?, ?, ?, ?)",
+                [(RANKING_GLOBAL, str(id_usuario), data['nombre'], data['puntos'])
+                 for id_usuario, data in datos.items()])
+
+    def _aplicar_lote(self, cambios, guild_id):
+        ambitos = [RANKING_GLOBAL] if guild_id is None else [RANKING_GLOBAL, guild_id]
+        with self._conexion:
+            self._conexion.executemany(
+                "INSERT INTO puntos (guild_id, usuario_id, nombre, puntos) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (guild_id, usuario_id) DO UPDATE SET "
+                "puntos = puntos + excluded.puntos, nombre = excluded.nombre",
+                [(ambito, str(id_usuario), nombre, puntos)
+                 for ambito in ambitos
+                 for id_usuario, (nombre, puntos) in cambios.items()])
+
+    def _top(self, cantidad, guild_id, desde):
+        return self._conexion.execute(
+            "SELECT usuario_id, nombre, puntos FROM puntos WHERE guild_id = ? "
+            "ORDER BY puntos DESC LIMIT ? OFFSET ?",
+            (guild_id, cantidad, desde)).fetchall()
+
+    def _cantidad(self, guild_id):
+        (cantidad,) = self._conexion.execute(
+            "SELECT COUNT(*) FROM puntos WHERE guild_id = ?", (guild_id,)).fetchone()
+        return cantidad
+
+    def _posicion(self, id_usuario, guild_id):
+        fila = self._conexion.execute(
+            "SELECT puntos FROM puntos WHERE guild_id = ? AND usuario_id = ?",
+            (guild_id, str(id_usuario))).fetchone()
+        if fila is None:
+            return None
+        (mejores,) = self._conexion.execute(
+            "SELECT COUNT(*) FROM puntos WHERE guild_id = ? AND puntos > ?",
+            (guild_id, fila[0])).fetchone()
+        return mejores + 1, fila[0]
+
+    def _registrar_partida(self, guild_id, canal_id, modo, ganador, resultados):
+        with self._conexion:
+            cursor = self._conexion.execute(
+                "INSERT INTO partidas (guild_id, canal_id, modo, ganador) VALUES (?, ?, ?, ?)",
+                (guild_id, canal_id, modo, ganador))
+            self._conexion.executemany(
+                "INSERT INTO resultados (partida_id, usuario_id, rol, gano, puntos) VALUES (?, ?, ?, ?, ?)",
+                [(cursor.lastrowid, str(id_usuario), rol, int(gano), puntos)
+                 for id_usuario, (rol, gano, puntos) in resultados.items()])
+        return cursor.lastrowid
+
+    # --- API pública (misma que RankingJSON) ---
+
+    def _escribir(self, funcion, *args):
+        self._ultima_escritura = self._hilo.submit(funcion, *args)
+        return self._ultima_escritura
+
+    async def _consultar(self, funcion, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._hilo, funcion, *args)
+
+    def cargar(self):
+        """Devuelve el ranking global como {id_usuario: {"nombre", "puntos"}}."""
+        return self._hilo.submit(self._cargar).result()
+
+    def _invalidar_top(self, guild_id):
+        self._versiones[guild_id] = self._versiones.get(guild_id, 0) + 1
+
+    def reemplazar(self, datos):
+        """Reemplaza el ranking global completo."""
+        self._invalidar_top(RANKING_GLOBAL)
+        self._escribir(self._reemplazar, datos)
+
+    def aplicar_lote(self, cambios, guild_id=None):
+        """Suma puntos a varios usuarios de una vez: {id_usuario: (nombre, puntos)}."""
+        self._invalidar_top(RANKING_GLOBAL)
+        if guild_id is not None:
+            self._invalidar_top(guild_id)
+        self._escribir(self._aplicar_lote, cambios, guild_id)
+
+    def registrar_partida(self, guild_id, canal_id, modo, ganador, resultados):
+        """Guarda una partida terminada: resultados = {id_usuario: (rol, gano, puntos)}."""
+        return self._escribir(self._registrar_partida, guild_id, canal_id, modo, ganador, resultados)
+
+    async def top(self, cantidad, guild_id=None, desde=0):
+        """Devuelve [(id_usuario, nombre, puntos)] usando el índice por puntos."""
+        return await self._consultar(self._top, cantidad, guild_id or RANKING_GLOBAL, desde)
+
+    async def posicion(self, id_usuario, guild_id=None):
+        """Devuelve (puesto, puntos) de un usuario, o None si no tiene puntos."""
+        return await self._consultar(self._posicion, id_usuario, guild_id or RANKING_GLOBAL)
+
+    async def cantidad(self, guild_id=None):
+        """Devuelve cuántos usuarios tienen puntos."""
+        return await self._consultar(self._cantidad, guild_id or RANKING_GLOBAL)
+
+    def version_top(self, guild_id=None):
+        """Número que cambia con cada escritura que puede modificar el top."""
+        return self._versiones.get(guild_id or RANKING_GLOBAL, 0)
+
+    async def vaciar(self):
+        """Espera a que terminen las escrituras encoladas."""
+        if self._ultima_escritura is not None:
+            await asyncio.wrap_future(self._ultima_escritura)
+
+    def cerrar(self):
+        """Cierra la conexión después de aplicar las escrituras pendientes."""
+        if self._conexion is not None:
+            self._hilo.submit(self._conexion.close).result()
+            self._conexion = None
+        self._hilo.shutdown(wait=True)
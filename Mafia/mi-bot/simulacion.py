@@ -0,0 +1,314 @@
+"""Simulación de partidas de Mafia sin Discord.
+
+Juega partidas completas llamando a los mismos comandos del bot con
+objetos de Discord simulados, agentes que deciden las acciones y un reloj
+virtual: las fases vencen al instante, sin esperas reales.
+
+Ejemplo:
+    resultado = asyncio.run(simular(cantidad_partidas=100, semilla=1))
+"""
+import random
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+import bot
+from mensajeria import ColaSalida
+from planificador import PlanificadorFases
+from ranking import RankingJSON
+
+# Límite de fases por partida, por si un guion no termina nunca
+MAX_FASES = 200
+
+
+# --- OBJETOS DE DISCORD SIMULADOS ---
+
+class MiembroSimulado:
+    """Jugador simulado: guarda la cantidad de DMs recibidos."""
+
+    def __init__(self, id, name):
+        self.id = id
+        self.name = name
+        self.display_name = name
+        self.mention = f"<@{id}>"
+        self.mensajes_recibidos = 0
+
+    async def send(self, mensaje):
+        self.mensajes_recibidos += 1
+
+
+class CanalSimulado:
+    """Canal de juego simulado: solo cuenta los mensajes enviados."""
+
+    def __init__(self, id):
+        self.id = id
+        self.mensajes_enviados = 0
+
+    async def send(self, mensaje):
+        self.mensajes_enviados += 1
+
+
+class ServidorSimulado:
+    def __init__(self, id):
+        self.id = id
+
+
+class ContextoSimulado:
+    """Contexto de comando: en un canal del servidor o por DM."""
+
+    def __init__(self, autor, canal, servidor=None):
+        self.author = autor
+        self.channel = canal
+        self.guild = servidor
+
+    async def send(self, mensaje):
+        await self.channel.send(mensaje)
+
+
+class BotSimulado:
+    """Reemplaza a `bot.bot`: resuelve usuarios desde los jugadores simulados."""
+
+    def __init__(self):
+        self.usuarios = {}
+
+    def get_user(self, id_usuario):
+        return self.usuarios.get(id_usuario)
+
+
+class RelojVirtual:
+    """Reloj que solo avanza cuando la simulación lo pide."""
+
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+    def avanzar_hasta(self, instante):
+        self.ahora = max(self.ahora, instante)
+
+
+class RankingEnMemoria(RankingJSON):
+    """Ranking que nunca escribe a disco."""
+
+    def __init__(self):
+        super().__init__(":simulacion:")
+        self._datos = {}
+        self._reconstruir_clasificacion()
+
+    def programar_guardado(self):
+        pass
+
+
+# --- AGENTES ---
+
+class AgenteAleatorio:
+    """Decide al azar. La Mafia nunca elige a un compañero."""
+
+    def __init__(self, rng, probabilidad_abstenerse=0.1):
+        self.rng = rng
+        self.probabilidad_abstenerse = probabilidad_abstenerse
+
+    def _candidatos(self, jugador, partida):
+        roles = partida["roles_asignados"]
+        vivos = [p for p in partida["jugadores_vivos"].values() if p.id != jugador.id]
+        if roles[jugador.id] == "Mafioso":
+            vivos = [p for p in vivos if roles[p.id] != "Mafioso"]
+        return vivos
+
+    def accion_nocturna(self, jugador, partida):
+        """Devuelve el nombre del objetivo de la Noche, o None."""
+        candidatos = self._candidatos(jugador, partida)
+        return self.rng.choice(candidatos).name if candidatos else None
+
+    def voto_dia(self, jugador, partida):
+        """Devuelve el nombre del jugador a linchar, o None para abstenerse."""
+        candidatos = self._candidatos(jugador, partida)
+        if not candidatos or self.rng.random() < self.probabilidad_abstenerse:
+            return None
+        return self.rng.choice(candidatos).name
+
+
+class AgenteGuionado:
+    """Sigue un guion fijo: la lista de objetivos de cada fase en que le toca actuar.
+
+    Un None en el guion (o el guion agotado) significa no actuar.
+    """
+
+    def __init__(self, guion):
+        self.guion = list(guion)
+
+    def _siguiente(self):
+        return self.guion.pop(0) if self.guion else None
+
+    def accion_nocturna(self, jugador, partida):
+        return self._siguiente()
+
+    def voto_dia(self, jugador, partida):
+        return self._siguiente()
+
+
+# --- MOTOR ---
+
+class ResultadoSimulacion:
+    def __init__(self):
+        self.ganadores = Counter()
+        self.partidas_terminadas = 0
+        self.fases_jugadas = 0
+        self.latencias_fase = {"Noche": [], "Día": []} # Segundos reales por resolución
+        self.segundos_reales = 0.0
+        self.segundos_virtuales = 0.0
+
+    @property
+    def partidas_por_segundo(self):
+        return self.partidas_terminadas / self.segundos_reales if self.segundos_reales else 0.0
+
+
+class Simulacion:
+    """Varias partidas a la vez sobre el mismo reloj virtual."""
+
+    def __init__(self, crear_agente):
+        self.crear_agente = crear_agente
+        self.reloj = RelojVirtual()
+        self.resultado = ResultadoSimulacion()
+        self.bot_simulado = BotSimulado()
+        self.agentes = {} # {id_jugador: agente}
+        self.fases_resueltas = Counter() # {canal_id: fases resueltas}
+        self.fase_jugada = {} # {canal_id: fases resueltas cuando actuaron por última vez}
+
+    @contextmanager
+    def entorno(self):
+        """Reemplaza las dependencias de Discord, disco y tiempo real del bot."""
+        anteriores = {
+            nombre: getattr(bot, nombre)
+            for nombre in ("bot", "planificador", "cola_salida", "ranking_store", "RANKING_FILE",
+                           "RANKING_BACKEND", "procesar_noche", "procesar_dia", "terminar_juego")
+        }
+
+        def medir(procesar, fase):
+            async def procesar_medido(partida):
+                id_canal = partida["canal_juego"].id
+                inicio = time.perf_counter()
+                await procesar(partida)
+                self.resultado.latencias_fase[fase].append(time.perf_counter() - inicio)
+                self.resultado.fases_jugadas += 1
+                self.fases_resueltas[id_canal] += 1
+            return procesar_medido
+
+        async def terminar_y_contar(partida, ganador):
+            self.resultado.ganadores[ganador] += 1
+            self.resultado.partidas_terminadas += 1
+            await anteriores["terminar_juego"](partida, ganador)
+
+        ranking = RankingEnMemoria()
+        bot.bot = self.bot_simulado
+        bot.planificador = PlanificadorFases(bot.fin_de_fase, reloj=self.reloj, automatico=False)
+        bot.cola_salida = ColaSalida()
+        bot.ranking_store = ranking
+        bot.RANKING_FILE = ranking.ruta
+        bot.RANKING_BACKEND = "json"
+        bot.procesar_noche = medir(anteriores["procesar_noche"], "Noche")
+        bot.procesar_dia = medir(anteriores["procesar_dia"], "Día")
+        bot.terminar_juego = terminar_y_contar
+        try:
+            yield
+        finally:
+            bot.planificador.detener()
+            bot.cola_salida.descartar()
+            bot.partidas.clear()
+            bot.partida_por_jugador.clear()
+            for nombre, valor in anteriores.items():
+                setattr(bot, nombre, valor)
+
+    def agente_de(self, jugador):
+        if jugador.id not in self.agentes:
+            self.agentes[jugador.id] = self.crear_agente(jugador)
+        return self.agentes[jugador.id]
+
+    async def preparar_partida(self, numero, num_jugadores, modo):
+        """Crea una partida, suma a los jugadores y la inicia."""
+        canal = CanalSimulado(10_000_000 + numero)
+        servidor = ServidorSimulado(1 + numero % 16)
+        jugadores = [MiembroSimulado(numero * 1000 + i, f"Jugador{i}") for i in range(1, num_jugadores + 1)]
+        for jugador in jugadores:
+            self.bot_simulado.usuarios[jugador.id] = jugador
+
+        creador = ContextoSimulado(jugadores[0], canal, servidor)
+        if modo == "rapido":
+            await bot.crear_partida_rapida(creador, num_jugadores)
+        else:
+            await bot.crear_partida(creador, num_jugadores)
+
+        for jugador in jugadores:
+            await bot.unirse_partida(ContextoSimulado(jugador, canal, servidor))
+        await bot.iniciar_comando(creador)
+        return canal, servidor
+
+    async def jugar_fase(self, canal, servidor):
+        """Hace actuar una vez a los jugadores habilitados en la fase actual de una partida."""
+        partida = bot.partidas[canal.id]
+        fase = partida["fase_actual"]
+        resueltas = self.fases_resueltas[canal.id]
+        self.fase_jugada[canal.id] = resueltas
+
+        for jugador in list(partida["jugadores_vivos"].values()):
+            # Una acción puede resolver la fase antes de tiempo
+            if self.fases_resueltas[canal.id] != resueltas:
+                return
+
+            agente = self.agente_de(jugador)
+            rol = partida["roles_asignados"][jugador.id]
+            if fase == "Noche" and rol in ("Mafioso", "Policía"):
+                objetivo = agente.accion_nocturna(jugador, partida)
+                if objetivo:
+                    comando = bot.votar_matar if rol == "Mafioso" else bot.investigar
+                    await comando(ContextoSimulado(jugador, jugador), objetivo)
+            elif fase == "Día":
+                objetivo = agente.voto_dia(jugador, partida)
+                if objetivo:
+                    await bot.votar_dia(ContextoSimulado(jugador, canal, servidor), objetivo)
+
+    async def jugar(self, cantidad_partidas, num_jugadores, modo):
+        inicio = time.perf_counter()
+        with self.entorno():
+            mesas = [await self.preparar_partida(numero, num_jugadores, modo)
+                     for numero in range(cantidad_partidas)]
+
+            while True:
+                activas = [(canal, servidor) for canal, servidor in mesas if canal.id in bot.partidas]
+                if not activas:
+                    break
+
+                for canal, servidor in activas:
+                    # Actuar en cada fase nueva hasta quedar esperando a que venza el tiempo
+                    while (canal.id in bot.partidas
+                           and self.fase_jugada.get(canal.id) != self.fases_resueltas[canal.id]):
+                        if self.fases_resueltas[canal.id] >= MAX_FASES:
+                            bot.reset_partida(bot.partidas[canal.id])
+                            break
+                        await self.jugar_fase(canal, servidor)
+
+                # Las fases que no terminaron antes de tiempo vencen en el reloj virtual
+                proximo = bot.planificador.proximo_vencimiento()
+                if proximo is not None:
+                    self.reloj.avanzar_hasta(proximo)
+                    await bot.planificador.disparar_vencidos()
+                await bot.cola_salida.vaciar()
+
+        self.resultado.segundos_reales = time.perf_counter() - inicio
+        self.resultado.segundos_virtuales = self.reloj.ahora
+        return self.resultado
+
+
+async def simular(cantidad_partidas=1, num_jugadores=8, modo="rapido", semilla=None, crear_agente=None):
+    """Juega `cantidad_partidas` partidas a la vez y devuelve un ResultadoSimulacion.
+
+    `crear_agente(jugador)` devuelve el agente de cada jugador; por defecto
+    todos son AgenteAleatorio con la semilla indicada.
+    """
+    random.seed(semilla) # asignar_roles usa el módulo random
+    if crear_agente is None:
+        agente_aleatorio = AgenteAleatorio(random.Random(semilla))
+        crear_agente = lambda jugador: agente_aleatorio
+
+    return await Simulacion(crear_agente).jugar(cantidad_partidas, num_jugadores, modo)
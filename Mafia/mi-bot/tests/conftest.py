@@ -2,54 +2,44 @@ import pytest
 import os
 from unittest.mock import AsyncMock, MagicMock
 import bot
-from discord.ext import tasks # Necesario para detener el loop en tests
 
 # Archivo ranking temporal
 # ¡CORRECCIÓN APLICADA AQUÍ! Se eliminó el prefijo 'tests/'
 TEST_RANKING_FILE = "test_ranking.json" 
+TEST_RANKING_SERVIDORES_FILE = "test_ranking_servidores.json"
 bot.RANKING_FILE = TEST_RANKING_FILE
 
-# Estado inicial del juego (actualizado para coincidir con el bot.py)
-ESTADO_INICIAL = {
-    "activa": False,
-    "max_jugadores": 0,
-    "modo": "normal", # Agregado 'modo'
-    "fase_actual": "Inscripción", # Cambiado de 'fase' a 'fase_actual'
-    "jugadores_vivos": {}, # Cambiado de 'jugadores_unidos'
-    "jugadores_muertos": {}, # Agregado
-    "roles_asignados": {}, # Cambiado de 'roles'
-    "votos_dia": {},
-    "acciones_nocturnas": {}, # Cambiado de 'victima_noche_id'
-    "canal_juego": None,
-}
-
 # -------------------------------
 # Reiniciar estado antes/después
 # -------------------------------
+def limpiar_partidas():
+    # Asegurar que ningún temporizador quede pendiente entre tests
+    bot.planificador.detener()
+    bot.cola_salida.descartar()
+
+    bot.partidas.clear()
+    bot.partida_por_jugador.clear()
+
+    # El ranking vive en memoria: se descarta para que cada test lea su archivo
+    bot.ranking_store = None
+
+
 @pytest.fixture(autouse=True)
 def reiniciar_juego():
 
-    # Asegurar que el loop esté detenido antes de iniciar cualquier test
-    if bot.partida_loop.is_running():
-        bot.partida_loop.stop()
-
-    bot.partida_mafia.clear()
-    bot.partida_mafia.update(ESTADO_INICIAL)
+    limpiar_partidas()
 
-    if os.path.exists(TEST_RANKING_FILE):
-        os.remove(TEST_RANKING_FILE)
+    for archivo in (TEST_RANKING_FILE, TEST_RANKING_SERVIDORES_FILE):
+        if os.path.exists(archivo):
+            os.remove(archivo)
 
     yield
 
-    # Asegurar que el loop esté detenido al finalizar el test
-    if bot.partida_loop.is_running():
-        bot.partida_loop.stop()
-        
-    bot.partida_mafia.clear()
-    bot.partida_mafia.update(ESTADO_INICIAL)
+    limpiar_partidas()
 
-    if os.path.exists(TEST_RANKING_FILE):
-        os.remove(TEST_RANKING_FILE)
+    for archivo in (TEST_RANKING_FILE, TEST_RANKING_SERVIDORES_FILE):
+        if os.path.exists(archivo):
+            os.remove(archivo)
 
 
 # -------------------------------
@@ -96,4 +86,14 @@ def ctx_falso(crear_jugador, bot_falso):
 
     ctx.bot = bot_falso
 
-    return ctx
\ No newline at end of file
+    return ctx
+
+
+# -------------------------------
+# Partida registrada en el canal del ctx falso
+# -------------------------------
+@pytest.fixture
+def partida(ctx_falso):
+    p = bot.crear_estado_partida(ctx_falso.channel)
+    bot.registrar_partida(p)
+    return p
@@ -0,0 +1,73 @@
+import random
+
+import pytest
+import bot
+from clasificacion import Clasificacion
+
+
+def test_top_posicion_y_paginas():
+    tabla = Clasificacion(tamano_top=2)
+    for i, puntos in enumerate([30, 10, 50, 20, 40]):
+        tabla.actualizar(str(i), f"J{i}", puntos)
+
+    assert tabla.top(2) == [("2", "J2", 50), ("4", "J4", 40)]
+    assert tabla.top(2, desde=2) == [("0", "J0", 30), ("3", "J3", 20)]
+    assert tabla.posicion("1") == (5, 10)
+
+    # Subir a J1 al primer puesto reordena sin recalcular toda la tabla
+    tabla.actualizar("1", "J1", 60)
+    assert tabla.top(1) == [("1", "J1", 60)]
+    assert tabla.posicion("2") == (2, 50)
+    assert tabla.posicion("nadie") is None
+
+
+def test_version_top_solo_cambia_si_cambia_el_top():
+    tabla = Clasificacion(tamano_top=2)
+    tabla.actualizar("a", "A", 100)
+    tabla.actualizar("b", "B", 90)
+    version = tabla.version_top
+
+    tabla.actualizar("c", "C", 5) # Fuera del top
+    tabla.actualizar("c", "C", 10)
+    assert tabla.version_top == version
+
+    tabla.actualizar("c", "C", 95) # Entra al top
+    assert tabla.version_top == version + 1
+
+
+@pytest.mark.asyncio
+async def test_comando_ranking_usa_texto_en_cache(ctx_falso, bot_falso):
+    bot.bot.get_user.return_value.name = "Karen"
+    bot.update_ranking(101, 10)
+
+    await bot.mostrar_ranking(ctx_falso)
+    primer_texto = ctx_falso.send.call_args.args[0]
+    assert "Karen**: 10 puntos" in primer_texto
+
+    # Sin cambios en el top, se reutiliza el mismo texto
+    await bot.mostrar_ranking(ctx_falso)
+    assert ctx_falso.send.call_args.args[0] is primer_texto
+
+    bot.update_ranking(101, 5)
+    await bot.mostrar_ranking(ctx_falso)
+    assert "Karen**: 15 puntos" in ctx_falso.send.call_args.args[0]
+
+    await bot.mostrar_ranking(ctx_falso, "3")
+    assert ctx_falso.send.call_args.args[0] == "La página debe estar entre 1 y 1."
+
+
+def test_coincide_con_ordenar_la_tabla():
+    azar = random.Random(7)
+    tabla = Clasificacion(tamano_top=5)
+    puntos = {}
+    for _ in range(2000):
+        id_usuario = str(azar.randrange(300))
+        puntos[id_usuario] = azar.randrange(50)
+        tabla.actualizar(id_usuario, id_usuario, puntos[id_usuario])
+
+    ordenados = sorted((-p, u) for u, p in puntos.items())
+    assert len(tabla) == len(puntos)
+    assert tabla.top(len(puntos) + 5) == [(u, u, -p) for p, u in ordenados]
+    assert tabla.top(7, desde=100) == [(u, u, -p) for p, u in ordenados[100:107]]
+    for id_usuario, p in puntos.items():
+        assert tabla.posicion(id_usuario) == (sum(q > p for q in puntos.values()) + 1, p)
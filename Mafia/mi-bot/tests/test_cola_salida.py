@@ -0,0 +1,82 @@
+import asyncio
+import discord
+import pytest
+import bot
+from unittest.mock import AsyncMock, MagicMock
+from mensajeria import ColaSalida, agrupar_mensajes
+
+
+def crear_canal(id_canal):
+    canal = MagicMock()
+    canal.id = id_canal
+    canal.send = AsyncMock()
+    return canal
+
+
+def test_agrupar_respeta_el_limite():
+    assert agrupar_mensajes(["hola", "chau"], limite=20) == ["hola\nchau"]
+    assert agrupar_mensajes(["a" * 8, "b" * 8], limite=10) == ["a" * 8, "b" * 8]
+    assert agrupar_mensajes(["c" * 25], limite=10) == ["c" * 10, "c" * 10, "c" * 5]
+
+
+@pytest.mark.asyncio
+async def test_mensajes_del_mismo_tick_se_envian_juntos():
+    cola = ColaSalida()
+    canal_a = crear_canal(1)
+    canal_b = crear_canal(2)
+
+    await cola.encolar(canal_a, "¡Ana ha sido asesinada!")
+    await cola.encolar(canal_b, "Otra partida")
+    await cola.encolar(canal_a, "🌞 ¡Día ha comenzado!")
+    await cola.vaciar()
+
+    canal_a.send.assert_called_once_with("¡Ana ha sido asesinada!\n🌞 ¡Día ha comenzado!")
+    canal_b.send.assert_called_once_with("Otra partida")
+
+
+@pytest.mark.asyncio
+async def test_cola_llena_frena_al_productor():
+    cola = ColaSalida(max_pendientes=2)
+    canal = crear_canal(1)
+
+    await cola.encolar(canal, "1")
+    await cola.encolar(canal, "2")
+    tercero = asyncio.create_task(cola.encolar(canal, "3"))
+    await asyncio.sleep(0)
+    assert not tercero.done() # Espera a que se envíe lo pendiente
+
+    await tercero
+    await cola.vaciar()
+    assert [llamada.args[0] for llamada in canal.send.call_args_list] == ["1\n2", "3"]
+
+
+@pytest.mark.asyncio
+async def test_fin_de_noche_en_un_solo_mensaje(ctx_falso, crear_jugador, partida):
+    for i, nombre in enumerate(["Ana", "Luis", "Mia", "Leo", "Sol"], start=1):
+        bot.agregar_jugador(partida, crear_jugador(i, nombre))
+    partida["activa"] = True
+    partida["fase_actual"] = "Noche"
+    partida["roles_asignados"] = {1: "Mafioso", 2: "Ciudadano", 3: "Ciudadano", 4: "Ciudadano", 5: "Ciudadano"}
+    partida["acciones_nocturnas"] = {1: ("matar", 4)}
+
+    await bot.procesar_noche(partida)
+    await bot.cola_salida.vaciar()
+
+    # Aviso de muerte y anuncio del Día salen en una sola llamada a la API
+    ctx_falso.channel.send.assert_called_once()
+    texto = ctx_falso.channel.send.call_args.args[0]
+    assert "¡Leo ha sido asesinado por la Mafia!" in texto
+    assert "¡Día ha comenzado!" in texto
+
+
+@pytest.mark.asyncio
+async def test_envio_fallido_queda_en_el_log(caplog):
+    cola = ColaSalida()
+    canal = crear_canal(9)
+    canal.send.side_effect = discord.HTTPException(MagicMock(status=500, reason="Error"), "caído")
+
+    with caplog.at_level("WARNING", logger="mensajeria"):
+        await cola.encolar(canal, "hola")
+        await cola.vaciar()
+
+    assert "No se pudo enviar un mensaje al canal 9" in caplog.text
@@ -0,0 +1,77 @@
+import pytest
+import bot
+from indice_nombres import IndiceNombres
+
+
+def test_busqueda_por_nombre_mencion_y_prefijo(crear_jugador):
+    indice = IndiceNombres()
+    ana = crear_jugador(1, "Ana")
+    andres = crear_jugador(2, "Andrés")
+    luis = crear_jugador(3, "Luis")
+    luis.display_name = "El Lucho"
+    for jugador in (ana, andres, luis):
+        indice.agregar(jugador)
+
+    assert indice.buscar("ANA") == [ana]          # Exacto, sin distinguir mayúsculas
+    assert indice.buscar("<@!2>") == [andres]     # Mención
+    assert indice.buscar("3") == [luis]           # ID
+    assert indice.buscar("el lucho") == [luis]    # Apodo
+    assert indice.buscar("lu") == [luis]          # Prefijo único
+    assert sorted(j.id for j in indice.buscar("an")) == [1, 2] # Prefijo ambiguo
+
+    indice.quitar(andres)
+    assert indice.buscar("an") == [ana]
+
+
+def test_quitar_despues_de_un_cambio_de_apodo(crear_jugador):
+    indice = IndiceNombres()
+    ana = crear_jugador(1, "Ana")
+    ana.display_name = "Anita"
+    indice.agregar(ana)
+
+    # Discord actualiza el mismo Member cuando cambia el apodo
+    ana.display_name = "La Jefa"
+    indice.quitar(ana)
+
+    assert indice.buscar("ani") == []
+    assert indice.buscar("anita") == [] and len(indice) == 0
+
+
+@pytest.mark.asyncio
+async def test_votar_avisa_si_el_nombre_es_ambiguo(ctx_falso, crear_jugador, partida):
+    votante = crear_jugador(1, "Votante")
+    for jugador in (votante, crear_jugador(2, "Ana"), crear_jugador(3, "Andrés")):
+        bot.agregar_jugador(partida, jugador)
+    partida["fase_actual"] = "Día"
+    ctx_falso.author = votante
+
+    await bot.votar_dia(ctx_falso, "an")
+
+    assert partida["votos_dia"] == {}
+    ctx_falso.send.assert_called_once_with(
+        "'an' coincide con varios jugadores: Ana, Andrés. Escribe el nombre completo o menciónalo.")
+
+
+@pytest.mark.asyncio
+async def test_eliminar_jugador_lo_saca_del_indice_de_vivos(crear_jugador, partida):
+    ana, andres = crear_jugador(1, "Ana"), crear_jugador(2, "Andrés")
+    for jugador in (ana, andres):
+        bot.agregar_jugador(partida, jugador)
+
+    await bot.eliminar_jugador(partida, andres, "Ciudadano", "linchado")
+
+    assert len(partida["indice_nombres"]) == 1
+    assert bot.buscar_jugadores_por_nombre(partida, "an") == [ana]
+    assert bot.buscar_jugador_por_nombre(partida, "andrés", solo_vivos=False) is andres
+
+
+@pytest.mark.asyncio
+async def test_exacto_vivo_gana_sobre_prefijo_muerto(crear_jugador, partida):
+    ana, anabel = crear_jugador(1, "Ana"), crear_jugador(2, "Anabel")
+    for jugador in (ana, anabel):
+        bot.agregar_jugador(partida, jugador)
+
+    await bot.eliminar_jugador(partida, anabel, "Ciudadano", "linchado")
+
+    assert bot.buscar_jugador_por_nombre(partida, "ana", solo_vivos=False) is ana
+    assert bot.buscar_jugador_por_nombre(partida, "anab", solo_vivos=False) is anabel
@@ -0,0 +1,38 @@
+import asyncio
+import discord
+import pytest
+import bot
+from notificaciones import MAX_DMS_CONCURRENTES
+from unittest.mock import MagicMock
+
+
+@pytest.mark.asyncio
+async def test_roles_por_dm_en_paralelo_con_resumen(ctx_falso, crear_jugador, partida):
+    jugadores = [crear_jugador(i, f"J{i}") for i in range(1, 21)]
+    for jugador in jugadores:
+        bot.agregar_jugador(partida, jugador)
+    partida["roles_asignados"] = {j.id: "Ciudadano" for j in jugadores}
+    partida["roles_asignados"].update({1: "Mafioso", 2: "Mafioso", 3: "Policía"})
+
+    en_vuelo = 0
+    maximo_en_vuelo = 0
+
+    async def enviar_lento(mensaje):
+        nonlocal en_vuelo, maximo_en_vuelo
+        en_vuelo += 1
+        maximo_en_vuelo = max(maximo_en_vuelo, en_vuelo)
+        await asyncio.sleep(0.01)
+        en_vuelo -= 1
+
+    for jugador in jugadores:
+        jugador.send.side_effect = enviar_lento
+    jugadores[4].send.side_effect = discord.Forbidden(MagicMock(status=403), "DMs cerrados")
+
+    await bot.notificar_roles(partida)
+    await bot.cola_salida.vaciar()
+
+    assert 1 < maximo_en_vuelo <= MAX_DMS_CONCURRENTES
+    assert "Tus compañeros de Mafia son: J2." in jugadores[0].send.call_args.args[0]
+    assert "investigar" in jugadores[2].send.call_args.args[0]
+    ctx_falso.channel.send.assert_called_once()
+    assert "J5" in ctx_falso.channel.send.call_args.args[0]
@@ -6,5 +6,6 @@ async def test_crear_partida_rapida(ctx_falso):
     # Se llama al comando `crear_partida_rapida`
     await bot.crear_partida_rapida(ctx_falso, 4) # Mínimo 4 jugadores
 
-    assert bot.partida_mafia["activa"] is True
-    assert bot.partida_mafia["modo"] == "rapido" # Verificación de 'modo'
\ No newline at end of file
+    partida = bot.partidas[ctx_falso.channel.id]
+    assert partida["activa"] is True
+    assert partida["modo"] == "rapido" # Verificación de 'modo'
\ No newline at end of file
@@ -0,0 +1,63 @@
+import pytest
+import bot
+from unittest.mock import AsyncMock, MagicMock
+
+
+def crear_ctx(canal_id, autor, en_dm=False):
+    ctx = MagicMock()
+    ctx.guild = None if en_dm else MagicMock()
+    ctx.channel = MagicMock()
+    ctx.channel.id = canal_id
+    ctx.channel.send = AsyncMock()
+    ctx.send = ctx.channel.send
+    ctx.author = autor
+    return ctx
+
+
+@pytest.mark.asyncio
+async def test_dos_partidas_en_canales_distintos(crear_jugador, bot_falso):
+    ana = crear_jugador(1, "Ana")
+    luis = crear_jugador(2, "Luis")
+
+    await bot.crear_partida(crear_ctx(100, ana), 4)
+    await bot.crear_partida_rapida(crear_ctx(200, luis), 4)
+
+    # Cada canal tiene su propia partida
+    assert bot.partidas[100]["modo"] == "normal"
+    assert bot.partidas[200]["modo"] == "rapido"
+
+    await bot.unirse_partida(crear_ctx(100, ana))
+    await bot.unirse_partida(crear_ctx(200, luis))
+
+    assert 1 in bot.partidas[100]["jugadores_vivos"]
+    assert 2 in bot.partidas[200]["jugadores_vivos"]
+    assert bot.obtener_partida_de_jugador(1) is bot.partidas[100]
+    assert bot.obtener_partida_de_jugador(2) is bot.partidas[200]
+
+    # Un jugador no puede estar en dos partidas a la vez
+    ctx_otro_canal = crear_ctx(200, ana)
+    await bot.unirse_partida(ctx_otro_canal)
+    assert 1 not in bot.partidas[200]["jugadores_vivos"]
+
+
+@pytest.mark.asyncio
+async def test_dm_se_resuelve_por_jugador(crear_jugador, bot_falso):
+    mafioso = crear_jugador(1, "Mafioso")
+    victima = crear_jugador(2, "Victima")
+
+    partida = bot.crear_estado_partida(crear_ctx(300, mafioso).channel)
+    partida["activa"] = True
+    partida["fase_actual"] = "Noche"
+    partida["roles_asignados"] = {1: "Mafioso", 2: "Ciudadano"}
+    bot.registrar_partida(partida)
+    bot.agregar_jugador(partida, mafioso)
+    bot.agregar_jugador(partida, victima)
+
+    await bot.votar_matar(crear_ctx(999, mafioso, en_dm=True), "victima")
+
+    assert partida["acciones_nocturnas"] == {1: ("matar", 2)}
+
+    # Terminar la partida libera a sus jugadores
+    bot.reset_partida(partida)
+    assert 300 not in bot.partidas
+    assert bot.obtener_partida_de_jugador(1) is None
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+import bot
+from planificador import PlanificadorFases
+
+
+class RelojFalso:
+    def __init__(self):
+        self.ahora = 0.0
+
+    def __call__(self):
+        return self.ahora
+
+
+@pytest.mark.asyncio
+async def test_vencimientos_en_orden_y_cancelacion():
+    reloj = RelojFalso()
+    planificador = PlanificadorFases(None, reloj=reloj)
+
+    planificador.programar("a", 30)
+    planificador.programar("b", 10)
+    planificador.programar("c", 20)
+    planificador.cancelar("c")
+    planificador.programar("a", 5) # Reprogramar reemplaza el vencimiento anterior
+
+    reloj.ahora = 25
+    assert planificador.extraer_vencidos() == ["a", "b"]
+    assert len(planificador) == 0
+    assert planificador.proximo_vencimiento() is None
+
+    planificador.detener()
+
+
+@pytest.mark.asyncio
+async def test_la_tarea_dispara_la_corrutina():
+    disparadas = []
+
+    async def al_vencer(clave):
+        disparadas.append(clave)
+
+    planificador = PlanificadorFases(al_vencer)
+    planificador.programar("lenta", 10)
+    planificador.programar("rapida", 0.01)
+
+    await asyncio.sleep(0.05)
+
+    assert disparadas == ["rapida"]
+    assert "lenta" in planificador
+    planificador.detener()
+
+
+@pytest.mark.asyncio
+async def test_dia_termina_antes_si_todos_votaron(ctx_falso, crear_jugador, partida):
+    jugadores = {i: crear_jugador(i, f"J{i}") for i in range(1, 6)}
+    partida["activa"] = True
+    partida["fase_actual"] = "Día"
+    for jugador in jugadores.values():
+        bot.agregar_jugador(partida, jugador)
+    partida["roles_asignados"] = {1: "Mafioso", 2: "Mafioso", 3: "Ciudadano", 4: "Ciudadano", 5: "Policía"}
+    bot.iniciar_temporizador(partida, 120)
+
+    # Todos votan: el último voto resuelve el Día sin esperar los 120 segundos
+    for votante, objetivo in [(1, "J3"), (2, "J3"), (3, "J1"), (4, "J1"), (5, "J1")]:
+        ctx_falso.author = jugadores[votante]
+        await bot.votar_dia(ctx_falso, objetivo)
+
+    assert 1 in partida["jugadores_muertos"]
+    assert partida["fase_actual"] == "Noche"
@@ -0,0 +1,53 @@
+import json
+import sqlite3
+import pytest
+from ranking import RankingSQLite
+
+
+@pytest.fixture
+def ranking_sqlite(tmp_path):
+    ranking = RankingSQLite(str(tmp_path / "ranking.db"))
+    yield ranking
+    ranking.cerrar()
+
+
+@pytest.mark.asyncio
+async def test_top_y_posicion_por_servidor(ranking_sqlite):
+    ranking_sqlite.aplicar_lote({1: ("Ana", 10), 2: ("Luis", 15)}, guild_id=500)
+    ranking_sqlite.aplicar_lote({3: ("Mia", 30)}, guild_id=600)
+    ranking_sqlite.aplicar_lote({1: ("Ana", 10)}, guild_id=500)
+
+    # Ranking global: suma de todos los servidores
+    assert await ranking_sqlite.top(2) == [("3", "Mia", 30), ("1", "Ana", 20)]
+    assert await ranking_sqlite.posicion(2) == (3, 15)
+
+    # Ranking del servidor 500
+    assert await ranking_sqlite.top(10, guild_id=500) == [("1", "Ana", 20), ("2", "Luis", 15)]
+    assert await ranking_sqlite.posicion(1, guild_id=500) == (1, 20)
+    assert await ranking_sqlite.posicion(3, guild_id=500) is None
+
+
+@pytest.mark.asyncio
+async def test_registrar_partida(ranking_sqlite, tmp_path):
+    ranking_sqlite.registrar_partida(500, 42, "rapido", "Mafia", {
+        1: ("Mafioso", True, 15),
+        2: ("Ciudadano", False, 0),
+    })
+    await ranking_sqlite.vaciar()
+
+    conexion = sqlite3.connect(str(tmp_path / "ranking.db"))
+    assert conexion.execute("SELECT guild_id, canal_id, modo, ganador FROM partidas").fetchall() == [(500, 42, "rapido", "Mafia")]
+    assert conexion.execute("SELECT usuario_id, gano, puntos FROM resultados ORDER BY usuario_id").fetchall() == [("1", 1, 15), ("2", 0, 0)]
+    conexion.close()
+
+
+def test_migracion_desde_json_una_sola_vez(tmp_path):
+    ruta_json = tmp_path / "ranking.json"
+    ruta_json.write_text(json.dumps({"10": {"nombre": "Mafia", "puntos": 145}}))
+    ruta_db = str(tmp_path / "ranking.db")
+
+    RankingSQLite(ruta_db, migrar_desde=str(ruta_json)).cerrar()
+    ranking = RankingSQLite(ruta_db, migrar_desde=str(ruta_json)) # No debe duplicar puntos
+
+    assert ranking.cargar() == {"10": {"nombre": "Mafia", "puntos": 145}}
+    ranking.cerrar()
@@ -0,0 +1,64 @@
+import json
+import os
+import pytest
+import bot
+import ranking as modulo_ranking
+from ranking import RankingJSON
+from unittest.mock import patch
+
+
+@pytest.mark.asyncio
+async def test_lote_se_escribe_una_sola_vez(tmp_path):
+    ruta = tmp_path / "ranking.json"
+    ranking = RankingJSON(str(ruta))
+
+    with patch("ranking.escribir_atomico", wraps=modulo_ranking.escribir_atomico) as escribir:
+        ranking.aplicar_lote({1: ("Ana", 10), 2: ("Luis", 10)})
+        ranking.aplicar_lote({1: ("Ana", 5)})
+        await ranking.vaciar()
+
+    # Los dos lotes del mismo tick se agrupan en una única escritura
+    assert escribir.call_count == 1
+    with open(ruta) as f:
+        assert json.load(f) == {
+            "1": {"nombre": "Ana", "puntos": 15},
+            "2": {"nombre": "Luis", "puntos": 10},
+        }
+    # No quedan archivos temporales
+    assert os.listdir(tmp_path) == ["ranking.json"]
+
+
+def test_sin_event_loop_guarda_en_el_momento(tmp_path):
+    ruta = tmp_path / "ranking.json"
+    RankingJSON(str(ruta)).aplicar_lote({7: ("Mia", 3)})
+
+    assert RankingJSON(str(ruta)).cargar() == {"7": {"nombre": "Mia", "puntos": 3}}
+
+
+@pytest.mark.asyncio
+async def test_ranking_por_servidor(tmp_path):
+    ruta = tmp_path / "ranking.json"
+    ranking = RankingJSON(str(ruta))
+    ranking.aplicar_lote({1: ("Ana", 10)}, guild_id=500)
+    ranking.aplicar_lote({2: ("Luis", 20)}, guild_id=600)
+    await ranking.vaciar()
+
+    # El global suma todos los servidores; cada servidor, solo lo suyo
+    assert await ranking.top(5) == [("2", "Luis", 20), ("1", "Ana", 10)]
+    assert await ranking.top(5, guild_id=500) == [("1", "Ana", 10)]
+    assert await ranking.posicion(2, guild_id=500) is None
+    assert await ranking.cantidad(guild_id=700) == 0
+
+    # Sobrevive a reiniciar el bot
+    assert await RankingJSON(str(ruta)).top(5, guild_id=600) == [("2", "Luis", 20)]
+
+
+@pytest.mark.asyncio
+async def test_terminar_juego_actualiza_ranking_en_lote(ctx_falso, partida):
+    partida["activa"] = True
+    partida["roles_asignados"] = {1: "Mafioso", 2: "Mafioso", 3: "Ciudadano"}
+
+    with patch("bot.update_ranking_lote") as actualizar:
+        await bot.terminar_juego(partida, "Mafia")
+
+    actualizar.assert_called_once_with({1: 15, 2: 15}, partida["guild_id"])
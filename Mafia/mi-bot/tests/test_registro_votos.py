@@ -0,0 +1,54 @@
+import pytest
+import bot
+from votos import RegistroVotos
+
+
+def test_conteo_y_lider_incrementales():
+    votos = RegistroVotos()
+    assert votos.lider() == (None, 0)
+
+    assert votos.votar(1, "A") == 1
+    assert votos.votar(2, "B") == 1
+    assert votos.votar(3, "B") == 2
+    assert votos.lider() == ("B", 2)
+
+    # Cambiar el voto mueve el conteo
+    assert votos.votar(3, "A") == 2
+    assert votos.votos_de("B") == 1
+    assert votos.lider() == ("A", 2)
+
+    # Retirar el voto
+    assert votos.retirar(1) == "A"
+    assert votos.retirar(1) is None
+    assert votos.lider() == ("B", 1) # Empate: gana el que llegó primero a 1 voto
+    assert list(votos.tabla()) == [("B", 1), ("A", 1)]
+    assert votos == {2: "B", 3: "A"}
+
+    votos.limpiar()
+    assert votos == {}
+    assert votos.lider() == (None, 0)
+
+
+@pytest.mark.asyncio
+async def test_mayoria_termina_el_dia_y_comando_votos(ctx_falso, crear_jugador, partida):
+    jugadores = {i: crear_jugador(i, f"J{i}") for i in range(1, 6)}
+    for jugador in jugadores.values():
+        bot.agregar_jugador(partida, jugador)
+    partida["activa"] = True
+    partida["fase_actual"] = "Día"
+    partida["roles_asignados"] = {1: "Mafioso", 2: "Mafioso", 3: "Ciudadano", 4: "Ciudadano", 5: "Policía"}
+    bot.iniciar_temporizador(partida, 120)
+
+    for votante in (3, 4):
+        ctx_falso.author = jugadores[votante]
+        await bot.votar_dia(ctx_falso, "J1")
+
+    await bot.mostrar_votos(ctx_falso)
+    assert ctx_falso.send.call_args.args[0] == "**🗳️ Votos del Día** (mayoría: 3)\n- J1: 2"
+
+    # El tercer voto es mayoría: el Día termina sin esperar a que vote el resto
+    ctx_falso.author = jugadores[5]
+    await bot.votar_dia(ctx_falso, "J1")
+
+    assert 1 in partida["jugadores_muertos"]
+    assert partida["fase_actual"] == "Noche"
@@ -0,0 +1,40 @@
+import pytest
+import bot
+from simulacion import AgenteGuionado, simular
+
+
+@pytest.mark.asyncio
+async def test_partidas_completas_sin_discord():
+    planificador_original = bot.planificador
+
+    resultado = await simular(cantidad_partidas=20, num_jugadores=8, semilla=7)
+
+    # Todas las partidas terminan, con reloj virtual y sin esperas reales
+    assert resultado.partidas_terminadas == 20
+    assert sum(resultado.ganadores.values()) == 20
+    assert resultado.segundos_virtuales > 0
+    assert resultado.segundos_reales < 5
+    assert resultado.latencias_fase["Noche"]
+
+    # El bot queda como estaba
+    assert bot.planificador is planificador_original
+    assert bot.partidas == {}
+
+
+@pytest.mark.asyncio
+async def test_misma_semilla_mismo_resultado():
+    primero = await simular(cantidad_partidas=10, semilla=3)
+    segundo = await simular(cantidad_partidas=10, semilla=3)
+
+    assert primero.ganadores == segundo.ganadores
+    assert primero.fases_jugadas == segundo.fases_jugadas
+
+
+@pytest.mark.asyncio
+async def test_agentes_pasivos_terminan_por_tiempo():
+    # Nadie actúa: la Mafia no mata, nadie es linchado y las fases vencen por tiempo
+    resultado = await simular(cantidad_partidas=1, num_jugadores=4, crear_agente=lambda jugador: AgenteGuionado([]))
+
+    assert resultado.partidas_terminadas == 0
+    assert resultado.segundos_virtuales > 0
+    assert bot.partidas == {}
@@ -0,0 +1,96 @@
+from collections.abc import Mapping
+
+
+class RegistroVotos(Mapping):
+    """Votos de una fase con el conteo por objetivo actualizado en cada voto.
+
+    Se comporta como un diccionario de solo lectura {votante_id: objetivo_id}.
+    Además guarda cuántos votos tiene cada objetivo y agrupa los objetivos
+    por cantidad de votos, así el conteo de un jugador y el más votado se
+    consultan en O(1) sin volver a recorrer los votos.
+    """
+
+    def __init__(self):
+        self._votos = {} # {votante_id: objetivo_id}
+        self._conteo = {} # {objetivo_id: cantidad de votos}
+        self._por_conteo = {} # {cantidad: {objetivo_id: None}} (en orden de llegada)
+        self._maximo = 0
+
+    @classmethod
+    def desde(cls, votos):
+        """Arma un registro a partir de pares (votante_id, objetivo_id)."""
+        registro = cls()
+        for votante, objetivo in votos:
+            registro.votar(votante, objetivo)
+        return registro
+
+    def __getitem__(self, votante):
+        return self._votos[votante]
+
+    def __iter__(self):
+        return iter(self._votos)
+
+    def __len__(self):
+        return len(self._votos)
+
+    def _mover(self, objetivo, delta):
+        anterior = self._conteo.get(objetivo, 0)
+        nuevo = anterior + delta
+
+        if anterior:
+            grupo = self._por_conteo[anterior]
+            del grupo[objetivo]
+            if not grupo:
+                del self._por_conteo[anterior]
+                if anterior == self._maximo and delta < 0:
+                    self._maximo = nuevo
+
+        if nuevo:
+            self._conteo[objetivo] = nuevo
+            self._por_conteo.setdefault(nuevo, {})[objetivo] = None
+            self._maximo = max(self._maximo, nuevo)
+        else:
+            del self._conteo[objetivo]
+
+    def votar(self, votante, objetivo):
+        """Registra (o cambia) el voto de un jugador. Devuelve los votos del objetivo."""
+        anterior = self._votos.get(votante)
+        if anterior != objetivo:
+            if anterior is not None:
+                self._mover(anterior, -1)
+            self._votos[votante] = objetivo
+            self._mover(objetivo, +1)
+        return self._conteo[objetivo]
+
+    def retirar(self, votante):
+        """Retira el voto de un jugador. Devuelve a quién había votado, o None."""
+        anterior = self._votos.pop(votante, None)
+        if anterior is not None:
+            self._mover(anterior, -1)
+        return anterior
+
+    def votos_de(self, objetivo):
+        """Cantidad de votos que tiene un objetivo."""
+        return self._conteo.get(objetivo, 0)
+
+    def lider(self):
+        """Devuelve (objetivo_id, votos) del más votado, o (None, 0) si no hay votos.
+
+        En caso de empate gana el que llegó primero a esa cantidad de votos.
+        """
+        if not self._maximo:
+            return None, 0
+        return next(iter(self._por_conteo[self._maximo])), self._maximo
+
+    def tabla(self):
+        """Recorre (objetivo_id, votos) de mayor a menor cantidad de votos."""
+        for cantidad in range(self._maximo, 0, -1):
+            for objetivo in self._por_conteo.get(cantidad, ()):
+                yield objetivo, cantidad
+
+    def limpiar(self):
+        """Borra todos los votos."""
+        self._votos.clear()
+        self._conteo.clear()
+        self._por_conteo.clear()
+        self._maximo = 0
@@ -0,0 +1,142 @@
+"""Mide la extracción de cada tienda sobre el corpus capturado, sin navegador ni red.
+
+Uso:
+    python benchmark.py [--version 2026-10-18] [--repeticiones 5]
+
+Por tienda se informa:
+    páginas/s      páginas y respuestas de la API procesadas por segundo
+    productos/s    productos extraídos por segundo
+    parseo (ms)    tiempo solo de parseo (HTML o JSON ya leídos del disco), por página
+    memoria (MB)   pico de memoria de Python durante la extracción
+
+Los tiempos son la mediana de las repeticiones. Todo se mide en este mismo
+proceso, sin los procesos de parseo: su trabajo (y su memoria) no se vería
+en los tiempos ni en tracemalloc. Ver corpus.py para capturar.
+"""
+import argparse
+import json
+import os
+import statistics
+import time
+import tracemalloc
+
+from corpus import CARPETA_CORPUS, CapturaTienda, carpeta_version, reproducir_tienda, ultima_version
+from motor import obtener_tiendas
+from vtex import producto_desde_json
+
+REPETICIONES = 5
+
+
+class Medicion:
+    """Resultado del benchmark de una tienda."""
+
+    def __init__(self, tienda):
+        self.tienda = tienda
+        self.paginas = 0
+        self.productos = 0
+        self.segundos = 0.0 # Extracción completa (lectura del corpus + parseo + recorrido)
+        self.segundos_parseo = 0.0
+        self.memoria_pico = 0 # Bytes
+        self.coincide = True # Lo extraído es igual a lo esperado en la captura
+
+    @property
+    def paginas_por_segundo(self):
+        return self.paginas / self.segundos if self.segundos else 0.0
+
+    @property
+    def productos_por_segundo(self):
+        return self.productos / self.segundos if self.segundos else 0.0
+
+    @property
+    def parseo_por_pagina(self):
+        return self.segundos_parseo / self.paginas if self.paginas else 0.0
+
+
+def _leer_todo(captura):
+    """El contenido de todas las páginas y respuestas capturadas, para medir solo el parseo."""
+    paginas = [captura.pagina(url) for url in captura.indice["paginas"]]
+    respuestas = [captura.respuesta(clave) for clave in captura.indice["api"]]
+    return paginas, respuestas
+
+
+def medir_parseo(tienda, captura, repeticiones=REPETICIONES):
+    """Segundos (mediana) que lleva parsear todo lo capturado de una tienda."""
+    paginas, respuestas = _leer_todo(captura)
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for html in paginas:
+            tienda.parsear(html)
+        for datos in respuestas:
+            for dato in datos:
+                producto_desde_json(dato)
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos)
+
+
+def medir(tienda, captura, repeticiones=REPETICIONES):
+    """Mide la extracción de una tienda sobre su captura y devuelve una Medicion."""
+    medicion = Medicion(tienda.nombre)
+    medicion.paginas = len(captura.indice["paginas"]) + len(captura.indice["api"])
+
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        obtenidos = reproducir_tienda(tienda, captura, en_procesos=False)
+        tiempos.append(time.perf_counter() - inicio)
+    medicion.segundos = statistics.median(tiempos)
+    medicion.productos = sum(len(productos) for productos in obtenidos.values())
+    medicion.coincide = obtenidos == captura.esperados()
+
+    # Una corrida aparte para la memoria: tracemalloc hace más lento todo lo demás
+    tracemalloc.start()
+    try:
+        reproducir_tienda(tienda, captura, en_procesos=False)
+        medicion.memoria_pico = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    medicion.segundos_parseo = medir_parseo(tienda, captura, repeticiones)
+    return medicion
+
+
+def texto(mediciones):
+    lineas = [f"{'Tienda':<12}{'Páginas':>9}{'Productos':>11}{'Páginas/s':>11}{'Productos/s':>13}"
+              f"{'Parseo (ms)':>13}{'Memoria (MB)':>14}"]
+    for m in mediciones:
+        aviso = "" if m.coincide else "  ⚠️ no coincide con la captura"
+        lineas.append(
+            f"{m.tienda:<12}{m.paginas:>9}{m.productos:>11}{m.paginas_por_segundo:>11.1f}"
+            f"{m.productos_por_segundo:>13.0f}{m.parseo_por_pagina * 1000:>13.2f}"
+            f"{m.memoria_pico / 2**20:>14.1f}{aviso}"
+        )
+    return "\n".join(lineas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide la extracción sobre el corpus capturado")
+    parser.add_argument("--version", help="versión del corpus (por defecto, la última)")
+    parser.add_argument("--repeticiones", type=int, default=REPETICIONES)
+    parser.add_argument("--json", help="guardar también las mediciones en este archivo")
+    args = parser.parse_args()
+
+    version = args.version or ultima_version()
+    if version is None:
+        parser.error(f"no hay ninguna captura en {CARPETA_CORPUS}; ver corpus.py capturar")
+
+    tiendas = obtener_tiendas()
+    mediciones = [
+        medir(tiendas[nombre], CapturaTienda(os.path.join(carpeta_version(version), nombre)), args.repeticiones)
+        for nombre in sorted(os.listdir(carpeta_version(version)))
+    ]
+    print(f"Corpus {version}")
+    print(texto(mediciones))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([dict(vars(m), paginas_por_segundo=m.paginas_por_segundo,
+                            productos_por_segundo=m.productos_por_segundo) for m in mediciones], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+"""Caché en disco de páginas renderizadas y respuestas de la API.
+
+Repetir una corrida a los pocos minutos vuelve a abrir el navegador y a
+descargar cada categoría aunque nada haya cambiado. Con la caché, lo que se
+descargó hace menos de `max_edad` segundos se reutiliza:
+
+    python coto_scraper.py --max-age 600
+
+Las respuestas de la API que ya vencieron se revalidan con ETag y
+Last-Modified (si el servidor contesta 304, se reutilizan sin volver a
+descargarlas). Las páginas renderizadas solo vencen por edad: sus productos
+llegan por JavaScript, así que los encabezados del documento no dicen si
+cambiaron. Las que no terminaron de cargar a tiempo no se guardan.
+
+El contenido se guarda por su hash (una página repetida ocupa lugar una sola
+vez) y, si la caché supera `tamano_maximo`, se borran las entradas usadas
+hace más tiempo.
+"""
+import atexit
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter, OrderedDict
+
+import recorrido
+from recorrido import clave_pedido
+from utils import escribir_json_atomico
+from vtex import obtener_sesion
+
+CARPETA_CACHE = os.getenv("SCRAPER_CACHE", ".cache_paginas")
+
+# Tamaño máximo de la caché en disco
+TAMANO_MAXIMO = int(os.getenv("SCRAPER_CACHE_MB", "500")) * 2**20
+
+
+class Cache:
+    """Contenidos guardados por clave, con la fecha en que se descargaron. Se puede usar desde varios hilos."""
+
+    def __init__(self, carpeta=CARPETA_CACHE, tamano_maximo=TAMANO_MAXIMO, reloj=time.time):
+        self.carpeta = carpeta
+        self.tamano_maximo = tamano_maximo
+        self.reloj = reloj
+        self._lock = threading.Lock()
+        self._ruta_indice = os.path.join(carpeta, "indice.json")
+        # {clave: {"objeto", "tamano", "guardado", "usado", "etag", "modificado"}}, de la usada hace
+        # más tiempo a la más reciente
+        try:
+            with open(self._ruta_indice, "r", encoding="utf-8") as f:
+                entradas = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            entradas = {}
+        self._entradas = OrderedDict(sorted(entradas.items(), key=lambda item: item[1]["usado"]))
+        # Cuántas entradas apuntan a cada contenido, y cuánto ocupan los contenidos (cada uno una vez)
+        self._referencias = Counter()
+        self._total = 0
+        for entrada in self._entradas.values():
+            self._referenciar(entrada)
+        self._sin_guardar = False
+
+    def _ruta_objeto(self, objeto):
+        return os.path.join(self.carpeta, "objetos", objeto[:2], objeto)
+
+    def obtener(self, clave):
+        """Copia de la entrada de `clave`, o None si no está."""
+        with self._lock:
+            entrada = self._entradas.get(clave)
+            if entrada is None or not os.path.exists(self._ruta_objeto(entrada["objeto"])):
+                return None
+            entrada["usado"] = self.reloj()
+            self._entradas.move_to_end(clave)
+            self._sin_guardar = True
+            return dict(entrada)
+
+    def fresca(self, entrada, max_edad):
+        return self.reloj() - entrada["guardado"] <= max_edad
+
+    def leer(self, entrada):
+        with open(self._ruta_objeto(entrada["objeto"]), "rb") as f:
+            return f.read()
+
+    def guardar(self, clave, contenido, etag=None, modificado=None):
+        """Guarda `contenido` (bytes) como la versión actual de `clave`."""
+        objeto = hashlib.sha256(contenido).hexdigest()
+        ruta = self._ruta_objeto(objeto)
+        if not os.path.exists(ruta):
+            os.makedirs(os.path.dirname(ruta), exist_ok=True)
+            fd, temporal = tempfile.mkstemp(dir=os.path.dirname(ruta), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(contenido)
+            os.replace(temporal, ruta)
+
+        with self._lock:
+            ahora = self.reloj()
+            entrada = {
+                "objeto": objeto, "tamano": len(contenido), "guardado": ahora, "usado": ahora,
+                "etag": etag, "modificado": modificado,
+            }
+            # Primero la referencia nueva: si la versión anterior tenía el mismo contenido, no se borra
+            self._referenciar(entrada)
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = entrada
+            self._desalojar()
+            self._guardar()
+
+    def revalidada(self, clave):
+        """El servidor confirmó que la entrada no cambió: vuelve a contar como recién descargada."""
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas[clave]["guardado"] = self.reloj()
+                self._guardar()
+
+    def tamano(self):
+        """Bytes que ocupan los contenidos guardados (cada contenido repetido, una sola vez)."""
+        with self._lock:
+            return self._total
+
+    def _referenciar(self, entrada):
+        if not self._referencias[entrada["objeto"]]:
+            self._total += entrada["tamano"]
+        self._referencias[entrada["objeto"]] += 1
+
+    def _quitar(self, clave):
+        """Saca la entrada del índice y, si era la última que lo usaba, borra su contenido."""
+        entrada = self._entradas.pop(clave)
+        objeto = entrada["objeto"]
+        self._referencias[objeto] -= 1
+        if self._referencias[objeto]:
+            return
+        del self._referencias[objeto]
+        self._total -= entrada["tamano"]
+        try:
+            os.remove(self._ruta_objeto(objeto))
+        except FileNotFoundError:
+            pass
+
+    def _desalojar(self):
+        # Las entradas usadas hace más tiempo están al principio y se borran primero
+        while self._total > self.tamano_maximo and self._entradas:
+            self._quitar(next(iter(self._entradas)))
+
+    def _guardar(self):
+        os.makedirs(self.carpeta, exist_ok=True)
+        escribir_json_atomico(self._ruta_indice, self._entradas)
+        self._sin_guardar = False
+
+    def cerrar(self):
+        """Guarda cuándo se usó cada entrada (las lecturas no escriben el índice)."""
+        with self._lock:
+            if self._sin_guardar:
+                self._guardar()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def obtener_cache():
+    """Caché compartida por todo el proceso; el índice se guarda al salir."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = Cache()
+            atexit.register(_cache.cerrar)
+        return _cache
+
+
+def cargar_con_cache(max_edad, cargar=None, cache=None):
+    """Envuelve `cargar(url, tienda, selector_listo, desplazar)` para reutilizar páginas recientes."""
+    def cargar_cacheada(url, tienda, selector_listo, desplazar):
+        almacen = cache or obtener_cache()
+        clave = f"{tienda} {url}"
+        entrada = almacen.obtener(clave)
+        if entrada and almacen.fresca(entrada, max_edad):
+            return almacen.leer(entrada).decode("utf-8")
+        html = (cargar or recorrido.cargar_pagina)(url, tienda, selector_listo, desplazar)
+        # Una página que no terminó de cargar a tiempo se usa, pero no se guarda
+        if getattr(html, "lista", True):
+            almacen.guardar(clave, html.encode("utf-8"))
+        return html
+    return cargar_cacheada
+
+
+class RespuestaCacheada:
+    """Respuesta HTTP servida desde la caché."""
+
+    status_code = 200
+
+    def __init__(self, contenido):
+        self.content = contenido
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class SesionConCache:
+    """Sesión HTTP que reutiliza respuestas recientes y revalida las vencidas."""
+
+    def __init__(self, sesion, max_edad, cache=None):
+        self.sesion = sesion
+        self.max_edad = max_edad
+        self.cache = cache or obtener_cache()
+
+    def get(self, url, params=None, headers=None, **opciones):
+        clave = clave_pedido(url, params)
+        entrada = self.cache.obtener(clave)
+        if entrada and self.cache.fresca(entrada, self.max_edad):
+            return RespuestaCacheada(self.cache.leer(entrada))
+
+        headers = dict(headers or {})
+        if entrada and entrada["etag"]:
+            headers["If-None-Match"] = entrada["etag"]
+        if entrada and entrada["modificado"]:
+            headers["If-Modified-Since"] = entrada["modificado"]
+        respuesta = self.sesion.get(url, params=params, headers=headers, **opciones)
+
+        if entrada and respuesta.status_code == 304:
+            self.cache.revalidada(clave)
+            return RespuestaCacheada(self.cache.leer(entrada))
+        if respuesta.status_code == 200:
+            self.cache.guardar(clave, respuesta.content, respuesta.headers.get("ETag"),
+                               respuesta.headers.get("Last-Modified"))
+        return respuesta
+
+
+def fuentes_con_cache(max_edad, cache=None):
+    """Opciones `cargar` y `sesion` para el motor que usan la caché, o {} si `max_edad` es None."""
+    if max_edad is None:
+        return {}
+    return {
+        "cargar": cargar_con_cache(max_edad, cache=cache),
+        "sesion": SesionConCache(obtener_sesion(), max_edad, cache),
+    }
@@ -0,0 +1,198 @@
+"""Comparación de precios entre tiendas: encuentra el mismo producto en cada cadena.
+
+Uso:
+    python comparacion.py productos_carrefour.csv productos_coto.csv productos_dia.csv
+                          [--salida comparacion.csv] [--umbral 0.6]
+
+Los nombres se normalizan (minúsculas, sin acentos ni palabras vacías, con
+el contenido neto "x 500 g" llevado a gramos o mililitros) y se arma un
+índice invertido palabra -> productos. Solo se comparan productos de
+tiendas distintas que comparten alguna palabra poco frecuente y tienen el
+mismo contenido, así el costo crece casi linealmente con el catálogo en
+lugar de comparar todos contra todos. La similitud es la de Jaccard entre
+las palabras de los nombres.
+
+La salida tiene una fila por producto encontrado en al menos dos tiendas,
+con el precio en cada una y la más barata.
+"""
+import argparse
+import os
+import re
+import unicodedata
+from collections import defaultdict
+
+from precios import RE_CONTENIDO, a_centavos, contenido_neto
+from salida import abrir_salida, leer_salida
+
+# Similitud mínima para considerar que dos nombres son el mismo producto
+UMBRAL = 0.6
+
+# Una palabra que aparece en más productos que esto no sirve para elegir candidatos
+MAX_POR_PALABRA = 200
+
+# Diferencia relativa de contenido que se tolera ("1 kg" y "1000 g" son lo mismo; "1 kg" y "900 g" no)
+TOLERANCIA_CONTENIDO = 0.02
+
+PALABRAS_VACIAS = {
+    "de", "del", "la", "el", "los", "las", "con", "sin", "en", "y", "x", "a", "al", "para", "por",
+    "un", "una", "pack", "paquete", "botella", "lata", "caja", "bolsa", "sachet", "doypack",
+}
+
+_RE_PALABRA = re.compile(r"[a-z0-9]+")
+
+
+def sin_acentos(texto):
+    return "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+
+
+def palabras(nombre):
+    """Palabras significativas del nombre, sin el contenido neto."""
+    texto = RE_CONTENIDO.sub(" ", sin_acentos(nombre or "").lower())
+    return frozenset(
+        palabra for palabra in _RE_PALABRA.findall(texto)
+        if palabra not in PALABRAS_VACIAS and not palabra.isdigit()
+    )
+
+
+class Producto:
+    """Un producto de una tienda, con el nombre ya normalizado."""
+
+    __slots__ = ("tienda", "nombre", "precio", "enlace", "palabras", "contenido", "unidad")
+
+    def __init__(self, tienda, nombre, precio, enlace):
+        self.tienda = tienda
+        self.nombre = nombre
+        self.precio = precio
+        self.enlace = enlace
+        self.palabras = palabras(nombre)
+        self.contenido, self.unidad = contenido_neto(nombre)
+
+
+def _precio(valor):
+    # Los registros traen centavos (como texto si vienen de un CSV); los CSV viejos, el texto de la tienda
+    if valor is None or isinstance(valor, int):
+        return valor
+    return int(valor) if str(valor).isdigit() else a_centavos(valor)
+
+
+def leer_productos(ruta):
+    """Productos de un archivo de salida. La tienda sale de cada registro o del nombre del archivo."""
+    tienda_archivo = os.path.splitext(os.path.basename(ruta))[0].replace("productos_", "")
+    return [
+        Producto(p.get("tienda") or tienda_archivo, p.get("nombre") or "", _precio(p.get("precio")), p.get("enlace"))
+        for p in leer_salida(ruta)
+    ]
+
+
+def similitud(a, b):
+    """Jaccard entre las palabras de los dos nombres."""
+    if not a.palabras or not b.palabras:
+        return 0.0
+    return len(a.palabras & b.palabras) / len(a.palabras | b.palabras)
+
+
+def mismo_contenido(a, b):
+    if a.contenido is None or b.contenido is None:
+        return a.contenido is None and b.contenido is None
+    return a.unidad == b.unidad and abs(a.contenido - b.contenido) <= TOLERANCIA_CONTENIDO * max(a.contenido, b.contenido)
+
+
+def indice_invertido(productos):
+    """{palabra: [posición del producto]}"""
+    indice = defaultdict(list)
+    for i, producto in enumerate(productos):
+        for palabra in producto.palabras:
+            indice[palabra].append(i)
+    return indice
+
+
+def candidatos(productos, max_por_palabra=MAX_POR_PALABRA):
+    """Pares (i, j) de productos de tiendas distintas que comparten alguna palabra poco frecuente."""
+    pares = set()
+    for posiciones in indice_invertido(productos).values():
+        if len(posiciones) > max_por_palabra:
+            continue
+        for n, i in enumerate(posiciones):
+            for j in posiciones[n + 1:]:
+                if productos[i].tienda != productos[j].tienda:
+                    pares.add((i, j))
+    return pares
+
+
+def emparejar(productos, umbral=UMBRAL, max_por_palabra=MAX_POR_PALABRA):
+    """Agrupa el mismo producto de distintas tiendas. Devuelve listas de Producto (una por tienda como máximo).
+
+    Los pares más parecidos se unen primero; dos grupos no se unen si
+    quedarían con dos productos de la misma tienda.
+    """
+    pares = []
+    for i, j in candidatos(productos, max_por_palabra):
+        a, b = productos[i], productos[j]
+        if mismo_contenido(a, b):
+            puntaje = similitud(a, b)
+            if puntaje >= umbral:
+                pares.append((puntaje, i, j))
+    pares.sort(reverse=True)
+
+    grupo = list(range(len(productos))) # Representante de cada producto
+    tiendas = [{p.tienda} for p in productos] # Tiendas de cada grupo, en su representante
+
+    def raiz(i):
+        while grupo[i] != i:
+            grupo[i] = grupo[grupo[i]]
+            i = grupo[i]
+        return i
+
+    for _, i, j in pares:
+        ri, rj = raiz(i), raiz(j)
+        if ri != rj and not tiendas[ri] & tiendas[rj]:
+            grupo[rj] = ri
+            tiendas[ri] |= tiendas[rj]
+
+    grupos = defaultdict(list)
+    for i, producto in enumerate(productos):
+        grupos[raiz(i)].append(producto)
+    return [miembros for miembros in grupos.values() if len(miembros) > 1]
+
+
+def tabla_comparativa(grupos, tiendas):
+    """Filas {"producto", "contenido", "unidad", "precio_<tienda>"..., "tienda_mas_barata", "precio_minimo"}."""
+    filas = []
+    for miembros in grupos:
+        con_precio = [p for p in miembros if p.precio is not None]
+        mas_barato = min(con_precio, key=lambda p: p.precio) if con_precio else None
+        fila = {
+            "producto": min(miembros, key=lambda p: len(p.nombre)).nombre,
+            "contenido": miembros[0].contenido,
+            "unidad": miembros[0].unidad,
+        }
+        for tienda in tiendas:
+            fila[f"precio_{tienda}"] = next((p.precio for p in miembros if p.tienda == tienda), None)
+        fila["tienda_mas_barata"] = mas_barato.tienda if mas_barato else None
+        fila["precio_minimo"] = mas_barato.precio if mas_barato else None
+        filas.append(fila)
+    return sorted(filas, key=lambda f: f["producto"].lower())
+
+
+def comparar_archivos(rutas, umbral=UMBRAL):
+    productos = [producto for ruta in rutas for producto in leer_productos(ruta)]
+    tiendas = sorted({p.tienda for p in productos})
+    return tabla_comparativa(emparejar(productos, umbral), tiendas), tiendas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara precios del mismo producto entre tiendas")
+    parser.add_argument("archivos", nargs="+", help="salidas de los scrapers (.csv, .jsonl o .parquet)")
+    parser.add_argument("--salida", default="comparacion.csv")
+    parser.add_argument("--umbral", type=float, default=UMBRAL, help="similitud mínima entre nombres (0 a 1)")
+    args = parser.parse_args()
+
+    filas, tiendas = comparar_archivos(args.archivos, args.umbral)
+    campos = ["producto", "contenido", "unidad", *(f"precio_{t}" for t in tiendas), "tienda_mas_barata", "precio_minimo"]
+    with abrir_salida(args.salida, campos=campos) as salida:
+        salida.escribir(filas)
+    print(f"✅ {len(filas)} productos en más de una tienda, en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
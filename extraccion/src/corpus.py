@@ -0,0 +1,248 @@
+"""Corpus de páginas capturadas para probar y medir los scrapers sin conexión.
+
+Uso:
+    python corpus.py capturar [--config categorias.json] [--version 2026-10-18] [--max-paginas 3]
+    python corpus.py verificar [--version 2026-10-18]
+
+`capturar` scrapea las categorías de cada tienda en vivo y guarda todo lo
+que se descargó: el HTML renderizado de cada página y las respuestas JSON de
+la API VTEX, junto con los productos que se extrajeron. Después, el motor
+puede correr sobre el corpus igual que en vivo pero sin navegador ni red
+(ver `reproducir_tienda`), y `verificar` compara lo que extrae hoy con lo
+que se extrajo al capturar. Cada captura queda en su versión:
+
+    corpus/<version>/<tienda>/indice.json      {"paginas", "api"}: clave -> archivo, y "max_paginas"
+    corpus/<version>/<tienda>/esperados.json   {url_categoria: productos}
+    corpus/<version>/<tienda>/paginas/<hash>.html
+    corpus/<version>/<tienda>/api/<hash>.json
+"""
+import argparse
+import hashlib
+import json
+import os
+from datetime import date
+
+import requests
+
+from motor import obtener_productos, obtener_tiendas, paginas_de_productos
+from orquestador import cargar_config
+from recorrido import MAX_PAGINAS, cargar_pagina, clave_pedido
+from utils import escribir_json_atomico
+from vtex import USAR_API, obtener_sesion
+
+CARPETA_CORPUS = os.getenv(
+    "SCRAPER_CORPUS", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "corpus")
+)
+
+
+class PaginaNoCapturada(KeyError):
+    """Se pidió una página que no está en el corpus (el recorrido cambió desde la captura)."""
+
+
+def _nombre_archivo(clave, extension):
+    return hashlib.sha1(clave.encode("utf-8")).hexdigest()[:16] + extension
+
+
+class CapturaTienda:
+    """Páginas y respuestas capturadas de una tienda, en una carpeta del corpus."""
+
+    def __init__(self, carpeta):
+        self.carpeta = carpeta
+        try:
+            with open(os.path.join(carpeta, "indice.json"), "r", encoding="utf-8") as f:
+                self.indice = json.load(f)
+        except FileNotFoundError:
+            self.indice = {"paginas": {}, "api": {}}
+
+    def _ruta(self, tipo, archivo):
+        return os.path.join(self.carpeta, tipo, archivo)
+
+    def _guardar(self, tipo, clave, archivo, contenido):
+        os.makedirs(os.path.join(self.carpeta, tipo), exist_ok=True)
+        with open(self._ruta(tipo, archivo), "w", encoding="utf-8") as f:
+            f.write(contenido)
+        self.indice[tipo][clave] = archivo
+
+    def guardar_pagina(self, url, html):
+        self._guardar("paginas", url, _nombre_archivo(url, ".html"), html)
+
+    def guardar_respuesta(self, clave, datos):
+        self._guardar("api", clave, _nombre_archivo(clave, ".json"), json.dumps(datos, ensure_ascii=False))
+
+    def pagina(self, url):
+        """HTML capturado de una página. Lanza PaginaNoCapturada si no está."""
+        if url not in self.indice["paginas"]:
+            raise PaginaNoCapturada(url)
+        with open(self._ruta("paginas", self.indice["paginas"][url]), "r", encoding="utf-8") as f:
+            return f.read()
+
+    def respuesta(self, clave):
+        """JSON capturado de un pedido a la API, o None si no está."""
+        if clave not in self.indice["api"]:
+            return None
+        with open(self._ruta("api", self.indice["api"][clave]), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def esperados(self):
+        """{url_categoria: productos} extraídos al capturar."""
+        try:
+            with open(os.path.join(self.carpeta, "esperados.json"), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def guardar(self, esperados):
+        os.makedirs(self.carpeta, exist_ok=True)
+        escribir_json_atomico(os.path.join(self.carpeta, "indice.json"), self.indice)
+        escribir_json_atomico(os.path.join(self.carpeta, "esperados.json"), esperados)
+
+    # --- Fuentes para el motor ---
+
+    def capturando(self, cargar):
+        """Envuelve `cargar` para que guarde cada página que carga."""
+        def cargar_y_guardar(url, tienda, selector_listo, desplazar):
+            html = cargar(url, tienda, selector_listo, desplazar)
+            self.guardar_pagina(url, html)
+            return html
+        return cargar_y_guardar
+
+    def cargar(self, url, tienda, selector_listo, desplazar):
+        """Reemplazo de recorrido.cargar_pagina que lee del corpus."""
+        return self.pagina(url)
+
+
+class SesionCapturando:
+    """Sesión HTTP que guarda en la captura cada respuesta JSON exitosa."""
+
+    def __init__(self, sesion, captura):
+        self.sesion = sesion
+        self.captura = captura
+
+    def get(self, url, params=None, **opciones):
+        respuesta = self.sesion.get(url, params=params, **opciones)
+        if respuesta.status_code < 400:
+            self.captura.guardar_respuesta(clave_pedido(url, params), respuesta.json())
+        return respuesta
+
+
+class RespuestaGrabada:
+    def __init__(self, datos):
+        self._datos = datos
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._datos
+
+
+class SesionGrabada:
+    """Sesión que responde desde la captura.
+
+    Un pedido que no se capturó falla como un error de conexión, igual que
+    cuando la API falló durante la captura y se usó el navegador.
+    """
+
+    def __init__(self, captura):
+        self.captura = captura
+
+    def get(self, url, params=None, **opciones):
+        datos = self.captura.respuesta(clave_pedido(url, params))
+        if datos is None:
+            raise requests.ConnectionError(f"{clave_pedido(url, params)} no está en el corpus")
+        return RespuestaGrabada(datos)
+
+
+def carpeta_version(version, carpeta=CARPETA_CORPUS):
+    return os.path.join(carpeta, version)
+
+
+def ultima_version(carpeta=CARPETA_CORPUS):
+    """La versión más reciente del corpus (las versiones son fechas ISO), o None."""
+    versiones = sorted(os.listdir(carpeta)) if os.path.isdir(carpeta) else []
+    return versiones[-1] if versiones else None
+
+
+def capturar_tienda(tienda, urls, carpeta, max_paginas=MAX_PAGINAS, usar_api=USAR_API,
+                    cargar=cargar_pagina, sesion=None):
+    """Scrapea las categorías `urls` de una tienda guardando todo lo descargado en `carpeta`.
+
+    Devuelve la CapturaTienda. El límite de páginas queda en el índice para
+    reproducir el mismo recorrido.
+    """
+    captura = CapturaTienda(carpeta)
+    captura.indice["max_paginas"] = max_paginas
+    cargar = captura.capturando(cargar)
+    sesion = SesionCapturando(sesion or obtener_sesion(), captura)
+    esperados = {
+        url: obtener_productos(tienda, url, max_paginas, usar_api, cargar=cargar, sesion=sesion)
+        for url in urls
+    }
+    captura.guardar(esperados)
+    return captura
+
+
+def reproducir_paginas(tienda, captura, url, en_procesos=True):
+    """Como motor.paginas_de_productos, pero leyendo las páginas de la captura (con su mismo límite de páginas)."""
+    max_paginas = captura.indice.get("max_paginas") or float("inf")
+    return paginas_de_productos(tienda, url, max_paginas=max_paginas, usar_api=True,
+                                cargar=captura.cargar, sesion=SesionGrabada(captura), en_procesos=en_procesos)
+
+
+def reproducir_tienda(tienda, captura, en_procesos=True):
+    """{url_categoria: productos} extraídos de la captura, sin navegador ni red."""
+    return {
+        url: [producto for _, pagina in reproducir_paginas(tienda, captura, url, en_procesos)
+              for producto in pagina]
+        for url in captura.esperados()
+    }
+
+
+def diferencias(tienda, captura):
+    """Categorías en las que lo que se extrae hoy no coincide con lo esperado: {url: (esperados, obtenidos)}."""
+    esperados = captura.esperados()
+    obtenidos = reproducir_tienda(tienda, captura)
+    return {
+        url: (esperados[url], obtenidos[url])
+        for url in esperados
+        if esperados[url] != obtenidos[url]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Captura y verifica el corpus de páginas de las tiendas")
+    subcomandos = parser.add_subparsers(dest="comando", required=True)
+    capturar = subcomandos.add_parser("capturar", help="scrapear en vivo y guardar las páginas")
+    capturar.add_argument("--config", help="archivo JSON con las tiendas y categorías (como el del orquestador)")
+    capturar.add_argument("--version", default=date.today().isoformat())
+    capturar.add_argument("--max-paginas", type=int, default=MAX_PAGINAS)
+    verificar = subcomandos.add_parser("verificar", help="comparar la extracción con la captura")
+    verificar.add_argument("--version", help="versión del corpus (por defecto, la última)")
+    args = parser.parse_args()
+
+    tiendas = obtener_tiendas()
+    if args.comando == "capturar":
+        for nombre, datos in cargar_config(args.config).items():
+            carpeta = os.path.join(carpeta_version(args.version), nombre)
+            captura = capturar_tienda(tiendas[nombre], datos["categorias"], carpeta, args.max_paginas)
+            print(f"📦 {nombre}: {len(captura.indice['paginas'])} páginas y "
+                  f"{len(captura.indice['api'])} respuestas de la API en {carpeta}")
+        return
+
+    version = args.version or ultima_version()
+    if version is None:
+        parser.error(f"no hay ninguna captura en {CARPETA_CORPUS}")
+    fallas = 0
+    for nombre in sorted(os.listdir(carpeta_version(version))):
+        cambios = diferencias(tiendas[nombre], CapturaTienda(os.path.join(carpeta_version(version), nombre)))
+        for url, (esperados, obtenidos) in cambios.items():
+            print(f"❌ {nombre}: {url} esperaba {len(esperados)} productos, se extrajeron {len(obtenidos)}")
+        fallas += len(cambios)
+        if not cambios:
+            print(f"✅ {nombre}: la extracción coincide con la captura {version}")
+    raise SystemExit(1 if fallas else 0)
+
+
+if __name__ == "__main__":
+    main()
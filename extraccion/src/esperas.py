@@ -0,0 +1,173 @@
+import atexit
+import json
+import os
+import threading
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+from utils import escribir_json_atomico
+
+# Archivo donde se guardan los tiempos de carga de corridas anteriores
+ARCHIVO_TIEMPOS = os.getenv("SCRAPER_ARCHIVO_TIEMPOS", ".tiempos_carga.json")
+
+# Límites del timeout adaptativo (segundos)
+TIMEOUT_INICIAL = 15.0
+TIMEOUT_MINIMO = 3.0
+TIMEOUT_MAXIMO = 30.0
+
+# Margen sobre la carga más lenta reciente, y cuántas cargas se recuerdan por tienda
+MARGEN_TIMEOUT = 2.0
+MUESTRAS_POR_TIENDA = 20
+
+# Cargas nuevas que se acumulan antes de reescribir el archivo de tiempos (el resto se guarda al salir)
+GUARDAR_CADA = 25
+
+# La red se considera inactiva si no empieza ninguna descarga durante este tiempo
+SEGUNDOS_RED_QUIETA = 0.5
+
+# Cantidad de recursos descargados por la página y si terminó de cargar el documento
+_JS_ESTADO_RED = (
+    "return [performance.getEntriesByType('resource').length, document.readyState];"
+)
+
+
+class TiemposCarga:
+    """Tiempos de carga recientes por tienda, para ajustar el timeout de espera.
+
+    El timeout es la carga más lenta de las últimas MUESTRAS_POR_TIENDA
+    multiplicada por MARGEN_TIMEOUT, dentro de [TIMEOUT_MINIMO, TIMEOUT_MAXIMO].
+    Los tiempos se guardan cada `guardar_cada` cargas y al cerrar.
+    """
+
+    def __init__(self, ruta=ARCHIVO_TIEMPOS, guardar_cada=GUARDAR_CADA):
+        self.ruta = ruta
+        self.guardar_cada = guardar_cada
+        self._lock = threading.Lock()
+        self._muestras = {} # {tienda: [segundos, ...]}
+        self._sin_guardar = 0
+        self.cargar()
+
+    def cargar(self):
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                self._muestras = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._muestras = {}
+
+    def timeout(self, tienda):
+        with self._lock:
+            muestras = self._muestras.get(tienda)
+        if not muestras:
+            return TIMEOUT_INICIAL
+        return min(TIMEOUT_MAXIMO, max(TIMEOUT_MINIMO, max(muestras) * MARGEN_TIMEOUT))
+
+    def registrar(self, tienda, segundos):
+        with self._lock:
+            muestras = self._muestras.setdefault(tienda, [])
+            muestras.append(round(segundos, 3))
+            del muestras[:-MUESTRAS_POR_TIENDA]
+            self._sin_guardar += 1
+            if self._sin_guardar < self.guardar_cada:
+                return
+        self.cerrar()
+
+    def cerrar(self):
+        """Guarda los tiempos registrados desde la última vez que se guardaron."""
+        with self._lock:
+            if not self._sin_guardar:
+                return
+            datos = {tienda: list(valores) for tienda, valores in self._muestras.items()}
+            self._sin_guardar = 0
+        try:
+            escribir_json_atomico(self.ruta, datos)
+        except OSError as e:
+            print(f"⚠️ No se pudieron guardar los tiempos de carga: {e}")
+
+
+_tiempos = None
+_tiempos_lock = threading.Lock()
+
+
+def obtener_tiempos():
+    """Tiempos de carga compartidos por todo el proceso; los pendientes se guardan al salir."""
+    global _tiempos
+    with _tiempos_lock:
+        if _tiempos is None:
+            _tiempos = TiemposCarga()
+            atexit.register(_tiempos.cerrar)
+        return _tiempos
+
+
+def esperar_red_inactiva(driver, timeout, quieto=SEGUNDOS_RED_QUIETA, intervalo=0.1):
+    """Espera a que el documento esté cargado y no empiecen descargas nuevas.
+
+    Devuelve True si la red quedó inactiva antes del timeout.
+    """
+    limite = time.monotonic() + timeout
+    recursos_anteriores = None
+    quieta_desde = None
+    while time.monotonic() < limite:
+        recursos, estado = driver.execute_script(_JS_ESTADO_RED)
+        ahora = time.monotonic()
+        if estado != "complete" or recursos != recursos_anteriores:
+            recursos_anteriores = recursos
+            quieta_desde = ahora
+        elif ahora - quieta_desde >= quieto:
+            return True
+        time.sleep(intervalo)
+    return False
+
+
+def esperar_selector(driver, selector, timeout):
+    """Espera a que aparezca un elemento. Devuelve True si apareció antes del timeout."""
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, selector))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def contar_elementos(driver, selector):
+    return len(driver.find_elements(By.CSS_SELECTOR, selector))
+
+
+def esperar_mas_elementos(driver, selector, cantidad_anterior, timeout):
+    """Espera a que haya más elementos que `cantidad_anterior` (por ejemplo, tras un scroll).
+
+    Devuelve la cantidad de elementos encontrada.
+    """
+    try:
+        WebDriverWait(driver, timeout).until(
+            lambda d: contar_elementos(d, selector) > cantidad_anterior
+        )
+    except TimeoutException:
+        pass
+    return contar_elementos(driver, selector)
+
+
+def esperar_pagina(driver, tienda, selector_listo, tiempos=None):
+    """Espera a que la página de una tienda muestre sus productos (`selector_listo`) y la red se calme.
+
+    El timeout se ajusta con los tiempos de carga de corridas anteriores. Si se
+    vence, se sigue con lo que haya cargado. Devuelve True si la página quedó lista.
+    """
+    tiempos = tiempos or obtener_tiempos()
+    timeout = tiempos.timeout(tienda)
+    inicio = time.monotonic()
+
+    lista = esperar_selector(driver, selector_listo, timeout)
+    if lista:
+        restante = max(0.0, timeout - (time.monotonic() - inicio))
+        esperar_red_inactiva(driver, restante)
+        tiempos.registrar(tienda, time.monotonic() - inicio)
+    else:
+        # Registrar el timeout para que la próxima corrida espere más
+        tiempos.registrar(tienda, timeout)
+        print(f"⚠️ {tienda}: la página no terminó de cargar en {timeout:.1f}s")
+    return lista
@@ -0,0 +1,133 @@
+"""Cambios de precio entre corridas.
+
+Cada salida publicada se compara con la foto de la corrida anterior de ese
+mismo archivo (`<salida>.foto.json`, {enlace normalizado: [huella, precio,
+nombre]}). Las huellas son un hash de nombre y precio, así que solo se mira
+en detalle lo que cambió. Los cambios se agregan, una línea JSON por
+producto, al historial de precios (`historial_precios.jsonl` junto a la
+salida), que nunca se reescribe:
+
+    {"fecha": "...", "tienda": "coto", "tipo": "subio", "enlace": "...",
+     "nombre": "...", "precio_anterior": 120000, "precio": 135000}
+
+Los tipos son "nuevo", "eliminado", "subio" y "bajo" (precios en centavos).
+La primera corrida registra todos los productos como nuevos.
+"""
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from urllib.parse import urlsplit, urlunsplit
+
+from salida import leer_salida
+from utils import escribir_json_atomico
+
+SUFIJO_FOTO = ".foto.json"
+
+# Por defecto, el historial queda en la carpeta de cada salida
+ARCHIVO_HISTORIAL = os.getenv("SCRAPER_HISTORIAL")
+
+NOMBRE_HISTORIAL = "historial_precios.jsonl"
+
+
+def normalizar_enlace(enlace):
+    """Identificador estable de un producto: su URL sin query, fragmento ni "/" final."""
+    partes = urlsplit((enlace or "").strip())
+    ruta = partes.path.rstrip("/") or "/"
+    return urlunsplit((partes.scheme.lower(), partes.netloc.lower(), ruta, "", ""))
+
+
+def _centavos(valor):
+    # Del CSV los números vuelven como texto
+    return int(valor) if valor not in (None, "") else None
+
+
+def huella(nombre, precio):
+    return hashlib.blake2b(f"{nombre}\t{precio}".encode("utf-8"), digest_size=8).hexdigest()
+
+
+def foto(productos):
+    """{enlace normalizado: [huella, precio, nombre]} de los registros de una corrida.
+
+    Los productos sin enlace no se pueden seguir entre corridas y quedan afuera.
+    """
+    resultado = {}
+    for producto in productos:
+        if not producto.get("enlace"):
+            continue
+        precio = _centavos(producto.get("precio"))
+        nombre = producto.get("nombre")
+        resultado[normalizar_enlace(producto["enlace"])] = [huella(nombre, precio), precio, nombre]
+    return resultado
+
+
+def comparar(anterior, actual):
+    """Cambios entre dos fotos: lista de {"tipo", "enlace", "nombre", "precio_anterior", "precio"}.
+
+    Un producto que solo cambió de nombre no es un cambio de precio y no se informa.
+    """
+    cambios = []
+    for enlace, (huella_actual, precio, nombre) in actual.items():
+        previo = anterior.get(enlace)
+        if previo is None:
+            cambios.append({"tipo": "nuevo", "enlace": enlace, "nombre": nombre,
+                            "precio_anterior": None, "precio": precio})
+            continue
+        huella_previa, precio_previo, _ = previo
+        if huella_previa == huella_actual or precio_previo == precio or None in (precio_previo, precio):
+            continue
+        cambios.append({"tipo": "subio" if precio > precio_previo else "bajo", "enlace": enlace,
+                        "nombre": nombre, "precio_anterior": precio_previo, "precio": precio})
+
+    for enlace, (_, precio_previo, nombre) in anterior.items():
+        if enlace not in actual:
+            cambios.append({"tipo": "eliminado", "enlace": enlace, "nombre": nombre,
+                            "precio_anterior": precio_previo, "precio": None})
+    return cambios
+
+
+def cargar_foto(ruta):
+    try:
+        with open(ruta, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def ruta_historial(ruta_salida):
+    return ARCHIVO_HISTORIAL or os.path.join(os.path.dirname(os.path.abspath(ruta_salida)), NOMBRE_HISTORIAL)
+
+
+def agregar_al_historial(ruta, tienda, cambios, fecha=None):
+    """Agrega los cambios al final del historial (nunca se reescribe lo anterior)."""
+    fecha = (fecha or datetime.now(timezone.utc)).isoformat()
+    with open(ruta, "a", encoding="utf-8") as f:
+        f.writelines(
+            json.dumps({"fecha": fecha, "tienda": tienda, **cambio}, ensure_ascii=False) + "\n"
+            for cambio in cambios
+        )
+
+
+def registrar_cambios(ruta_salida, fecha=None):
+    """Compara la salida recién publicada con la corrida anterior y agrega los cambios al historial.
+
+    Devuelve los cambios.
+    """
+    productos = leer_salida(ruta_salida)
+    if not productos:
+        return []
+    tienda = productos[0].get("tienda")
+    ruta_foto = ruta_salida + SUFIJO_FOTO
+    actual = foto(productos)
+    cambios = comparar(cargar_foto(ruta_foto), actual)
+
+    # Primero el historial: si se corta antes de guardar la foto, la próxima corrida repite los cambios
+    # en lugar de perderlos
+    if cambios:
+        agregar_al_historial(ruta_historial(ruta_salida), tienda, cambios, fecha)
+    escribir_json_atomico(ruta_foto, actual)
+
+    cantidades = {tipo: sum(c["tipo"] == tipo for c in cambios) for tipo in ("nuevo", "eliminado", "subio", "bajo")}
+    print(f"📈 {tienda}: {cantidades['nuevo']} nuevos, {cantidades['eliminado']} eliminados, "
+          f"{cantidades['subio']} subieron, {cantidades['bajo']} bajaron")
+    return cambios
@@ -0,0 +1,238 @@
+"""Motor de extracción genérico: scrapea cualquier tienda descripta en tiendas.json.
+
+Cada tienda define:
+    url_categoria   categoría que se scrapea por defecto
+    archivo_csv     archivo donde se guardan sus productos
+    vtex            dominio de la API de catálogo VTEX, o null si no es VTEX
+    max_concurrentes  categorías que se scrapean a la vez en el orquestador
+    listo           selector CSS que indica que la página ya mostró los productos
+    colador         {"etiqueta", "clase" (regex, opcional)}: elementos que se parsean
+    contenedores    selectores CSS de la tarjeta de producto; se usa el primero que encuentre algo
+    campos          {campo: {"selector", "atributo", "prefijo", "defecto"}}
+    obligatorios    campos sin los cuales el producto se descarta
+    paginacion      {"parametro", "inicio", "paso", "fijos", "desplazar"}
+
+Agregar una cadena nueva es solo agregar su definición al JSON.
+"""
+import atexit
+import json
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from functools import partial
+from itertools import count
+
+from parseo import atributo, colador, parsear_contenedores, selector, texto
+from precios import CAMPOS_REGISTRO, TIPOS_REGISTRO, registro
+from recorrido import MAX_PAGINAS, recorrer_paginas, url_con_parametros
+from salida import abrir_salida
+from vtex import USAR_API, intentar_vtex
+
+ARCHIVO_TIENDAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tiendas.json")
+
+# Procesos que parsean el HTML mientras el navegador carga la página siguiente (0: se parsea en el mismo hilo)
+PROCESOS_PARSEO = int(os.getenv("SCRAPER_PROCESOS_PARSEO", "2"))
+
+
+class Tienda:
+    """Definición de una tienda con los selectores ya compilados."""
+
+    def __init__(self, nombre, definicion):
+        self.nombre = nombre
+        self.definicion = definicion
+        self.url_categoria = definicion["url_categoria"]
+        self.archivo_csv = definicion["archivo_csv"]
+        self.vtex = definicion.get("vtex")
+        self.max_concurrentes = definicion.get("max_concurrentes", 1)
+        self.listo = definicion["listo"]
+
+        etiqueta = definicion["colador"]["etiqueta"]
+        clase = definicion["colador"].get("clase")
+        self.colador = colador(etiqueta, **{"class": re.compile(clase)}) if clase else colador(etiqueta)
+        self.contenedores = [selector(css) for css in definicion["contenedores"]]
+
+        self.campos = {}
+        for campo, regla in definicion["campos"].items():
+            self.campos[campo] = {
+                "selector": selector(regla["selector"]),
+                "atributo": regla.get("atributo"),
+                "prefijo": regla.get("prefijo", ""),
+                "defecto": regla.get("defecto"),
+            }
+        self.obligatorios = definicion.get("obligatorios", list(self.campos))
+
+        paginacion = definicion["paginacion"]
+        self.parametro_pagina = paginacion["parametro"]
+        self.primera_pagina = paginacion.get("inicio", 1)
+        self.paso_pagina = paginacion.get("paso", 1)
+        self.parametros_fijos = paginacion.get("fijos", {})
+        self.desplazar = paginacion.get("desplazar", False)
+
+    def _extraer(self, nodo, regla):
+        if regla["atributo"]:
+            valor = atributo(nodo, regla["selector"], regla["atributo"])
+        else:
+            valor = texto(nodo, regla["selector"])
+        if valor is None:
+            return regla["defecto"]
+        return regla["prefijo"] + valor.strip()
+
+    def parsear(self, html):
+        """Extrae los productos del HTML de una página."""
+        soup = parsear_contenedores(html, self.colador)
+        nodos = []
+        for contenedor in self.contenedores:
+            nodos = contenedor.select(soup)
+            if nodos:
+                break
+
+        productos = []
+        for nodo in nodos:
+            producto = {campo: self._extraer(nodo, regla) for campo, regla in self.campos.items()}
+            if all(producto[campo] is not None for campo in self.obligatorios):
+                productos.append(producto)
+        return productos
+
+    def urls_paginas(self, url):
+        """URLs de las páginas de una categoría, en orden (sin fin)."""
+        for numero in count():
+            valor = self.primera_pagina + numero * self.paso_pagina
+            yield url_con_parametros(url, **{self.parametro_pagina: valor}, **self.parametros_fijos)
+
+
+def cargar_tiendas(ruta=ARCHIVO_TIENDAS):
+    """Lee las definiciones de tiendas y devuelve {nombre: Tienda}."""
+    with open(ruta, "r", encoding="utf-8") as f:
+        definiciones = json.load(f)
+    return {nombre: Tienda(nombre, definicion) for nombre, definicion in definiciones.items()}
+
+
+_tiendas = None
+
+
+def obtener_tiendas():
+    """Tiendas de tiendas.json (se leen una sola vez por proceso)."""
+    global _tiendas
+    if _tiendas is None:
+        _tiendas = cargar_tiendas()
+    return _tiendas
+
+
+def obtener_tienda(nombre):
+    return obtener_tiendas()[nombre]
+
+
+_tiendas_del_proceso = {} # Tiendas ya compiladas en cada proceso de parseo
+
+
+def parsear_html(nombre, definicion, html):
+    """Parsea el HTML de una página de la tienda; se puede ejecutar en otro proceso.
+
+    Recibe la definición en lugar de la Tienda (los selectores compilados no
+    se pueden enviar entre procesos) y la compila una sola vez por proceso.
+    """
+    tienda = _tiendas_del_proceso.get(nombre)
+    if tienda is None or tienda.definicion != definicion:
+        tienda = _tiendas_del_proceso[nombre] = Tienda(nombre, definicion)
+    return tienda.parsear(html)
+
+
+_ejecutor = None
+_ejecutor_lock = threading.Lock()
+
+
+def obtener_ejecutor_parseo():
+    """Procesos de parseo compartidos por todo el proceso, o None si SCRAPER_PROCESOS_PARSEO=0."""
+    global _ejecutor
+    if PROCESOS_PARSEO <= 0:
+        return None
+    with _ejecutor_lock:
+        if _ejecutor is None:
+            # spawn y no fork: el orquestador tiene hilos (y el navegador, sus locks) que no se
+            # pueden copiar a medias en un proceso hijo
+            _ejecutor = ProcessPoolExecutor(max_workers=PROCESOS_PARSEO,
+                                            mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_ejecutor.shutdown, cancel_futures=True)
+        return _ejecutor
+
+
+def paginas_de_productos(tienda, url=None, max_paginas=MAX_PAGINAS, usar_api=USAR_API, desde=0,
+                         cargar=None, sesion=None, en_procesos=True):
+    """Productos de una categoría de a tandas, a medida que se scrapean: (url de la tanda, productos).
+
+    Usa la API VTEX si la tienda tiene (una sola tanda con toda la categoría);
+    si no, o si falla, recorre las páginas con Selenium (una tanda por página)
+    salteando las primeras `desde`. El HTML se parsea en los procesos de
+    parseo mientras el navegador carga la página siguiente (con `en_procesos=False`,
+    en este mismo hilo). `cargar` y `sesion` reemplazan al navegador y a la sesión
+    HTTP (por ejemplo, para reproducir un corpus).
+    """
+    url = url or tienda.url_categoria
+    if usar_api and tienda.vtex:
+        productos = intentar_vtex(tienda.nombre, tienda.vtex, url, sesion)
+        if productos is not None:
+            yield url, productos
+            return
+
+    ejecutor = obtener_ejecutor_parseo() if en_procesos else None
+    parsear = partial(parsear_html, tienda.nombre, tienda.definicion) if ejecutor else tienda.parsear
+    yield from recorrer_paginas(tienda.urls_paginas(url), tienda.nombre, tienda.listo, parsear,
+                                desplazar=tienda.desplazar, max_paginas=max_paginas, cargar=cargar,
+                                desde=desde, ejecutor=ejecutor)
+
+
+def obtener_productos(tienda, url=None, max_paginas=MAX_PAGINAS, usar_api=USAR_API, cargar=None, sesion=None):
+    """Scrapea una categoría de una tienda y devuelve todos sus productos."""
+    return [
+        producto
+        for _, pagina in paginas_de_productos(tienda, url, max_paginas, usar_api, cargar=cargar, sesion=sesion)
+        for producto in pagina
+    ]
+
+
+def registros(tienda, productos):
+    """Registros con tipos (precios en centavos, fecha) de los productos scrapeados de una tienda."""
+    fecha = datetime.now(timezone.utc)
+    return [registro(tienda.nombre, producto, fecha) for producto in productos]
+
+
+def guardar_productos(tienda, productos, ruta=None):
+    """Escribe productos ya scrapeados en la salida de la tienda, con los mismos registros que volcar_productos."""
+    ruta = ruta or tienda.archivo_csv
+    if not productos:
+        print("❌ No se extrajeron productos")
+        return
+    with abrir_salida(ruta, campos=CAMPOS_REGISTRO, tipos=TIPOS_REGISTRO) as salida:
+        salida.escribir(registros(tienda, productos))
+    print(f"✅ Se guardaron {salida.escritos} productos en {ruta}")
+
+
+def volcar_productos(tienda, salida, url=None, max_paginas=MAX_PAGINAS, usar_api=USAR_API, progreso=None,
+                     cargar=None, sesion=None):
+    """Scrapea una categoría escribiendo cada tanda en `salida` apenas llega, como registros con tipos.
+
+    Con `progreso`, se registra cada página escrita y, si la categoría quedó
+    a medias en una corrida anterior, se sigue desde la primera página sin
+    completar. Devuelve la cantidad de productos scrapeados (incluidos los
+    de la corrida anterior).
+    """
+    url = url or tienda.url_categoria
+    estado = progreso.estado(url) if progreso else {"paginas": 0, "productos": 0, "terminada": False}
+    if estado["terminada"]:
+        print(f"{tienda.nombre}: {url} ya se había completado")
+        return estado["productos"]
+
+    cantidad = estado["productos"]
+    paginas = paginas_de_productos(tienda, url, max_paginas, usar_api, desde=estado["paginas"],
+                                   cargar=cargar, sesion=sesion)
+    for url_pagina, pagina in paginas:
+        salida.escribir(registros(tienda, pagina))
+        cantidad += len(pagina)
+        if progreso:
+            progreso.pagina_completa(url, url_pagina, len(pagina))
+    if progreso:
+        progreso.terminar(url)
+    return cantidad
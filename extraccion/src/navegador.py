@@ -0,0 +1,108 @@
+import atexit
+import os
+import threading
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.firefox.options import Options
+
+# Cantidad máxima de navegadores abiertos al mismo tiempo
+MAX_NAVEGADORES = int(os.getenv("SCRAPER_MAX_NAVEGADORES", "2"))
+
+# Páginas que carga un navegador antes de reciclarlo (evita que acumule memoria)
+PAGINAS_POR_NAVEGADOR = int(os.getenv("SCRAPER_PAGINAS_POR_NAVEGADOR", "50"))
+
+
+# --- CONFIGURACIÓN DEL DRIVER ---
+def configurar_driver():
+    # Opciones del navegador
+    firefox_options = Options()
+    # Headless por defecto. Para debugear con la ventana visible: SCRAPER_HEADLESS=0
+    if os.getenv("SCRAPER_HEADLESS", "1") != "0":
+        firefox_options.add_argument("--headless")
+
+    # NOTA: GeckoDriver debe estar en el PATH (o lo descarga Selenium Manager).
+    driver = webdriver.Firefox(options=firefox_options)
+    return driver
+
+
+def cerrar_driver(driver):
+    """Cierra un navegador ignorando errores (por ejemplo, si ya se colgó)."""
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class PoolDrivers:
+    """Navegadores reutilizables compartidos por todos los scrapers.
+
+    Un navegador se devuelve al pool después de cada uso y el siguiente pedido
+    lo reutiliza ya abierto. Se limita cuántos hay abiertos a la vez, y cada
+    navegador se recicla después de `paginas_por_driver` usos o si falla.
+    """
+
+    def __init__(self, max_drivers=MAX_NAVEGADORES, paginas_por_driver=PAGINAS_POR_NAVEGADOR,
+                 fabrica=configurar_driver):
+        self.paginas_por_driver = paginas_por_driver
+        self.fabrica = fabrica
+        self._cupos = threading.BoundedSemaphore(max_drivers)
+        self._lock = threading.Lock()
+        self._libres = [] # Navegadores abiertos sin usar (el último es el más "caliente")
+        self._usos = {} # {id(driver): páginas cargadas}
+
+    @contextmanager
+    def driver(self):
+        """Presta un navegador. Uso: `with pool.driver() as driver: ...`"""
+        with self._cupos:
+            with self._lock:
+                driver = self._libres.pop() if self._libres else None
+            if driver is None:
+                driver = self.fabrica()
+                self._usos[id(driver)] = 0
+
+            try:
+                yield driver
+            except WebDriverException:
+                # El navegador puede haber quedado colgado: no se reutiliza
+                self._descartar(driver)
+                raise
+            except BaseException:
+                self._devolver(driver)
+                raise
+            else:
+                self._devolver(driver)
+
+    def _devolver(self, driver):
+        self._usos[id(driver)] += 1
+        if self._usos[id(driver)] >= self.paginas_por_driver:
+            self._descartar(driver)
+            return
+        with self._lock:
+            self._libres.append(driver)
+
+    def _descartar(self, driver):
+        self._usos.pop(id(driver), None)
+        cerrar_driver(driver)
+
+    def cerrar(self):
+        """Cierra todos los navegadores libres."""
+        with self._lock:
+            libres, self._libres = self._libres, []
+        for driver in libres:
+            self._descartar(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def obtener_pool():
+    """Pool compartido por todo el proceso; se cierra al salir."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = PoolDrivers()
+            atexit.register(_pool.cerrar)
+        return _pool
@@ -0,0 +1,206 @@
+"""Scrapea varias tiendas y categorías en paralelo.
+
+Uso:
+    python orquestador.py [--config categorias.json] [--formato csv|jsonl|parquet] [--desde-cero]
+                          [--max-age SEGUNDOS]
+
+El archivo de configuración lista, por tienda, las URLs de las categorías
+y cuántas se pueden scrapear a la vez:
+
+    {"carrefour": {"max_concurrentes": 2, "categorias": ["https://..."]}, ...}
+
+Si una corrida se corta, la siguiente retoma cada categoría desde la última
+página completa (salvo con --desde-cero).
+"""
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import ExitStack
+from functools import partial
+
+from cache import fuentes_con_cache
+from motor import obtener_ejecutor_parseo, obtener_tiendas, volcar_productos
+from progreso import corrida
+
+# Tareas que corren a la vez entre todas las tiendas
+MAX_TRABAJADORES = int(os.getenv("SCRAPER_MAX_TRABAJADORES", "6"))
+
+# Intentos por categoría y espera base entre intentos (se duplica en cada reintento)
+INTENTOS = 3
+ESPERA_BASE = 2.0
+
+
+class ResultadoCategoria:
+    """Resultado de scrapear una categoría de una tienda."""
+
+    def __init__(self, tienda, url):
+        self.tienda = tienda
+        self.url = url
+        self.cantidad = 0 # Productos scrapeados
+        self.error = None
+        self.intentos = 0
+        self.segundos = 0.0
+
+    @property
+    def exito(self):
+        return self.error is None
+
+
+class Reporte:
+    """Tiempos y resultados por tienda."""
+
+    def __init__(self):
+        self.tiendas = {} # {tienda: {"exitos", "fallas", "productos", "segundos", "mas_lenta"}}
+        self.segundos_totales = 0.0
+
+    def agregar(self, resultado):
+        datos = self.tiendas.setdefault(
+            resultado.tienda,
+            {"exitos": 0, "fallas": 0, "productos": 0, "segundos": 0.0, "mas_lenta": 0.0},
+        )
+        datos["exitos" if resultado.exito else "fallas"] += 1
+        datos["productos"] += resultado.cantidad
+        datos["segundos"] += resultado.segundos
+        datos["mas_lenta"] = max(datos["mas_lenta"], resultado.segundos)
+
+    def texto(self):
+        lineas = [f"{'Tienda':<12}{'OK':>4}{'Fallas':>8}{'Productos':>11}{'Segundos':>10}{'Más lenta':>11}"]
+        for tienda, datos in sorted(self.tiendas.items()):
+            lineas.append(
+                f"{tienda:<12}{datos['exitos']:>4}{datos['fallas']:>8}{datos['productos']:>11}"
+                f"{datos['segundos']:>10.1f}{datos['mas_lenta']:>11.1f}"
+            )
+        lineas.append(f"Tiempo total: {self.segundos_totales:.1f}s")
+        return "\n".join(lineas)
+
+
+def scrapers_por_tienda(corridas, **fuentes):
+    """Función que scrapea una categoría de cada tienda.
+
+    `corridas` es {tienda: (salida, progreso)}: los productos se escriben en
+    la salida y cada página completa se registra en el progreso. `fuentes`
+    (`cargar`, `sesion`) se pasan al motor.
+    """
+    return {
+        nombre: partial(volcar_productos, tienda, corridas[nombre][0], progreso=corridas[nombre][1], **fuentes)
+        for nombre, tienda in obtener_tiendas().items()
+        if nombre in corridas
+    }
+
+
+def ruta_salida(tienda, formato):
+    """productos_<tienda>.<formato>"""
+    return os.path.splitext(tienda.archivo_csv)[0] + "." + formato
+
+
+def config_por_defecto():
+    """La categoría por defecto de cada tienda de tiendas.json."""
+    return {
+        nombre: {"max_concurrentes": tienda.max_concurrentes, "categorias": [tienda.url_categoria]}
+        for nombre, tienda in obtener_tiendas().items()
+    }
+
+
+def cargar_config(ruta=None):
+    if ruta is None:
+        return config_por_defecto()
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def scrapear_categoria(tienda, url, scraper, cupo, intentos=INTENTOS, espera_base=ESPERA_BASE,
+                       dormir=time.sleep):
+    """Scrapea una categoría reintentando con espera exponencial si falla o no trae productos.
+
+    `scraper(url)` devuelve la cantidad de productos scrapeados.
+    """
+    resultado = ResultadoCategoria(tienda, url)
+    inicio = time.monotonic()
+    for intento in range(1, intentos + 1):
+        resultado.intentos = intento
+        try:
+            with cupo:
+                cantidad = scraper(url)
+            if not cantidad:
+                raise RuntimeError("no se extrajeron productos")
+            resultado.cantidad = cantidad
+            resultado.error = None
+            break
+        except Exception as e:
+            resultado.error = e
+            if intento < intentos:
+                espera = espera_base * 2 ** (intento - 1) * random.uniform(0.5, 1.5)
+                print(f"⚠️ {tienda}: intento {intento} falló ({e}), reintentando en {espera:.1f}s")
+                dormir(espera)
+    resultado.segundos = time.monotonic() - inicio
+    return resultado
+
+
+def orquestar(config, scrapers, max_trabajadores=MAX_TRABAJADORES, **opciones):
+    """Scrapea todas las categorías de la configuración en paralelo.
+
+    Devuelve los ResultadoCategoria a medida que terminan. Cada tienda
+    scrapea como máximo `max_concurrentes` categorías a la vez.
+    """
+    cupos = {
+        tienda: threading.BoundedSemaphore(datos.get("max_concurrentes", 1))
+        for tienda, datos in config.items()
+    }
+    # Los procesos de parseo se arrancan antes que los hilos de las categorías
+    obtener_ejecutor_parseo()
+    with ThreadPoolExecutor(max_workers=max_trabajadores) as ejecutor:
+        futuros = [
+            ejecutor.submit(scrapear_categoria, tienda, url, scrapers[tienda], cupos[tienda], **opciones)
+            for tienda, datos in config.items()
+            for url in datos["categorias"]
+        ]
+        for futuro in as_completed(futuros):
+            yield futuro.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scrapea todas las tiendas en paralelo")
+    parser.add_argument("--config", help="archivo JSON con las tiendas y categorías")
+    parser.add_argument("--formato", choices=["csv", "jsonl", "parquet"], default="csv",
+                        help="formato de los archivos de salida")
+    parser.add_argument("--desde-cero", action="store_true",
+                        help="no retomar una corrida anterior que quedó sin terminar")
+    parser.add_argument("--max-age", type=float, metavar="SEGUNDOS",
+                        help="reutilizar las páginas descargadas hace menos de SEGUNDOS (ver cache.py)")
+    args = parser.parse_args()
+
+    config = cargar_config(args.config)
+    tiendas = obtener_tiendas()
+    reporte = Reporte()
+    inicio = time.monotonic()
+
+    # Cada tienda escribe en su archivo a medida que se scrapean sus páginas
+    with ExitStack() as pila:
+        corridas = {
+            nombre: pila.enter_context(
+                corrida(ruta_salida(tiendas[nombre], args.formato), continuar=not args.desde_cero)
+            )
+            for nombre in config
+        }
+        scrapers = scrapers_por_tienda(corridas, **fuentes_con_cache(args.max_age))
+        for resultado in orquestar(config, scrapers):
+            reporte.agregar(resultado)
+            if resultado.exito:
+                print(f"✅ {resultado.tienda}: {resultado.cantidad} productos de {resultado.url} "
+                      f"en {resultado.segundos:.1f}s")
+            else:
+                print(f"❌ {resultado.tienda}: {resultado.url} falló tras {resultado.intentos} intentos "
+                      f"({resultado.error})")
+    reporte.segundos_totales = time.monotonic() - inicio
+
+    for nombre, (salida, _) in corridas.items():
+        print(f"{nombre}: {salida.escritos} productos en {salida.ruta}")
+    print(reporte.texto())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,36 @@
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+# lxml es mucho más rápido que el parser de Python; si no está instalado se usa el de Python
+try:
+    import lxml # noqa: F401
+    PARSER_HTML = "lxml"
+except ImportError:
+    PARSER_HTML = "html.parser"
+
+
+def colador(nombre=None, **atributos):
+    """SoupStrainer: al parsear solo se arma el árbol de los elementos que coinciden."""
+    return SoupStrainer(nombre, attrs=atributos)
+
+
+def selector(css):
+    """Selector CSS compilado una sola vez, para no reinterpretarlo en cada producto."""
+    return soupsieve.compile(css)
+
+
+def parsear_contenedores(html, colador_productos):
+    """Parsea solo los contenedores de productos de la página (y lo que tienen adentro)."""
+    return BeautifulSoup(html, PARSER_HTML, parse_only=colador_productos)
+
+
+def texto(nodo, selector_compilado):
+    """Texto del primer elemento que coincide dentro del nodo, o None."""
+    elemento = selector_compilado.select_one(nodo)
+    return elemento.get_text() if elemento is not None else None
+
+
+def atributo(nodo, selector_compilado, nombre):
+    """Atributo del primer elemento que coincide dentro del nodo, o None."""
+    elemento = selector_compilado.select_one(nodo)
+    return elemento.get(nombre) if elemento is not None else None
@@ -0,0 +1,147 @@
+"""Normalización de precios y registros de productos con tipos.
+
+Los precios se scrapean como texto ("$ 1.234,56", "Antes $ 2.000 Ahora $ 1.500",
+"Precio no encontrado"). Acá se convierten a centavos enteros, se calcula el
+precio por kg o por litro a partir del contenido que figura en el nombre, y
+cada producto pasa a ser un registro con columnas fijas:
+
+    tienda, nombre, precio, precio_unitario, unidad, enlace, fecha
+
+`precio` y `precio_unitario` están en centavos (None si no se pudo leer).
+"""
+import re
+from datetime import datetime, timezone
+
+# Un importe: parte entera con separadores de miles opcionales ("1.234" o "1,234")
+# y hasta dos decimales ("1.234,56", "1234.5"). El separador de miles va seguido
+# de exactamente tres dígitos; si no, es el separador decimal.
+_IMPORTE = r"(\d+(?:[.,]\d{3})*)(?:[.,](\d{1,2}))?(?!\d)"
+RE_IMPORTE = re.compile(_IMPORTE)
+
+# Un importe en pesos: "$ 1.234,56", "$4.299"
+RE_IMPORTE_PESOS = re.compile(r"\$\s*" + _IMPORTE)
+
+# Números de las promociones que no son importes: "2x1", "3 X 2", "20%", "2do"
+_PROMOCION = r"\d+\s*[xX]\s*\d+|\d+\s*%|\d+\s*(?:do|da|er|ra)\b"
+RE_PROMOCION = re.compile(_PROMOCION)
+
+# Lo que precede a un importe que no es el precio de venta
+RE_REFERENCIA = re.compile(r"precio\s+por|impuestos", re.IGNORECASE) # "Precio por 1 Kg : $ 3.000"
+RE_ANTERIOR = re.compile(r"antes|anterior|regular|de\s+lista", re.IGNORECASE) # "Antes $ 3.500"
+RE_CUOTAS = re.compile(r"(\d+)\s*cuotas?\b", re.IGNORECASE) # "3 cuotas de $ 500"
+RE_CONDICIONAL = re.compile(r"llevando", re.IGNORECASE) # "Llevando 2 unidades $ 1.800 c/u"
+RE_CADA_UNO = re.compile(r"\s*c/u", re.IGNORECASE)
+
+# Contenido neto en el nombre: "1 kg", "500 g", "1,5 l", "354 cc" y packs: "6 x 1 l",
+# "6 u x 50 g", "500 gr x 2" (el multiplicador de atrás no puede ser otro contenido)
+_UNIDADES = r"kg|kilos?|grs?|g|lts?|litros?|l|ml|cc|cm3"
+_CONTENIDO = (
+    r"(?:(\d+)\s*(?:u|un|uds?|unidades)?\.?\s*[xX]\s*)?(\d+(?:[.,]\d+)?)\s*"
+    rf"({_UNIDADES})\b"
+    rf"(?:\s*[xX]\s*(\d+)\b(?![.,]\d|\s*(?:{_UNIDADES})\b))?"
+)
+RE_CONTENIDO = re.compile(_CONTENIDO, re.IGNORECASE)
+
+# Gramos o mililitros por unidad de contenido
+_FACTORES = {
+    "kg": 1000, "kilo": 1000, "kilos": 1000, "g": 1, "gr": 1, "grs": 1,
+    "l": 1000, "lt": 1000, "lts": 1000, "litro": 1000, "litros": 1000, "ml": 1, "cc": 1, "cm3": 1,
+}
+
+# Unidad del precio unitario según la unidad de contenido
+_UNIDAD_PRECIO = {
+    "kg": "kg", "kilo": "kg", "kilos": "kg", "g": "kg", "gr": "kg", "grs": "kg",
+    "l": "l", "lt": "l", "lts": "l", "litro": "l", "litros": "l", "ml": "l", "cc": "l", "cm3": "l",
+}
+
+CAMPOS_REGISTRO = ("tienda", "nombre", "precio", "precio_unitario", "unidad", "enlace", "fecha")
+
+# Tipo de cada campo, para los formatos de salida con tipos (Parquet)
+TIPOS_REGISTRO = {
+    "tienda": "texto",
+    "nombre": "texto",
+    "precio": "entero",
+    "precio_unitario": "entero",
+    "unidad": "texto",
+    "enlace": "texto",
+    "fecha": "fecha",
+}
+
+
+def _centavos(entero, decimales):
+    return int(re.sub(r"[.,]", "", entero)) * 100 + int((decimales or "0").ljust(2, "0"))
+
+
+def a_centavos(texto):
+    """Precio de venta en centavos de un texto, o None si no tiene ningún importe.
+
+    Solo cuentan los importes con "$" (el resto de los números son cantidades,
+    packs o promociones). De los que hay, se descartan los de referencia
+    ("Precio por 1 Kg", "sin impuestos") y se toma el primero sin etiqueta;
+    si no hay ninguno, el condicional ("Llevando 2 ... c/u" o el total de las
+    cuotas) y, por último, el anterior ("Antes $ ..."). Un texto sin "$" se
+    toma como un importe suelto ("1234.56").
+    """
+    if texto is None:
+        return None
+    if isinstance(texto, (int, float)):
+        return round(texto * 100)
+    texto = str(texto)
+
+    ventas, condicionales, anteriores = [], [], []
+    desde = 0
+    for importe in RE_IMPORTE_PESOS.finditer(texto):
+        etiqueta = texto[desde:importe.start()]
+        desde = importe.end()
+        centavos = _centavos(*importe.groups())
+        cuotas = RE_CUOTAS.search(etiqueta)
+        if RE_REFERENCIA.search(etiqueta):
+            continue
+        if cuotas:
+            condicionales.append(centavos * int(cuotas.group(1)))
+        elif RE_CONDICIONAL.search(etiqueta) or RE_CADA_UNO.match(texto, importe.end()):
+            condicionales.append(centavos)
+        elif RE_ANTERIOR.search(etiqueta):
+            anteriores.append(centavos)
+        else:
+            ventas.append(centavos)
+    if desde:
+        return (ventas or condicionales or anteriores or [None])[0]
+
+    sueltos = RE_IMPORTE.findall(RE_PROMOCION.sub(" ", texto))
+    return _centavos(*sueltos[0]) if sueltos else None
+
+
+def contenido_neto(nombre):
+    """(gramos o mililitros, "kg" o "l") del contenido que figura en el nombre, o (None, None)."""
+    encontrados = RE_CONTENIDO.findall(nombre or "")
+    if not encontrados:
+        return None, None
+    adelante, cantidad, unidad, atras = encontrados[-1]
+    unidad = unidad.lower()
+    total = float(cantidad.replace(",", ".")) * _FACTORES[unidad] * int(adelante or 1) * int(atras or 1)
+    return (total, _UNIDAD_PRECIO[unidad]) if total else (None, None)
+
+
+def precio_unitario(precio, nombre):
+    """(centavos por kg o litro, unidad) según el contenido del nombre, o (None, None)."""
+    cantidad, unidad = contenido_neto(nombre)
+    if precio is None or cantidad is None:
+        return None, None
+    return round(precio * 1000 / cantidad), unidad
+
+
+def registro(tienda, producto, fecha=None):
+    """Convierte un producto scrapeado ({"nombre", "precio", "enlace"}) en un registro con tipos."""
+    precio = a_centavos(producto.get("precio"))
+    unitario, unidad = precio_unitario(precio, producto.get("nombre"))
+    return {
+        "tienda": tienda,
+        "nombre": (producto.get("nombre") or "").strip(),
+        "precio": precio,
+        "precio_unitario": unitario,
+        "unidad": unidad,
+        "enlace": producto.get("enlace"),
+        "fecha": fecha or datetime.now(timezone.utc),
+    }
+
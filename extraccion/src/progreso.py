@@ -0,0 +1,116 @@
+"""Puntos de control para retomar una corrida interrumpida.
+
+Después de cada página se guarda, por categoría, cuántas páginas se
+completaron, qué URLs se visitaron y cuántos productos se escribieron. Si la
+corrida se corta, la siguiente saltea las páginas completas y agrega solo lo
+nuevo al mismo archivo de salida.
+"""
+import json
+import os
+import threading
+from contextlib import contextmanager
+
+from historial import registrar_cambios
+from precios import CAMPOS_REGISTRO, TIPOS_REGISTRO
+from salida import abrir_salida
+from utils import escribir_json_atomico
+
+SUFIJO_PROGRESO = ".progreso.json"
+
+
+class Progreso:
+    """Avance de una corrida, guardado en disco después de cada página. Se puede usar desde varios hilos."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._lock = threading.Lock()
+        self._categorias = {} # {url_categoria: {"paginas", "visitadas", "productos", "terminada"}}
+        self.cargar()
+
+    def cargar(self):
+        try:
+            with open(self.ruta, "r", encoding="utf-8") as f:
+                self._categorias = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._categorias = {}
+
+    def _categoria(self, url_categoria):
+        return self._categorias.setdefault(
+            url_categoria, {"paginas": 0, "visitadas": [], "productos": 0, "terminada": False}
+        )
+
+    def estado(self, url_categoria):
+        """Copia del avance de una categoría."""
+        with self._lock:
+            estado = self._categoria(url_categoria)
+            return dict(estado, visitadas=list(estado["visitadas"]))
+
+    def pagina_completa(self, url_categoria, url_pagina, productos):
+        """Registra una página ya escrita en la salida."""
+        with self._lock:
+            estado = self._categoria(url_categoria)
+            estado["paginas"] += 1
+            estado["visitadas"].append(url_pagina)
+            estado["productos"] += productos
+            self._guardar()
+
+    def terminar(self, url_categoria):
+        with self._lock:
+            self._categoria(url_categoria)["terminada"] = True
+            self._guardar()
+
+    def pendientes(self):
+        """Categorías que se empezaron y no se terminaron."""
+        with self._lock:
+            return [url for url, estado in self._categorias.items() if not estado["terminada"]]
+
+    def reiniciar(self):
+        with self._lock:
+            self._categorias = {}
+        self.borrar()
+
+    def borrar(self):
+        try:
+            os.remove(self.ruta)
+        except FileNotFoundError:
+            pass
+
+    def _guardar(self):
+        escribir_json_atomico(self.ruta, self._categorias)
+
+
+@contextmanager
+def corrida(ruta_salida, continuar=True):
+    """Abre la salida de registros con tipos (ver precios.py) y su progreso. Devuelve (salida, progreso).
+
+    Si `continuar` y quedó una corrida sin terminar, la retoma. Si todas las
+    categorías empezadas se terminaron, se publica la salida, se registran
+    los cambios de precio respecto de la corrida anterior (ver historial.py)
+    y se borra el progreso; si hubo un error o quedó alguna a medias, ambos
+    quedan para la próxima corrida.
+    """
+    progreso = Progreso(ruta_salida + SUFIJO_PROGRESO)
+    if not continuar:
+        progreso.reiniciar()
+
+    salida = abrir_salida(ruta_salida, campos=CAMPOS_REGISTRO, tipos=TIPOS_REGISTRO, continuar=continuar)
+    # Sin productos recuperados, el progreso guardado no sirve
+    if not salida.escritos:
+        progreso.reiniciar()
+    elif continuar:
+        print(f"↪️ Se retoma {ruta_salida}: {salida.escritos} productos ya escritos")
+
+    try:
+        yield salida, progreso
+    except BaseException:
+        salida.cerrar(exito=False)
+        raise
+
+    pendientes = progreso.pendientes()
+    salida.cerrar(exito=not pendientes)
+    if pendientes:
+        print(f"⚠️ {len(pendientes)} categorías sin terminar en {ruta_salida}; la próxima corrida las retoma")
+    else:
+        if salida.escritos:
+            registrar_cambios(ruta_salida)
+        progreso.borrar()
@@ -0,0 +1,178 @@
+import os
+from collections import deque
+from itertools import islice
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from esperas import (
+    contar_elementos,
+    esperar_mas_elementos,
+    esperar_pagina,
+    obtener_tiempos,
+)
+from navegador import obtener_pool
+
+# Páginas que se cargan como máximo por categoría
+MAX_PAGINAS = int(os.getenv("SCRAPER_MAX_PAGINAS", "50"))
+
+# Páginas cargadas que pueden esperar su parseo cuando se parsea en otros procesos
+PAGINAS_EN_VUELO = int(os.getenv("SCRAPER_PAGINAS_EN_VUELO", "2"))
+
+# Scrolls que se hacen como máximo en una página con "infinite scroll"
+MAX_DESPLAZAMIENTOS = int(os.getenv("SCRAPER_MAX_DESPLAZAMIENTOS", "30"))
+
+
+def url_con_parametros(url, **parametros):
+    """Devuelve la URL con los parámetros de la query agregados o reemplazados."""
+    partes = urlsplit(url)
+    query = dict(parse_qsl(partes.query, keep_blank_values=True))
+    query.update({clave: str(valor) for clave, valor in parametros.items()})
+    return urlunsplit(partes._replace(query=urlencode(query, safe=",/")))
+
+
+def clave_pedido(url, params=None):
+    """Identifica un pedido HTTP: la URL con sus parámetros."""
+    return url_con_parametros(url, **params) if params else url
+
+
+class PaginaCargada(str):
+    """HTML de una página, que además dice si terminó de cargar (`lista`) o se venció la espera."""
+
+    def __new__(cls, html, lista=True):
+        pagina = super().__new__(cls, html)
+        pagina.lista = lista
+        return pagina
+
+    def __reduce__(self):
+        return PaginaCargada, (str(self), self.lista)
+
+
+def desplazar_hasta_estable(driver, selector, timeout, max_desplazamientos=MAX_DESPLAZAMIENTOS):
+    """Hace scroll hasta el final mientras sigan apareciendo elementos nuevos.
+
+    Devuelve la cantidad de elementos que quedaron en la página.
+    """
+    cantidad = contar_elementos(driver, selector)
+    for _ in range(max_desplazamientos):
+        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+        nueva = esperar_mas_elementos(driver, selector, cantidad, timeout)
+        if nueva <= cantidad:
+            break
+        cantidad = nueva
+    return cantidad
+
+
+def cargar_pagina(url, tienda, selector_listo, desplazar=False):
+    """Carga una página con un navegador del pool y devuelve su HTML (una PaginaCargada).
+
+    Espera a que aparezca `selector_listo` y, si `desplazar`, hace scroll
+    hasta que no aparezcan más elementos.
+    """
+    with obtener_pool().driver() as driver:
+        driver.get(url)
+        lista = esperar_pagina(driver, tienda, selector_listo)
+        if desplazar:
+            desplazar_hasta_estable(driver, selector_listo, obtener_tiempos().timeout(tienda))
+        return PaginaCargada(driver.page_source, lista)
+
+
+def _cargadas(urls, desde, max_paginas, cargar, tienda, selector_listo, desplazar):
+    """(número, url, html) de cada página, en orden; pasado `max_paginas`, una última con html None."""
+    for numero, url in enumerate(islice(urls, desde, None), start=desde + 1):
+        if numero > max_paginas:
+            yield numero, url, None
+            return
+        yield numero, url, cargar(url, tienda, selector_listo, desplazar)
+
+
+def _parseadas(cargadas, parsear, ejecutor, en_vuelo):
+    """(número, url, productos) de cada página cargada, en orden (productos None si no se cargó).
+
+    Con `ejecutor`, cada página se parsea en él mientras se cargan las
+    siguientes, con hasta `en_vuelo` páginas esperando su parseo.
+    """
+    if ejecutor is None:
+        for numero, url, html in cargadas:
+            yield numero, url, None if html is None else parsear(html)
+        return
+
+    pendientes = deque() # (número, url, futuro o None)
+
+    def siguiente():
+        numero, url, futuro = pendientes.popleft()
+        return numero, url, None if futuro is None else futuro.result()
+
+    try:
+        while True:
+            try:
+                numero, url, html = next(cargadas)
+            except StopIteration:
+                break
+            except Exception:
+                # Si falla una carga adelantada, primero van las páginas anteriores:
+                # si una de ellas era la última, el error no importa
+                while pendientes:
+                    yield siguiente()
+                raise
+            pendientes.append((numero, url, None if html is None else ejecutor.submit(parsear, html)))
+            if len(pendientes) >= en_vuelo:
+                yield siguiente()
+        while pendientes:
+            yield siguiente()
+    finally:
+        # El recorrido terminó antes: las páginas cargadas de más no se parsean
+        for _, _, futuro in pendientes:
+            if futuro is not None:
+                futuro.cancel()
+
+
+def recorrer_paginas(urls, tienda, selector_listo, parsear, desplazar=False, max_paginas=MAX_PAGINAS,
+                     cargar=None, desde=0, ejecutor=None, en_vuelo=PAGINAS_EN_VUELO):
+    """Recorre las páginas de una categoría y devuelve, página por página, (url, productos nuevos).
+
+    `urls` es un iterable (puede ser infinito) con la URL de cada página en
+    orden y `parsear(html)` devuelve los productos de una página.
+    `cargar(url, tienda, selector_listo, desplazar)` devuelve el HTML de una
+    página (por defecto, con un navegador del pool). Se deja de
+    cargar páginas cuando una no trae productos nuevos o trae menos que la
+    primera (es la última), o al llegar a `max_paginas`. Con `desde` se
+    saltean las primeras páginas (ya scrapeadas en una corrida anterior).
+    Los productos se identifican por su enlace (los que no tienen, por nombre
+    y precio); solo se recuerdan esas claves.
+
+    Con `ejecutor` (un ProcessPoolExecutor, por ejemplo), el navegador carga
+    la página siguiente mientras se parsea la anterior; `parsear` tiene que
+    poder enviarse a otro proceso. Como recién al parsear se sabe si una
+    página es la última, se pueden cargar hasta `en_vuelo - 1` páginas de más.
+    """
+    cargadas = _cargadas(urls, desde, max_paginas, cargar or cargar_pagina, tienda, selector_listo, desplazar)
+    vistos = set()
+    por_pagina = None
+
+    for numero, url, encontrados in _parseadas(cargadas, parsear, ejecutor, en_vuelo):
+        if encontrados is None:
+            print(f"⚠️ {tienda}: se alcanzó el máximo de {max_paginas} páginas")
+            break
+
+        nuevos = []
+        for producto in encontrados:
+            clave = producto["enlace"] or (producto["nombre"], producto["precio"])
+            if clave not in vistos:
+                vistos.add(clave)
+                nuevos.append(producto)
+        print(f"{tienda}: página {numero}, {len(nuevos)} productos nuevos")
+        if nuevos:
+            yield url, nuevos
+
+        if por_pagina is None:
+            por_pagina = len(encontrados)
+        if not nuevos or len(encontrados) < por_pagina:
+            break
+
+
+def recorrer(urls, tienda, selector_listo, parsear, **opciones):
+    """Como recorrer_paginas, pero junta todos los productos en una lista."""
+    return [
+        producto
+        for _, pagina in recorrer_paginas(urls, tienda, selector_listo, parsear, **opciones)
+        for producto in pagina
+    ]
@@ -0,0 +1,252 @@
+"""Escritura incremental de productos en CSV, JSONL o Parquet.
+
+Los productos se agregan al archivo a medida que se scrapean, así la memoria
+no crece con el catálogo y una corrida que se corta conserva lo escrito:
+
+    with abrir_salida("productos_coto.csv") as salida:
+        salida.escribir(productos_de_una_pagina)
+"""
+import csv
+import json
+import os
+import threading
+
+# pyarrow solo hace falta para escribir Parquet
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+# Filas por grupo al escribir Parquet
+TAMANO_BLOQUE = 1000
+
+SUFIJO_PARCIAL = ".parcial"
+
+
+class Salida:
+    """Archivo de productos que crece mientras se scrapea.
+
+    Se escribe en `<ruta>.parcial` y, al cerrar sin errores, se renombra a
+    `ruta` de forma atómica. Si la corrida falla, el .parcial queda con todo
+    lo escrito y `continuar=True` lo retoma. Cada enlace se escribe una sola
+    vez. Se puede usar desde varios hilos.
+    """
+
+    # Si es False, los productos se juntan hasta completar un bloque antes de escribirse
+    volcar_en_cada_escritura = True
+
+    def __init__(self, ruta, campos=None, tipos=None, tamano_bloque=TAMANO_BLOQUE, continuar=False):
+        self.ruta = ruta
+        self.ruta_parcial = ruta + SUFIJO_PARCIAL
+        self.campos = list(campos) if campos else None
+        self.tipos = tipos or {} # {campo: "texto" | "entero" | "fecha"}, para los formatos con tipos
+        self.tamano_bloque = tamano_bloque
+        self.escritos = 0
+        self._pendientes = []
+        self._enlaces = set()
+        self._lock = threading.Lock()
+
+        anteriores = self.leer(self.ruta_parcial) if continuar and os.path.exists(self.ruta_parcial) else []
+        for producto in anteriores:
+            self._enlaces.add(producto.get("enlace"))
+            self.campos = self.campos or list(producto)
+        self.escritos = len(anteriores)
+        self._abrir(anteriores)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_error, error, traza):
+        self.cerrar(exito=tipo_error is None)
+
+    def enlaces_escritos(self):
+        with self._lock:
+            return set(self._enlaces)
+
+    def escribir(self, productos):
+        """Agrega productos; los enlaces ya escritos se ignoran. Devuelve cuántos se agregaron."""
+        with self._lock:
+            agregados = 0
+            for producto in productos:
+                enlace = producto.get("enlace")
+                if enlace is not None and enlace in self._enlaces:
+                    continue
+                self._enlaces.add(enlace)
+                self._pendientes.append(producto)
+                agregados += 1
+
+            if self._pendientes and (self.volcar_en_cada_escritura
+                                     or len(self._pendientes) >= self.tamano_bloque):
+                self._volcar()
+            return agregados
+
+    def _volcar(self):
+        self.campos = self.campos or list(self._pendientes[0])
+        self._escribir_bloque(self._pendientes)
+        self.escritos += len(self._pendientes)
+        self._pendientes = []
+
+    def cerrar(self, exito=True):
+        """Escribe lo pendiente y cierra. Si `exito`, publica el archivo final."""
+        with self._lock:
+            if self._pendientes:
+                self._volcar()
+            self._cerrar_archivo()
+
+            if not exito:
+                print(f"⚠️ Quedaron {self.escritos} productos en {self.ruta_parcial}")
+            elif self.escritos:
+                os.replace(self.ruta_parcial, self.ruta)
+            else:
+                os.remove(self.ruta_parcial)
+
+    # --- A implementar por cada formato ---
+
+    @staticmethod
+    def leer(ruta):
+        """Productos de un archivo de este formato; una última fila a medio escribir se descarta."""
+        raise NotImplementedError
+
+    def _abrir(self, anteriores):
+        raise NotImplementedError
+
+    def _escribir_bloque(self, productos):
+        raise NotImplementedError
+
+    def _cerrar_archivo(self):
+        raise NotImplementedError
+
+
+class SalidaCSV(Salida):
+    @staticmethod
+    def leer(ruta):
+        with open(ruta, "r", newline="", encoding="utf-8") as f:
+            lineas = f.read().splitlines(keepends=True)
+        # Una última línea sin salto de línea quedó a medio escribir
+        if lineas and not lineas[-1].endswith("\n"):
+            lineas.pop()
+        return list(csv.DictReader(lineas))
+
+    def _abrir(self, anteriores):
+        # Se reescribe lo leído para descartar una última fila cortada
+        self._archivo = open(self.ruta_parcial, "w", newline="", encoding="utf-8")
+        self._escritor = None
+        if anteriores:
+            self._escribir_bloque(anteriores)
+
+    def _escribir_bloque(self, productos):
+        if self._escritor is None:
+            self._escritor = csv.DictWriter(self._archivo, self.campos, extrasaction="ignore")
+            self._escritor.writeheader()
+        self._escritor.writerows(productos)
+        self._archivo.flush()
+
+    def _cerrar_archivo(self):
+        self._archivo.close()
+
+
+def _a_json(valor):
+    # Fechas en ISO 8601
+    return valor.isoformat() if hasattr(valor, "isoformat") else str(valor)
+
+
+class SalidaJSONL(Salida):
+    @staticmethod
+    def leer(ruta):
+        anteriores = []
+        with open(ruta, "r", encoding="utf-8") as f:
+            for linea in f:
+                try:
+                    anteriores.append(json.loads(linea))
+                except json.JSONDecodeError:
+                    break # Última línea a medio escribir
+        return anteriores
+
+    def _abrir(self, anteriores):
+        # Se reescribe lo leído para descartar una última línea cortada
+        self._archivo = open(self.ruta_parcial, "w", encoding="utf-8")
+        if anteriores:
+            self._escribir_bloque(anteriores)
+
+    def _escribir_bloque(self, productos):
+        self._archivo.writelines(json.dumps(p, ensure_ascii=False, default=_a_json) + "\n" for p in productos)
+        self._archivo.flush()
+
+    def _cerrar_archivo(self):
+        self._archivo.close()
+
+
+class SalidaParquet(Salida):
+    """Parquet comprimido, un grupo de filas por bloque.
+
+    Un .parcial de Parquet solo se puede retomar si se cerró (por ejemplo,
+    al cortarse con una excepción o Ctrl-C); si el proceso murió sin cerrar
+    el archivo, se empieza de nuevo.
+    """
+
+    volcar_en_cada_escritura = False
+
+    def __init__(self, *args, **kwargs):
+        if pa is None:
+            raise RuntimeError("Para escribir Parquet hay que instalar pyarrow (pip install pyarrow)")
+        super().__init__(*args, **kwargs)
+
+    @staticmethod
+    def leer(ruta):
+        try:
+            return pq.read_table(ruta).to_pylist()
+        except (pa.ArrowInvalid, OSError) as e:
+            print(f"⚠️ {ruta} no se puede leer ({e})")
+            return []
+
+    def _abrir(self, anteriores):
+        self._escritor = None
+        if anteriores:
+            self._escribir_bloque(anteriores)
+
+    def _esquema(self):
+        """Esquema de Arrow según `tipos`, o None para inferirlo del primer bloque."""
+        if not self.tipos:
+            return None
+        tipos_arrow = {"texto": pa.string(), "entero": pa.int64(), "fecha": pa.timestamp("us", tz="UTC")}
+        return pa.schema([(campo, tipos_arrow[self.tipos.get(campo, "texto")]) for campo in self.campos])
+
+    def _escribir_bloque(self, productos):
+        if self._escritor is None:
+            tabla = pa.Table.from_pylist(productos, schema=self._esquema())
+            self._escritor = pq.ParquetWriter(self.ruta_parcial, tabla.schema, compression="zstd")
+        else:
+            tabla = pa.Table.from_pylist(productos, schema=self._escritor.schema)
+        self._escritor.write_table(tabla)
+
+    def _cerrar_archivo(self):
+        if self._escritor is None:
+            # Nunca se escribió nada: dejar un archivo vacío para poder borrarlo al cerrar
+            open(self.ruta_parcial, "wb").close()
+        else:
+            self._escritor.close()
+
+
+FORMATOS = {
+    ".csv": SalidaCSV,
+    ".jsonl": SalidaJSONL,
+    ".parquet": SalidaParquet,
+}
+
+
+def _formato(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FORMATOS:
+        raise ValueError(f"Formato de salida no soportado: {extension or ruta}")
+    return FORMATOS[extension]
+
+
+def abrir_salida(ruta, **opciones):
+    """Abre la salida adecuada según la extensión del archivo (.csv, .jsonl o .parquet)."""
+    return _formato(ruta)(ruta, **opciones)
+
+
+def leer_salida(ruta):
+    """Productos de un archivo de salida ya escrito (.csv, .jsonl o .parquet)."""
+    return _formato(ruta).leer(ruta)
@@ -1,8 +1,16 @@
-import pandas as pd
-def guardar_productos_en_csv(productos):
-    if productos:
-        df = pd.DataFrame(productos)
-        df.to_csv("productos_carrefour.csv", index=False, encoding="utf-8")
-        print(f"✅ Se guardaron {len(df)} productos en productos_carrefour.csv")
-    else:
-        print("❌ No se extrajeron productos")
+import json
+import os
+import tempfile
+
+
+def escribir_json_atomico(ruta, datos):
+    """Escribe un JSON de forma atómica: nunca queda un archivo a medio escribir."""
+    directorio = os.path.dirname(os.path.abspath(ruta))
+    fd, temporal = tempfile.mkstemp(dir=directorio, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False)
+        os.replace(temporal, ruta)
+    except BaseException:
+        os.remove(temporal)
+        raise
@@ -0,0 +1,140 @@
+"""Extracción sin navegador para tiendas VTEX (Carrefour y Día).
+
+Las tiendas VTEX exponen la API pública de búsqueda del catálogo, que
+devuelve productos, precios y enlaces en JSON. Es mucho más rápido que
+renderizar la página con Selenium y parsear el HTML.
+"""
+import os
+import threading
+from urllib.parse import parse_qsl, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+RUTA_BUSQUEDA = "/api/catalog_system/pub/products/search"
+
+# La API devuelve como máximo 50 productos por pedido
+PRODUCTOS_POR_PEDIDO = 50
+
+# Pedidos que se hacen como máximo por categoría (VTEX no pagina más allá de 2500 productos)
+MAX_PEDIDOS = int(os.getenv("SCRAPER_MAX_PEDIDOS_API", "50"))
+
+# Conexiones que la sesión compartida mantiene abiertas (una por categoría que el orquestador
+# descarga a la vez)
+MAX_CONEXIONES = int(os.getenv("SCRAPER_MAX_CATEGORIAS_API", "4"))
+
+TIMEOUT_PEDIDO = 15
+
+# Probar primero la API y usar Selenium solo si falla. Para forzar Selenium: SCRAPER_USAR_API=0
+USAR_API = os.getenv("SCRAPER_USAR_API", "1") != "0"
+
+_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Accept": "application/json",
+}
+
+
+def crear_sesion(max_conexiones=MAX_CONEXIONES):
+    """Sesión HTTP que reutiliza conexiones y reintenta errores transitorios."""
+    sesion = requests.Session()
+    sesion.headers.update(_HEADERS)
+    reintentos = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504))
+    adaptador = HTTPAdapter(pool_connections=4, pool_maxsize=max_conexiones,
+                            max_retries=reintentos)
+    sesion.mount("https://", adaptador)
+    return sesion
+
+
+_sesion = None
+_sesion_lock = threading.Lock()
+
+
+def obtener_sesion():
+    """Sesión compartida por todo el proceso."""
+    global _sesion
+    with _sesion_lock:
+        if _sesion is None:
+            _sesion = crear_sesion()
+        return _sesion
+
+
+def ruta_de_categoria(url):
+    """Convierte la URL de una categoría de la tienda en (ruta, map) para la API.
+
+    Las URLs de búsqueda facetada de VTEX traen la categoría en los
+    parámetros `query` y `map`; si no, se usa el path de la URL.
+    """
+    partes = urlsplit(url)
+    parametros = dict(parse_qsl(partes.query))
+    ruta = (parametros.get("query") or partes.path).strip("/")
+    niveles = ruta.count("/") + 1
+    mapa = parametros.get("map") or ",".join(["c"] * niveles)
+    # Solo los niveles de categoría del map, uno por segmento de la ruta
+    mapa = ",".join("c" for _ in mapa.split(",")[:niveles])
+    return ruta, mapa
+
+
+def formatear_precio(valor):
+    """Formatea un precio como lo muestra la tienda: 1234.5 -> "$ 1.234,50"."""
+    texto = f"{valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+    return f"$ {texto}"
+
+
+def producto_desde_json(dato):
+    """Convierte un producto de la API en {"nombre", "precio", "enlace"}, o None si no tiene precio."""
+    for item in dato.get("items", []):
+        for vendedor in item.get("sellers", []):
+            oferta = vendedor.get("commertialOffer", {})
+            if oferta.get("Price") and oferta.get("AvailableQuantity", 1) > 0:
+                return {
+                    "nombre": dato["productName"],
+                    "precio": formatear_precio(oferta["Price"]),
+                    "enlace": dato["link"],
+                }
+    return None
+
+
+def obtener_productos_vtex(dominio, url_categoria, sesion=None, max_pedidos=MAX_PEDIDOS):
+    """Descarga todos los productos de una categoría de la tienda VTEX de `dominio`.
+
+    Pagina con `_from`/`_to` hasta que un pedido vuelve incompleto.
+    Lanza requests.RequestException si la API falla.
+    """
+    sesion = sesion or obtener_sesion()
+    ruta, mapa = ruta_de_categoria(url_categoria)
+    url = f"{dominio}{RUTA_BUSQUEDA}/{ruta}"
+
+    productos = {} # {enlace: producto}
+    for pedido in range(max_pedidos):
+        desde = pedido * PRODUCTOS_POR_PEDIDO
+        respuesta = sesion.get(
+            url,
+            params={"map": mapa, "_from": desde, "_to": desde + PRODUCTOS_POR_PEDIDO - 1},
+            timeout=TIMEOUT_PEDIDO,
+        )
+        respuesta.raise_for_status()
+        datos = respuesta.json()
+
+        for dato in datos:
+            producto = producto_desde_json(dato)
+            if producto and producto["enlace"] not in productos:
+                productos[producto["enlace"]] = producto
+
+        if len(datos) < PRODUCTOS_POR_PEDIDO:
+            break
+
+    return list(productos.values())
+
+
+def intentar_vtex(tienda, dominio, url_categoria, sesion=None):
+    """Productos de la categoría por la API, o None si hay que volver a Selenium."""
+    try:
+        productos = obtener_productos_vtex(dominio, url_categoria, sesion)
+    except (requests.RequestException, ValueError) as e:
+        print(f"⚠️ {tienda}: falló la API ({e}), se usa el navegador")
+        return None
+    if not productos:
+        print(f"⚠️ {tienda}: la API no devolvió productos, se usa el navegador")
+        return None
+    return productos
@@ -0,0 +1,71 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException
+
+from motor import Tienda
+
+# Una cadena inventada, definida solo con datos (como las de tiendas.json)
+DEFINICION_NUEVA = {
+    "url_categoria": "https://www.nueva.com.ar/almacen",
+    "archivo_csv": "productos_nueva.csv",
+    "listo": "li",
+    "colador": {"etiqueta": "li"},
+    "contenedores": ["li"],
+    "campos": {
+        "nombre": {"selector": "span"},
+        "enlace": {"selector": "a[href]", "atributo": "href"},
+    },
+    "paginacion": {"parametro": "p", "inicio": 1, "paso": 1},
+}
+
+
+def html_nueva(*numeros):
+    return "".join(f'<li><a href="/p/{n}"></a><span>P{n}</span></li>' for n in numeros)
+
+
+class DriverFalso:
+    """Driver que "renderiza" productos después de cierta cantidad de consultas."""
+
+    def __init__(self, productos_desde=0, recursos=(5,)):
+        self.consultas = 0
+        self.productos_desde = productos_desde
+        self.recursos = list(recursos)
+        self.cerrado = False
+
+    def find_element(self, by, selector):
+        elementos = self.find_elements(by, selector)
+        if not elementos:
+            raise NoSuchElementException(selector)
+        return elementos[0]
+
+    def find_elements(self, by, selector):
+        self.consultas += 1
+        return ["producto"] * max(0, self.consultas - self.productos_desde)
+
+    def execute_script(self, script):
+        # Cada consulta devuelve la siguiente cantidad de recursos; la última se repite
+        recursos = self.recursos.pop(0) if len(self.recursos) > 1 else self.recursos[0]
+        return [recursos, "complete"]
+
+    def quit(self):
+        self.cerrado = True
+
+
+@pytest.fixture
+def tienda_nueva():
+    return Tienda("nueva", DEFINICION_NUEVA)
+
+
+@pytest.fixture
+def paginas_nueva():
+    """{url: html} de las páginas de la categoría de la tienda nueva: productos 1 y 2, 3 y 4, y 5."""
+    return {
+        "https://www.nueva.com.ar/almacen?p=1": html_nueva(1, 2),
+        "https://www.nueva.com.ar/almacen?p=2": html_nueva(3, 4),
+        "https://www.nueva.com.ar/almacen?p=3": html_nueva(5),
+    }
+
+
+@pytest.fixture
+def driver_falso():
+    """La clase DriverFalso, para crear drivers con distintos tiempos de "renderizado"."""
+    return DriverFalso
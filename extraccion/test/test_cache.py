@@ -0,0 +1,131 @@
+import json
+
+from cache import Cache, SesionConCache, cargar_con_cache
+from recorrido import PaginaCargada
+
+
+class Reloj:
+    def __init__(self):
+        self.ahora = 1000.0
+
+    def __call__(self):
+        return self.ahora
+
+
+class Respuesta:
+    def __init__(self, estado, datos=None, headers=None):
+        self.status_code = estado
+        self.content = json.dumps(datos).encode("utf-8") if datos is not None else b""
+        self.headers = headers or {}
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class SesionEtag:
+    """Servidor que contesta 304 si el ETag que se le manda es el actual."""
+
+    def __init__(self, datos, etag):
+        self.datos = datos
+        self.etag = etag
+        self.pedidos = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        self.pedidos.append(dict(headers or {}))
+        if (headers or {}).get("If-None-Match") == self.etag:
+            return Respuesta(304)
+        return Respuesta(200, self.datos, {"ETag": self.etag})
+
+
+def test_paginas_recientes_no_se_vuelven_a_cargar(tmp_path):
+    reloj = Reloj()
+    cache = Cache(str(tmp_path), reloj=reloj)
+    cargadas = []
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        cargadas.append(url)
+        return f"<html>{url}</html>"
+
+    cargar_cacheada = cargar_con_cache(60, cargar, cache)
+    assert cargar_cacheada("u1", "coto", "li", False) == "<html>u1</html>"
+    reloj.ahora += 30
+    assert cargar_cacheada("u1", "coto", "li", False) == "<html>u1</html>"
+    # La misma URL de otra tienda es otra entrada
+    cargar_cacheada("u1", "dia", "li", False)
+    assert cargadas == ["u1", "u1"]
+
+    # Vencida, se vuelve a cargar
+    reloj.ahora += 31
+    cargar_cacheada("u1", "coto", "li", False)
+    assert cargadas == ["u1", "u1", "u1"]
+
+    # El índice sobrevive al proceso
+    cache.cerrar()
+    assert Cache(str(tmp_path)).obtener("coto u1") is not None
+
+
+def test_paginas_que_no_terminaron_de_cargar_no_se_guardan(tmp_path):
+    cache = Cache(str(tmp_path), reloj=Reloj())
+    cargadas = []
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        cargadas.append(url)
+        return PaginaCargada("<html></html>", lista=len(cargadas) > 1)
+
+    cargar_cacheada = cargar_con_cache(60, cargar, cache)
+    for _ in range(3):
+        assert cargar_cacheada("u1", "coto", "li", False) == "<html></html>"
+    # La primera se venció: recién la segunda queda en la caché
+    assert cargadas == ["u1", "u1"]
+
+
+def test_api_vencida_se_revalida_con_etag(tmp_path):
+    reloj = Reloj()
+    servidor = SesionEtag([{"productName": "Leche"}], '"v1"')
+    sesion = SesionConCache(servidor, 60, Cache(str(tmp_path), reloj=reloj))
+
+    assert sesion.get("https://api/buscar", params={"_from": 0}).json() == [{"productName": "Leche"}]
+    sesion.get("https://api/buscar", params={"_from": 0})
+    assert len(servidor.pedidos) == 1
+
+    reloj.ahora += 120
+    assert sesion.get("https://api/buscar", params={"_from": 0}).json() == [{"productName": "Leche"}]
+    assert servidor.pedidos[-1] == {"If-None-Match": '"v1"'}
+
+    # El 304 la renovó: no hace falta otro pedido
+    sesion.get("https://api/buscar", params={"_from": 0})
+    assert len(servidor.pedidos) == 2
+
+    servidor.datos, servidor.etag = [{"productName": "Leche descremada"}], '"v2"'
+    reloj.ahora += 120
+    assert sesion.get("https://api/buscar", params={"_from": 0}).json() == [{"productName": "Leche descremada"}]
+
+
+def test_se_borran_las_entradas_usadas_hace_mas_tiempo(tmp_path):
+    reloj = Reloj()
+    cache = Cache(str(tmp_path), tamano_maximo=250, reloj=reloj)
+
+    for clave in ("a", "b"):
+        cache.guardar(clave, clave.encode() * 100)
+        reloj.ahora += 1
+    # Contenido repetido: no ocupa más lugar
+    cache.guardar("b2", b"b" * 100)
+    assert cache.tamano() == 200
+
+    reloj.ahora += 1
+    cache.obtener("a")
+    reloj.ahora += 1
+    cache.guardar("c", b"c" * 100)
+
+    assert cache.obtener("b") is None and cache.obtener("b2") is None
+    assert cache.obtener("a") is not None and cache.obtener("c") is not None
+    assert cache.tamano() == 200
+    assert len([ruta for ruta in (tmp_path / "objetos").rglob("*") if ruta.is_file()]) == 2
+
+    # Al reabrir, se respeta el orden de uso y el tamaño
+    cache.cerrar()
+    reabierta = Cache(str(tmp_path), tamano_maximo=250, reloj=reloj)
+    assert reabierta.tamano() == 200
+    reloj.ahora += 1
+    reabierta.guardar("d", b"d" * 100)
+    assert reabierta.obtener("a") is None and reabierta.obtener("c") is not None
@@ -0,0 +1,38 @@
+from comparacion import Producto, comparar_archivos, emparejar, palabras
+from salida import abrir_salida
+
+
+def test_palabras_sin_acentos_ni_contenido():
+    assert palabras("Café Molido La Virginia x 500 Grs.") == {"cafe", "molido", "virginia"}
+
+
+def test_emparejar_entre_tiendas():
+    productos = [
+        Producto("carrefour", "Yerba Mate Playadito 1 Kg", 429900, "/c/yerba"),
+        Producto("coto", "YERBA PLAYADITO X 1000 GR", 415000, "/k/yerba"),
+        Producto("dia", "Yerba Mate Playadito 500 g", 230000, "/d/yerba-500"),
+        Producto("dia", "Yerba mate Playadito 1kg", 399000, "/d/yerba"),
+        Producto("coto", "Yerba Taragüi 1 kg", 380000, "/k/taragui"),
+    ]
+
+    grupos = emparejar(productos, umbral=0.5)
+
+    assert len(grupos) == 1
+    assert sorted(p.enlace for p in grupos[0]) == ["/c/yerba", "/d/yerba", "/k/yerba"]
+
+
+def test_comparar_archivos(tmp_path):
+    for tienda, precio in (("carrefour", 110000), ("coto", 105000)):
+        with abrir_salida(str(tmp_path / f"productos_{tienda}.csv")) as salida:
+            salida.escribir([
+                {"tienda": tienda, "nombre": "Leche Entera La Serenísima 1 L", "precio": precio, "enlace": f"/{tienda}/leche"},
+                {"tienda": tienda, "nombre": f"Producto solo de {tienda}", "precio": 1, "enlace": f"/{tienda}/otro"},
+            ])
+
+    filas, tiendas = comparar_archivos([str(tmp_path / "productos_carrefour.csv"), str(tmp_path / "productos_coto.csv")])
+
+    assert tiendas == ["carrefour", "coto"]
+    assert filas == [{
+        "producto": "Leche Entera La Serenísima 1 L", "contenido": 1000.0, "unidad": "l",
+        "precio_carrefour": 110000, "precio_coto": 105000, "tienda_mas_barata": "coto", "precio_minimo": 105000,
+    }]
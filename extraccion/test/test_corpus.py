@@ -0,0 +1,102 @@
+import json
+import pathlib
+
+import pytest
+
+import benchmark
+import motor
+import recorrido
+import vtex
+from corpus import CapturaTienda, PaginaNoCapturada, capturar_tienda, diferencias, reproducir_tienda
+from motor import cargar_tiendas
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+def no_cargar(url, tienda, selector_listo, desplazar):
+    raise AssertionError("la reproducción no debe abrir el navegador")
+
+
+class RespuestaVtex:
+    def __init__(self, datos):
+        self.datos = datos
+        self.status_code = 200
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.datos
+
+
+class SesionVtex:
+    """La API responde con los productos grabados (menos de un pedido completo)."""
+
+    def __init__(self, datos):
+        self.paginas = [datos]
+
+    def get(self, url, params=None, timeout=None):
+        return RespuestaVtex(self.paginas.pop(0) if self.paginas else [])
+
+
+@pytest.fixture
+def cargar_en_vivo(paginas_nueva):
+    def cargar(url, tienda, selector_listo, desplazar):
+        return paginas_nueva[url]
+    return cargar
+
+
+def test_captura_y_reproduccion_de_paginas(tmp_path, monkeypatch, tienda_nueva, cargar_en_vivo):
+    tienda = tienda_nueva
+    captura = capturar_tienda(tienda, [tienda.url_categoria], str(tmp_path / "nueva"), cargar=cargar_en_vivo)
+    assert len(captura.indice["paginas"]) == 3
+
+    monkeypatch.setattr(recorrido, "cargar_pagina", no_cargar)
+    captura = CapturaTienda(str(tmp_path / "nueva"))
+    assert reproducir_tienda(tienda, captura) == {
+        tienda.url_categoria: [{"nombre": f"P{n}", "enlace": f"/p/{n}"} for n in range(1, 6)]
+    }
+    assert diferencias(tienda, captura) == {}
+
+    with pytest.raises(PaginaNoCapturada):
+        captura.cargar("https://www.nueva.com.ar/almacen?p=9", "nueva", "li", False)
+
+
+def test_captura_con_limite_de_paginas(tmp_path, monkeypatch, tienda_nueva, cargar_en_vivo):
+    captura = capturar_tienda(tienda_nueva, [tienda_nueva.url_categoria], str(tmp_path / "nueva"),
+                              max_paginas=2, cargar=cargar_en_vivo)
+    assert len(captura.indice["paginas"]) == 2
+
+    # La reproducción corta en el mismo límite: no pide la página 3, que no se capturó
+    monkeypatch.setattr(recorrido, "cargar_pagina", no_cargar)
+    captura = CapturaTienda(str(tmp_path / "nueva"))
+    assert [p["nombre"] for p in reproducir_tienda(tienda_nueva, captura)[tienda_nueva.url_categoria]] == [
+        "P1", "P2", "P3", "P4",
+    ]
+    assert diferencias(tienda_nueva, captura) == {}
+
+
+def test_captura_de_la_api_vtex(tmp_path, monkeypatch):
+    dia = cargar_tiendas()["dia"]
+    datos = json.loads((FIXTURES / "vtex_dia_alfajores.json").read_text(encoding="utf-8"))
+    captura = capturar_tienda(dia, [dia.url_categoria], str(tmp_path / "dia"), usar_api=True,
+                              cargar=no_cargar, sesion=SesionVtex(datos))
+    assert len(captura.indice["api"]) == 1
+
+    # Reproducir no usa la sesión compartida
+    monkeypatch.setattr(vtex, "obtener_sesion", lambda: pytest.fail("la reproducción no debe usar la red"))
+    obtenidos = reproducir_tienda(dia, CapturaTienda(str(tmp_path / "dia")))
+    assert obtenidos == captura.esperados() and obtenidos[dia.url_categoria]
+
+
+def test_benchmark(tmp_path, monkeypatch, tienda_nueva, cargar_en_vivo):
+    tienda = tienda_nueva
+    captura = capturar_tienda(tienda, [tienda.url_categoria], str(tmp_path / "nueva"), cargar=cargar_en_vivo)
+    # Lo que se parsea en otros procesos no se vería en los tiempos ni en la memoria
+    monkeypatch.setattr(motor, "obtener_ejecutor_parseo", lambda: pytest.fail("el benchmark usó los procesos"))
+
+    medicion = benchmark.medir(tienda, captura, repeticiones=2)
+
+    assert medicion.coincide
+    assert medicion.paginas == 3 and medicion.productos == 5
+    assert medicion.productos_por_segundo > 0 and medicion.memoria_pico > 0
+    assert "nueva" in benchmark.texto([medicion])
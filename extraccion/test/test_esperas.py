@@ -0,0 +1,61 @@
+import esperas
+from esperas import TiemposCarga, esperar_mas_elementos, esperar_pagina, esperar_red_inactiva
+
+
+def test_timeout_inicial_y_adaptativo(tmp_path):
+    tiempos = TiemposCarga(tmp_path / "tiempos.json")
+    assert tiempos.timeout("coto") == esperas.TIMEOUT_INICIAL
+
+    tiempos.registrar("coto", 2.0)
+    tiempos.registrar("coto", 1.0)
+    assert tiempos.timeout("coto") == 2.0 * esperas.MARGEN_TIMEOUT
+
+    tiempos.registrar("dia", 0.1)
+    assert tiempos.timeout("dia") == esperas.TIMEOUT_MINIMO
+
+    # Los tiempos se recuerdan entre corridas
+    tiempos.cerrar()
+    assert TiemposCarga(tmp_path / "tiempos.json").timeout("coto") == 2.0 * esperas.MARGEN_TIMEOUT
+
+
+def test_los_tiempos_se_guardan_de_a_tandas(tmp_path):
+    ruta = tmp_path / "tiempos.json"
+    tiempos = TiemposCarga(ruta, guardar_cada=3)
+
+    tiempos.registrar("coto", 1.0)
+    tiempos.registrar("coto", 1.0)
+    assert not ruta.exists()
+    tiempos.registrar("coto", 1.0)
+    assert ruta.exists()
+
+    tiempos.registrar("dia", 1.0)
+    assert TiemposCarga(ruta).timeout("dia") == esperas.TIMEOUT_INICIAL
+    tiempos.cerrar()
+    assert TiemposCarga(ruta).timeout("dia") == esperas.TIMEOUT_MINIMO
+
+
+def test_solo_recuerda_las_ultimas_muestras(tmp_path):
+    tiempos = TiemposCarga(tmp_path / "tiempos.json")
+    tiempos.registrar("coto", 10.0)
+    for _ in range(esperas.MUESTRAS_POR_TIENDA):
+        tiempos.registrar("coto", 2.0)
+    assert tiempos.timeout("coto") == 2.0 * esperas.MARGEN_TIMEOUT
+
+
+def test_red_inactiva_espera_a_que_no_haya_descargas_nuevas(driver_falso):
+    driver = driver_falso(recursos=[1, 2, 3, 3])
+    assert esperar_red_inactiva(driver, timeout=2, quieto=0.05, intervalo=0.01)
+    assert not driver.recursos[1:]
+
+
+def test_esperar_pagina_registra_el_tiempo_real(tmp_path, driver_falso):
+    tiempos = TiemposCarga(tmp_path / "tiempos.json")
+    driver = driver_falso()
+
+    assert esperar_pagina(driver, "coto", "catalogue-product", tiempos)
+    assert tiempos.timeout("coto") == esperas.TIMEOUT_MINIMO
+
+
+def test_esperar_mas_elementos_tras_scroll(driver_falso):
+    driver = driver_falso()
+    assert esperar_mas_elementos(driver, ".item", 3, timeout=2) > 3
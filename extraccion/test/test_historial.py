@@ -0,0 +1,54 @@
+import json
+from datetime import datetime, timezone
+
+from historial import comparar, foto, normalizar_enlace, registrar_cambios
+from salida import abrir_salida
+
+FECHA = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+
+def registros(*productos):
+    return [{"tienda": "coto", "nombre": nombre, "precio": precio, "enlace": enlace}
+            for nombre, precio, enlace in productos]
+
+
+def test_normalizar_enlace():
+    assert normalizar_enlace("HTTPS://www.Coto.com.ar/leche/p/?sc=1#x") == "https://www.coto.com.ar/leche/p"
+
+
+def test_comparar():
+    anterior = foto(registros(("Leche", 100000, "/leche"), ("Yerba", 400000, "/yerba"),
+                              ("Café", 900000, "/cafe"), ("Té", 50000, "/te")))
+    actual = foto(registros(("Leche", 110000, "/leche"), ("Yerba", 380000, "/yerba"),
+                            ("Café molido", 900000, "/cafe"), ("Arroz", 120000, "/arroz"),
+                            ("Fideos", 90000, None), ("Polenta", 80000, "")))
+
+    cambios = {c["enlace"]: (c["tipo"], c["precio_anterior"], c["precio"]) for c in comparar(anterior, actual)}
+    # El café solo cambió de nombre; lo que no tiene enlace no se sigue
+    assert cambios == {
+        "/leche": ("subio", 100000, 110000),
+        "/yerba": ("bajo", 400000, 380000),
+        "/arroz": ("nuevo", None, 120000),
+        "/te": ("eliminado", 50000, None),
+    }
+
+
+def test_registrar_cambios_solo_agrega_al_historial(tmp_path):
+    ruta = str(tmp_path / "productos_coto.csv")
+
+    def corrida(*productos):
+        with abrir_salida(ruta) as salida:
+            salida.escribir(registros(*productos))
+        return registrar_cambios(ruta, FECHA)
+
+    assert len(corrida(("Leche", 100000, "/leche"), ("Yerba", 400000, "/yerba"))) == 2
+    assert corrida(("Leche", 100000, "/leche"), ("Yerba", 400000, "/yerba")) == []
+    assert [c["tipo"] for c in corrida(("Leche", 120000, "/leche"))] == ["subio", "eliminado"]
+
+    with open(tmp_path / "historial_precios.jsonl", encoding="utf-8") as f:
+        historial = [json.loads(linea) for linea in f]
+    assert [(h["tipo"], h["enlace"]) for h in historial] == [
+        ("nuevo", "/leche"), ("nuevo", "/yerba"), ("subio", "/leche"), ("eliminado", "/yerba"),
+    ]
+    assert historial[-1] == {"fecha": FECHA.isoformat(), "tienda": "coto", "tipo": "eliminado", "enlace": "/yerba",
+                             "nombre": "Yerba", "precio_anterior": 400000, "precio": None}
@@ -0,0 +1,64 @@
+from itertools import islice
+
+from motor import Tienda, cargar_tiendas, guardar_productos
+from precios import CAMPOS_REGISTRO
+from salida import leer_salida
+
+# Una cadena nueva se agrega solo con su definición
+DEFINICION_NUEVA = {
+    "url_categoria": "https://www.nueva.com.ar/almacen",
+    "archivo_csv": "productos_nueva.csv",
+    "listo": "li.tarjeta",
+    "colador": {"etiqueta": "li", "clase": "tarjeta"},
+    "contenedores": ["li.tarjeta"],
+    "campos": {
+        "nombre": {"selector": ".titulo"},
+        "precio": {"selector": ".precio"},
+        "enlace": {"selector": "a[href]", "atributo": "href", "prefijo": "https://www.nueva.com.ar"},
+    },
+    "paginacion": {"parametro": "p", "inicio": 1, "paso": 1},
+}
+
+
+def test_tienda_nueva_solo_con_datos():
+    tienda = Tienda("nueva", DEFINICION_NUEVA)
+    html = (
+        '<ul><li class="tarjeta"><a href="/leche/p"><span class="titulo"> Leche </span></a>'
+        '<span class="precio">$ 900</span></li>'
+        '<li class="tarjeta"><span class="titulo">Sin precio</span></li>'
+        '<li class="banner"><span class="titulo">Publicidad</span></li></ul>'
+    )
+
+    # Los campos obligatorios por defecto son todos: la tarjeta sin precio se descarta
+    assert tienda.parsear(html) == [
+        {"nombre": "Leche", "precio": "$ 900", "enlace": "https://www.nueva.com.ar/leche/p"}
+    ]
+    assert tienda.vtex is None
+    assert tienda.max_concurrentes == 1
+
+
+def test_paginacion_por_desplazamiento():
+    coto = cargar_tiendas()["coto"]
+    urls = list(islice(coto.urls_paginas("https://www.cotodigital.com.ar/c/_/N-1"), 2))
+    assert urls == [
+        "https://www.cotodigital.com.ar/c/_/N-1?No=0&Nrpp=48",
+        "https://www.cotodigital.com.ar/c/_/N-1?No=48&Nrpp=48",
+    ]
+
+
+def test_definiciones_de_las_tres_cadenas():
+    tiendas = cargar_tiendas()
+    assert set(tiendas) == {"carrefour", "coto", "dia"}
+    assert tiendas["carrefour"].desplazar
+    assert tiendas["dia"].vtex == "https://diaonline.supermercadosdia.com.ar"
+
+
+def test_guardar_productos_escribe_registros(tmp_path, tienda_nueva):
+    tienda = tienda_nueva
+    ruta = str(tmp_path / "productos_nueva.csv")
+
+    guardar_productos(tienda, [{"nombre": "Leche 1 L", "precio": "$ 900", "enlace": "/leche/p"}], ruta)
+
+    [fila] = leer_salida(ruta)
+    assert list(fila) == list(CAMPOS_REGISTRO)
+    assert (fila["tienda"], fila["precio"], fila["precio_unitario"], fila["unidad"]) == ("nueva", "90000", "90000", "l")
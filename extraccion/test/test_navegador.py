@@ -0,0 +1,98 @@
+import threading
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from navegador import PoolDrivers
+
+
+class Fabrica:
+    def __init__(self, clase_driver):
+        self.clase_driver = clase_driver
+        self.creados = []
+
+    def __call__(self):
+        driver = self.clase_driver()
+        self.creados.append(driver)
+        return driver
+
+
+@pytest.fixture
+def fabrica(driver_falso):
+    return Fabrica(driver_falso)
+
+
+def test_reutiliza_el_mismo_navegador(fabrica):
+    pool = PoolDrivers(max_drivers=2, paginas_por_driver=10, fabrica=fabrica)
+
+    with pool.driver() as primero:
+        pass
+    with pool.driver() as segundo:
+        pass
+
+    assert primero is segundo
+    assert len(fabrica.creados) == 1
+
+
+def test_recicla_despues_de_n_paginas(fabrica):
+    pool = PoolDrivers(max_drivers=1, paginas_por_driver=2, fabrica=fabrica)
+
+    for _ in range(3):
+        with pool.driver():
+            pass
+
+    assert len(fabrica.creados) == 2
+    assert fabrica.creados[0].cerrado
+    assert not fabrica.creados[1].cerrado
+
+
+def test_descarta_el_navegador_que_falla(fabrica):
+    pool = PoolDrivers(max_drivers=1, paginas_por_driver=10, fabrica=fabrica)
+
+    with pytest.raises(WebDriverException):
+        with pool.driver():
+            raise WebDriverException("se colgó")
+    with pool.driver() as driver:
+        pass
+
+    assert fabrica.creados[0].cerrado
+    assert driver is fabrica.creados[1]
+
+
+def test_limita_los_navegadores_abiertos(fabrica):
+    pool = PoolDrivers(max_drivers=2, paginas_por_driver=10, fabrica=fabrica)
+    adentro = threading.Semaphore(0)
+    liberar = threading.Event()
+
+    def usar():
+        with pool.driver():
+            adentro.release()
+            liberar.wait(timeout=5)
+
+    hilos = [threading.Thread(target=usar) for _ in range(2)]
+    for hilo in hilos:
+        hilo.start()
+    for _ in hilos:
+        assert adentro.acquire(timeout=5)
+
+    # Con los dos cupos ocupados, un tercer pedido tiene que esperar
+    tercero = threading.Thread(target=usar)
+    tercero.start()
+    tercero.join(timeout=0.2)
+    assert tercero.is_alive()
+    assert len(fabrica.creados) == 2
+
+    liberar.set()
+    for hilo in hilos + [tercero]:
+        hilo.join(timeout=5)
+    assert len(fabrica.creados) == 2
+
+
+def test_cerrar_cierra_los_libres(fabrica):
+    pool = PoolDrivers(max_drivers=2, paginas_por_driver=10, fabrica=fabrica)
+
+    with pool.driver():
+        pass
+    pool.cerrar()
+
+    assert fabrica.creados[0].cerrado
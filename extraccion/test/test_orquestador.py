@@ -0,0 +1,63 @@
+import threading
+import time
+
+from orquestador import Reporte, orquestar
+
+
+def sin_espera(segundos):
+    pass
+
+
+def test_tiendas_corren_en_paralelo_con_limite_por_tienda():
+    activos = {"a": 0, "b": 0}
+    maximos = {"a": 0, "b": 0}
+    lock = threading.Lock()
+
+    def crear_scraper(tienda):
+        def scraper(url):
+            with lock:
+                activos[tienda] += 1
+                maximos[tienda] = max(maximos[tienda], activos[tienda])
+            time.sleep(0.05)
+            with lock:
+                activos[tienda] -= 1
+            return 1
+        return scraper
+
+    config = {
+        "a": {"max_concurrentes": 2, "categorias": [f"a{i}" for i in range(6)]},
+        "b": {"max_concurrentes": 1, "categorias": [f"b{i}" for i in range(2)]},
+    }
+    inicio = time.monotonic()
+    resultados = list(orquestar(config, {"a": crear_scraper("a"), "b": crear_scraper("b")},
+                                max_trabajadores=8, dormir=sin_espera))
+    segundos = time.monotonic() - inicio
+
+    assert len(resultados) == 8 and all(r.exito for r in resultados)
+    assert maximos == {"a": 2, "b": 1}
+    # La tienda "a" necesita 3 tandas; "b" corre en paralelo y no suma su tiempo
+    assert segundos < 0.05 * (3 + 2)
+
+
+def test_reintenta_y_reporta_fallas():
+    llamadas = {"ok": 0, "roto": 0}
+
+    def scraper(url):
+        llamadas[url] += 1
+        if url == "roto":
+            raise RuntimeError("timeout")
+        # La primera vez no trae productos, y eso también se reintenta
+        return 1 if llamadas[url] > 1 else 0
+
+    config = {"t": {"max_concurrentes": 2, "categorias": ["ok", "roto"]}}
+    resultados = {r.url: r for r in orquestar(config, {"t": scraper}, intentos=3, dormir=sin_espera)}
+
+    assert resultados["ok"].exito and resultados["ok"].intentos == 2
+    assert not resultados["roto"].exito and resultados["roto"].intentos == 3
+
+    reporte = Reporte()
+    for resultado in resultados.values():
+        reporte.agregar(resultado)
+    assert reporte.tiendas["t"]["exitos"] == 1
+    assert reporte.tiendas["t"]["fallas"] == 1
+    assert reporte.tiendas["t"]["productos"] == 1
@@ -0,0 +1,52 @@
+import pytest
+
+import parseo
+from carrefour_scraper import parsear_productos_carrefour
+from dia_scraper import parsear_productos_dia
+
+HTML_DIA = """
+<html><body>
+<header><section class="menu"><h3><span>Ofertas</span></h3><a href="/ofertas">Ver</a></section></header>
+<section class="galeria">
+  <section><a href="alfajor-a/p"></a><h3><span>Alfajor A</span></h3>
+    <span class="diaio-store-5-x-sellingPriceValue">$ 500</span></section>
+  <section><a href="alfajor-b/p"></a><h3><span>Alfajor B</span></h3>
+    <span class="diaio-store-5-x-sellingPriceValue">$ 650</span></section>
+</section>
+<footer><section><p>Contacto</p></section></footer>
+</body></html>
+"""
+
+
+@pytest.fixture(params=["lxml", "html.parser"])
+def parser(request, monkeypatch):
+    # Sin lxml instalado se usa el parser de Python y el resultado tiene que ser el mismo
+    monkeypatch.setattr(parseo, "PARSER_HTML", request.param)
+    return request.param
+
+
+def test_dia_solo_toma_las_tarjetas_de_producto(parser, capsys):
+    productos = parsear_productos_dia(HTML_DIA)
+
+    assert [p["nombre"] for p in productos] == ["Alfajor A", "Alfajor B"]
+    assert productos[1]["precio"] == "$ 650"
+    # Las secciones que no son productos ya no imprimen errores
+    assert capsys.readouterr().out == ""
+
+
+def test_carrefour_usa_product_summary_si_no_hay_grilla(parser):
+    html = (
+        '<div class="vtex-product-summary-2-x-container"><a href="/cafe/p">'
+        '<img class="vtex-product-summary-2-x-imageNormal" alt="Café"></a>'
+        '<span class="valtech-carrefourar-product-price-0-x-sellingPrice">$ 3.500</span></div>'
+        '<div class="banner"><img class="vtex-product-summary-2-x-imageNormal" alt="Publicidad"></div>'
+    )
+    assert parsear_productos_carrefour(html) == [
+        {"nombre": "Café", "precio": "$ 3.500", "enlace": "https://www.carrefour.com.ar/cafe/p"}
+    ]
+
+
+def test_colador_descarta_el_resto_de_la_pagina():
+    soup = parseo.parsear_contenedores(HTML_DIA, parseo.colador("section"))
+    assert soup.find("header") is None and soup.find("footer") is None
+    assert len(soup.find_all("section")) == 5
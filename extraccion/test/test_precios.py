@@ -0,0 +1,65 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from precios import a_centavos, contenido_neto, precio_unitario, registro
+
+FECHA = datetime(2026, 10, 18, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize("texto, centavos", [
+    ("$ 4.299,00", 429900),
+    ("$4.299", 429900),
+    ("$ 1.234.567,5", 123456750),
+    ("$ 899,99", 89999),
+    ("1234.56", 123456),
+    ("Antes $ 3.500 Ahora $ 3.120,50", 312050),
+    ("2x1 $ 1.000", 100000),
+    ("20% OFF $ 800", 80000),
+    ("2do al 70% $ 1.500", 150000),
+    ("$ 1.500 Precio por 1 Kg : $ 3.000", 150000),
+    ("$ 2.000 Precio sin impuestos nacionales: $ 1.652,89", 200000),
+    ("Llevando 2 unidades $ 1.800 c/u", 180000),
+    ("$ 2.000 Llevando 2 unidades $ 1.800 c/u", 200000),
+    ("Pack x 6 $ 3.000", 300000),
+    ("3 cuotas de $ 500", 150000),
+    ("Precio no encontrado", None),
+    ("", None),
+    (None, None),
+])
+def test_a_centavos(texto, centavos):
+    assert a_centavos(texto) == centavos
+
+
+@pytest.mark.parametrize("nombre, contenido", [
+    ("Yerba Playadito 1 kg", (1000, "kg")),
+    ("Galletitas Oreo 118 g", (118, "kg")),
+    ("Aceite Cocinero 1,5 L", (1500, "l")),
+    ("Gaseosa Pack 6 x 2,25 lts", (13500, "l")),
+    ("Cerveza lata 473 cc", (473, "l")),
+    ("Alfajor Jorgito 6 u x 50 g", (300, "kg")),
+    ("Fideos 500 gr x 2", (1000, "kg")),
+    ("Leche 1 L x 12 unidades", (12000, "l")),
+    ("Alfajor Jorgito", (None, None)),
+])
+def test_contenido_neto(nombre, contenido):
+    assert contenido_neto(nombre) == contenido
+
+
+def test_precio_unitario():
+    assert precio_unitario(250000, "Café molido 500 g") == (500000, "kg")
+    assert precio_unitario(None, "Café molido 500 g") == (None, None)
+
+
+def test_registro():
+    producto = {"nombre": " Leche 1 L ", "precio": "$ 1.100,00", "enlace": "/leche/p"}
+    assert registro("coto", producto, FECHA) == {
+        "tienda": "coto",
+        "nombre": "Leche 1 L",
+        "precio": 110000,
+        "precio_unitario": 110000,
+        "unidad": "l",
+        "enlace": "/leche/p",
+        "fecha": FECHA,
+    }
+
@@ -0,0 +1,83 @@
+import csv
+import os
+
+import pytest
+
+import recorrido
+from motor import volcar_productos
+from progreso import Progreso, corrida
+
+@pytest.fixture
+def cargadas(monkeypatch, paginas_nueva):
+    """Sirve las páginas de la tienda nueva en lugar de abrir un navegador; falla en las URLs de `fallar`."""
+    registro = {"urls": [], "fallar": set()}
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        if url in registro["fallar"]:
+            raise RuntimeError("se cerró el navegador")
+        registro["urls"].append(url)
+        return paginas_nueva[url]
+
+    monkeypatch.setattr(recorrido, "cargar_pagina", cargar)
+    return registro
+
+
+def test_una_corrida_cortada_sigue_desde_la_ultima_pagina(tmp_path, cargadas, tienda_nueva):
+    tienda = tienda_nueva
+    ruta = str(tmp_path / "productos.csv")
+
+    cargadas["fallar"] = {"https://www.nueva.com.ar/almacen?p=2"}
+    with pytest.raises(RuntimeError):
+        with corrida(ruta) as (salida, progreso):
+            volcar_productos(tienda, salida, progreso=progreso, usar_api=False)
+
+    assert not os.path.exists(ruta)
+    estado = Progreso(ruta + ".progreso.json").estado(tienda.url_categoria)
+    assert estado["paginas"] == 1 and estado["productos"] == 2
+
+    cargadas["fallar"] = set()
+    cargadas["urls"] = []
+    with corrida(ruta) as (salida, progreso):
+        assert volcar_productos(tienda, salida, progreso=progreso, usar_api=False) == 5
+
+    # La página 1 no se volvió a cargar (la 4 se pudo pedir por adelantado mientras se parseaba la 3)
+    assert cargadas["urls"][:2] == ["https://www.nueva.com.ar/almacen?p=2", "https://www.nueva.com.ar/almacen?p=3"]
+    assert "https://www.nueva.com.ar/almacen?p=1" not in cargadas["urls"]
+    with open(ruta, encoding="utf-8") as f:
+        filas = list(csv.DictReader(f))
+    assert list(filas[0]) == ["tienda", "nombre", "precio", "precio_unitario", "unidad", "enlace", "fecha"]
+    assert [(f["tienda"], f["nombre"], f["enlace"]) for f in filas] == [
+        ("nueva", f"P{n}", f"/p/{n}") for n in range(1, 6)
+    ]
+    assert not os.path.exists(ruta + ".progreso.json")
+
+
+def test_categoria_terminada_no_se_vuelve_a_scrapear(tmp_path, cargadas, tienda_nueva):
+    tienda = tienda_nueva
+    ruta = str(tmp_path / "productos.csv")
+    otra_categoria = "https://www.nueva.com.ar/bebidas"
+
+    with corrida(ruta) as (salida, progreso):
+        volcar_productos(tienda, salida, progreso=progreso, usar_api=False)
+        # Una categoría que falla deja la corrida sin terminar
+        with pytest.raises(KeyError):
+            volcar_productos(tienda, salida, otra_categoria, progreso=progreso, usar_api=False)
+    assert os.path.exists(ruta + ".parcial")
+
+    cargadas["urls"] = []
+    with corrida(ruta) as (salida, progreso):
+        assert volcar_productos(tienda, salida, progreso=progreso, usar_api=False) == 5
+    assert cargadas["urls"] == []
+
+
+def test_desde_cero_ignora_la_corrida_anterior(tmp_path):
+    ruta = str(tmp_path / "productos.csv")
+    with pytest.raises(RuntimeError):
+        with corrida(ruta) as (salida, progreso):
+            salida.escribir([{"nombre": "P1", "enlace": "/p/1"}])
+            progreso.pagina_completa("cat", "cat?p=1", 1)
+            raise RuntimeError("corte")
+
+    with corrida(ruta, continuar=False) as (salida, progreso):
+        assert salida.escritos == 0
+        assert progreso.estado("cat")["paginas"] == 0
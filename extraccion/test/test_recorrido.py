@@ -0,0 +1,131 @@
+from concurrent.futures import ProcessPoolExecutor
+
+from coto_scraper import parsear_productos_coto
+from dia_scraper import parsear_productos_dia
+from carrefour_scraper import parsear_productos_carrefour
+from recorrido import recorrer, url_con_parametros
+
+
+def html_coto(*numeros):
+    return "".join(
+        f'<catalogue-product><a href="/p/{n}"></a><h3>Producto {n}</h3><h4>$ {n}00</h4></catalogue-product>'
+        for n in numeros
+    )
+
+
+def parsear_numeros(html):
+    return [{"nombre": n, "precio": "1", "enlace": f"/p/{n}"} for n in html.split(",") if n]
+
+
+def test_url_con_parametros_agrega_y_reemplaza():
+    url = url_con_parametros("https://x.com/almacen?map=c,c&page=1", page=3)
+    assert url == "https://x.com/almacen?map=c,c&page=3"
+
+
+def test_recorrer_sigue_las_paginas_y_corta_en_la_ultima():
+    paginas = {"p1": "1,2,3", "p2": "4,5,6", "p3": "7"}
+    cargadas = []
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        cargadas.append(url)
+        return paginas.get(url, "")
+
+    productos = recorrer(["p1", "p2", "p3", "p4"], "coto", ".item", parsear_numeros, cargar=cargar)
+
+    assert [p["nombre"] for p in productos] == ["1", "2", "3", "4", "5", "6", "7"]
+    # La página 3 vino incompleta: no hace falta cargar la 4
+    assert cargadas == ["p1", "p2", "p3"]
+
+
+def test_recorrer_deduplica_y_corta_sin_productos_nuevos():
+    paginas = {"p1": "1,2", "p2": "2,1", "p3": "3,4"}
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        return paginas[url]
+
+    productos = recorrer(["p1", "p2", "p3"], "dia", ".item", parsear_numeros, cargar=cargar)
+
+    assert [p["enlace"] for p in productos] == ["/p/1", "/p/2"]
+
+
+def test_recorrer_sin_enlaces_deduplica_por_nombre_y_precio():
+    def parsear(html):
+        return [{"nombre": n, "precio": "1", "enlace": None} for n in html.split(",")]
+
+    paginas = {"p1": "a,b", "p2": "c,d", "p3": "a,b"}
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        return paginas[url]
+
+    productos = recorrer(["p1", "p2", "p3"], "carrefour", ".item", parsear, cargar=cargar)
+
+    assert [p["nombre"] for p in productos] == ["a", "b", "c", "d"]
+
+
+def test_recorrer_respeta_el_maximo_de_paginas():
+    def cargar(url, tienda, selector_listo, desplazar):
+        return f"{url}a,{url}b"
+
+    productos = recorrer((str(n) for n in range(1000)), "carrefour", ".item", parsear_numeros,
+                         max_paginas=3, cargar=cargar)
+
+    assert len(productos) == 6
+
+
+def test_parsear_productos_coto():
+    productos = parsear_productos_coto(html_coto(1, 2))
+    assert productos == [
+        {"nombre": "Producto 1", "precio": "$ 100", "enlace": "https://www.cotodigital.com.ar/p/1"},
+        {"nombre": "Producto 2", "precio": "$ 200", "enlace": "https://www.cotodigital.com.ar/p/2"},
+    ]
+
+
+def test_parsear_productos_dia():
+    html = (
+        '<section><a href="alfajor/p"></a><h3><span>Alfajor</span></h3>'
+        '<span class="diaio-store-5-x-sellingPriceValue">$ 500</span></section>'
+    )
+    assert parsear_productos_dia(html) == [
+        {"nombre": "Alfajor", "precio": "$ 500", "enlace": "https://www.supermercadosdia.com.ar/alfajor/p"}
+    ]
+
+
+def test_parsear_productos_carrefour():
+    html = (
+        '<div class="vtex-search-result-3-x-galleryItem"><a href="/yerba/p">'
+        '<img class="vtex-product-summary-2-x-imageNormal" alt="Yerba"></a>'
+        '<span class="valtech-carrefourar-product-price-0-x-sellingPrice"> $ 2.000 </span></div>'
+    )
+    assert parsear_productos_carrefour(html) == [
+        {"nombre": "Yerba", "precio": "$ 2.000", "enlace": "https://www.carrefour.com.ar/yerba/p"}
+    ]
+
+
+def test_recorrer_parseando_en_otros_procesos():
+    paginas = {"p1": "1,2,3", "p2": "4,5,6", "p3": "7"}
+    cargadas = []
+
+    def cargar(url, tienda, selector_listo, desplazar):
+        cargadas.append(url)
+        if url not in paginas:
+            raise RuntimeError("no existe")
+        return paginas[url]
+
+    with ProcessPoolExecutor(max_workers=2) as ejecutor:
+        productos = recorrer(["p1", "p2", "p3", "p4", "p5"], "coto", ".item", parsear_numeros,
+                             cargar=cargar, ejecutor=ejecutor, en_vuelo=2)
+
+    assert [p["nombre"] for p in productos] == ["1", "2", "3", "4", "5", "6", "7"]
+    # La 4 se cargó mientras se parseaba la 3; que falle no importa porque la 3 era la última
+    assert cargadas == ["p1", "p2", "p3", "p4"]
+
+
+def test_recorrer_en_otros_procesos_respeta_el_maximo_de_paginas():
+    def cargar(url, tienda, selector_listo, desplazar):
+        return f"{url}a,{url}b"
+
+    with ProcessPoolExecutor(max_workers=2) as ejecutor:
+        productos = recorrer((str(n) for n in range(1000)), "carrefour", ".item", parsear_numeros,
+                             max_paginas=3, cargar=cargar, ejecutor=ejecutor, en_vuelo=3)
+
+    assert len(productos) == 6
@@ -0,0 +1,98 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from salida import abrir_salida
+
+
+def productos(*numeros):
+    return [{"nombre": f"P{n}", "precio": f"$ {n}", "enlace": f"/p/{n}"} for n in numeros]
+
+
+def test_csv_se_escribe_por_paginas_y_se_publica_al_cerrar(tmp_path):
+    ruta = tmp_path / "productos.csv"
+
+    with abrir_salida(str(ruta)) as salida:
+        salida.escribir(productos(1, 2))
+        # Lo escrito ya está en disco antes de terminar, pero no en el archivo final
+        assert (tmp_path / "productos.csv.parcial").read_text(encoding="utf-8").count("\n") == 3
+        assert not ruta.exists()
+        # Los enlaces repetidos no se vuelven a escribir
+        assert salida.escribir(productos(2, 3)) == 1
+
+    assert ruta.read_text(encoding="utf-8").splitlines() == [
+        "nombre,precio,enlace", "P1,$ 1,/p/1", "P2,$ 2,/p/2", "P3,$ 3,/p/3",
+    ]
+    assert not (tmp_path / "productos.csv.parcial").exists()
+
+
+def test_si_falla_queda_el_parcial_y_se_puede_continuar(tmp_path):
+    ruta = str(tmp_path / "productos.csv")
+
+    with pytest.raises(RuntimeError):
+        with abrir_salida(ruta) as salida:
+            salida.escribir(productos(1, 2))
+            raise RuntimeError("se cerró el navegador")
+
+    # Simular una última fila a medio escribir
+    with open(ruta + ".parcial", "a", encoding="utf-8") as f:
+        f.write("P3,$ 3,/p/")
+
+    with abrir_salida(ruta, continuar=True) as salida:
+        assert salida.enlaces_escritos() == {"/p/1", "/p/2"}
+        salida.escribir(productos(2, 3))
+
+    with open(ruta, encoding="utf-8") as f:
+        assert f.read().splitlines()[1:] == ["P1,$ 1,/p/1", "P2,$ 2,/p/2", "P3,$ 3,/p/3"]
+
+
+def test_jsonl(tmp_path):
+    ruta = tmp_path / "productos.jsonl"
+    with abrir_salida(str(ruta)) as salida:
+        salida.escribir([{"nombre": "Café", "precio": "$ 1", "enlace": "/cafe"}])
+
+    assert json.loads(ruta.read_text(encoding="utf-8")) == {"nombre": "Café", "precio": "$ 1", "enlace": "/cafe"}
+
+
+def test_parquet(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    ruta = tmp_path / "productos.parquet"
+
+    with abrir_salida(str(ruta), tamano_bloque=2) as salida:
+        salida.escribir(productos(1))
+        salida.escribir(productos(2, 3))
+        salida.escribir(productos(4))
+
+    archivo = pq.ParquetFile(ruta)
+    assert archivo.metadata.num_rows == 4
+    assert archivo.metadata.num_row_groups == 2
+    assert archivo.read().column("enlace").to_pylist() == ["/p/1", "/p/2", "/p/3", "/p/4"]
+
+
+def test_sin_productos_no_deja_archivo(tmp_path):
+    ruta = tmp_path / "productos.csv"
+    with abrir_salida(str(ruta)):
+        pass
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_formato_desconocido(tmp_path):
+    with pytest.raises(ValueError):
+        abrir_salida(str(tmp_path / "productos.xlsx"))
+
+
+def test_parquet_con_tipos(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    ruta = tmp_path / "productos.parquet"
+    fecha = datetime(2026, 10, 18, tzinfo=timezone.utc)
+
+    with abrir_salida(str(ruta), campos=["nombre", "precio", "fecha"],
+                      tipos={"precio": "entero", "fecha": "fecha"}) as salida:
+        # Un bloque sin ningún precio no debe dejar la columna sin tipo
+        salida.escribir([{"nombre": "P1", "precio": None, "fecha": fecha}])
+
+    esquema = pq.read_schema(ruta)
+    assert esquema.field("precio").type == pa.int64()
+    assert esquema.field("fecha").type == pa.timestamp("us", tz="UTC")
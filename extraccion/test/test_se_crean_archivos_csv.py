@@ -1,14 +1,11 @@
 import sys
 import pathlib
-from utils import guardar_productos_en_csv
 
 # Agrega la carpeta raíz del proyecto al PYTHONPATH
 ROOT = pathlib.Path(__file__).resolve().parents[1]
 sys.path.append(str(ROOT))
 
-from src.carrefour_scraper import obtener_productos_carrefour
-from src.dia_scraper import obtener_productos_dia
-from src.coto_scraper import obtener_productos_coto
+from src import carrefour_scraper, coto_scraper, dia_scraper
 
 
 archivos = [
@@ -23,12 +20,12 @@ def test_verificar_si_se_crean_archivos():
         directorio = pathlib.Path("src", archivo)
         assert not directorio.exists()
 
-    productos = obtener_productos_carrefour()
-    guardar_productos_en_csv(productos)
-    productos = obtener_productos_dia()
-    guardar_productos_en_csv(productos)
-    productos = obtener_productos_coto()
-    guardar_productos_en_csv(productos)
+    productos = carrefour_scraper.obtener_productos_carrefour()
+    carrefour_scraper.guardar_productos_en_csv(productos)
+    productos = dia_scraper.obtener_productos_dia()
+    dia_scraper.guardar_productos_en_csv(productos)
+    productos = coto_scraper.obtener_productos_coto()
+    coto_scraper.guardar_productos_en_csv(productos)
 
     for archivo in archivos:
         directorio = pathlib.Path("src", archivo)
@@ -0,0 +1,94 @@
+import json
+import pathlib
+
+import pytest
+import requests
+
+import vtex
+from dia_scraper import URL_CATEGORIA as URL_DIA
+from vtex import formatear_precio, obtener_productos_vtex, ruta_de_categoria
+
+FIXTURES = pathlib.Path(__file__).parent / "fixtures"
+
+CARREFOUR = "https://www.carrefour.com.ar"
+DIA = "https://diaonline.supermercadosdia.com.ar"
+
+
+def cargar_fixture(nombre):
+    return json.loads((FIXTURES / nombre).read_text(encoding="utf-8"))
+
+
+class RespuestaFalsa:
+    def __init__(self, datos, estado=200):
+        self.datos = datos
+        self.status_code = estado
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code}")
+
+    def json(self):
+        return self.datos
+
+
+class SesionFalsa:
+    """Responde cada pedido con la siguiente página grabada."""
+
+    def __init__(self, paginas):
+        self.paginas = list(paginas)
+        self.pedidos = []
+
+    def get(self, url, params=None, timeout=None):
+        self.pedidos.append((url, dict(params)))
+        if not self.paginas:
+            return RespuestaFalsa([])
+        pagina = self.paginas.pop(0)
+        return pagina if isinstance(pagina, RespuestaFalsa) else RespuestaFalsa(pagina)
+
+
+def test_ruta_de_categoria():
+    assert ruta_de_categoria("https://www.carrefour.com.ar/almacen") == ("almacen", "c")
+    assert ruta_de_categoria(URL_DIA) == ("almacen/golosinas-y-alfajores/alfajores", "c,c,c")
+
+
+def test_formatear_precio():
+    assert formatear_precio(1850.5) == "$ 1.850,50"
+    assert formatear_precio(320) == "$ 320,00"
+
+
+def test_productos_desde_fixture_carrefour():
+    sesion = SesionFalsa([cargar_fixture("vtex_carrefour_almacen.json")])
+
+    productos = obtener_productos_vtex(CARREFOUR, "https://www.carrefour.com.ar/almacen", sesion)
+
+    # El aceite no tiene stock
+    assert productos == [
+        {"nombre": "Yerba mate Playadito 1 kg", "precio": "$ 4.299,00",
+         "enlace": "https://www.carrefour.com.ar/yerba-mate-playadito-1-kg/p"},
+        {"nombre": "Arroz largo fino Gallo Oro 1 kg", "precio": "$ 1.850,50",
+         "enlace": "https://www.carrefour.com.ar/arroz-largo-fino-gallo-oro-1-kg/p"},
+    ]
+    url, params = sesion.pedidos[0]
+    assert url == "https://www.carrefour.com.ar/api/catalog_system/pub/products/search/almacen"
+    assert params == {"map": "c", "_from": 0, "_to": 49}
+
+
+def test_pagina_hasta_un_pedido_incompleto():
+    base = cargar_fixture("vtex_dia_alfajores.json")[0]
+    pagina_llena = []
+    for i in range(vtex.PRODUCTOS_POR_PEDIDO):
+        dato = dict(base, productName=f"Alfajor {i}", link=f"https://dia/alfajor-{i}/p")
+        pagina_llena.append(dato)
+    sesion = SesionFalsa([pagina_llena, cargar_fixture("vtex_dia_alfajores.json")])
+
+    productos = obtener_productos_vtex(DIA, URL_DIA, sesion)
+
+    assert len(productos) == vtex.PRODUCTOS_POR_PEDIDO + 2
+    assert [p["_from"] for _, p in sesion.pedidos] == [0, 50]
+
+
+def test_error_de_la_api_se_propaga():
+    sesion = SesionFalsa([RespuestaFalsa([], estado=503)])
+    with pytest.raises(requests.HTTPError):
+        obtener_productos_vtex(DIA, URL_DIA, sesion)
+